@@ -0,0 +1,67 @@
+"""Number of ALS sweeps of parafac with and without line search
+
+Fits CP decompositions of synthetic tensors whose components are collinear
+(the columns of each factor share a common direction, which slows ALS down),
+with small additive noise. For each random seed, reports the number of
+iterations needed to reach the tolerance, the wall time and the final
+relative reconstruction error of `parafac` without and with `linesearch`.
+
+Usage::
+
+    python benchmarks/bench_cp_linesearch.py [size] [rank] [n_seeds]
+"""
+import sys
+import time
+
+import numpy as np
+import tensorly as tl
+from tensorly.decomposition import parafac
+from tensorly.kruskal_tensor import kruskal_to_tensor
+
+
+def collinear_tensor(size, rank, random_state, collinearity=2., noise=1e-3):
+    """Third order tensor with collinear components, plus Gaussian noise
+
+        The columns of the factors are a common vector, scaled by `collinearity`,
+        plus independent ones: the congruence of the columns increases with
+        `collinearity`.
+    """
+    rng = np.random.RandomState(random_state)
+    factors = []
+    for _ in range(3):
+        common = rng.standard_normal((size, 1))
+        factors.append(tl.tensor(collinearity*common + rng.standard_normal((size, rank))))
+    tensor = kruskal_to_tensor(factors)
+    noise = noise*tl.norm(tensor, 2)/size**1.5*rng.standard_normal((size, size, size))
+    return tensor + tl.tensor(noise)
+
+
+def measure(tensor, rank, seed, linesearch):
+    """Number of iterations, wall time, in seconds, and final error of parafac"""
+    start = time.perf_counter()
+    _, errors = parafac(tensor, rank, n_iter_max=5000, init='random', tol=1e-9,
+                        random_state=seed, return_errors=True, linesearch=linesearch)
+    return len(errors), time.perf_counter() - start, errors[-1]
+
+
+def main(size=30, rank=3, n_seeds=5):
+    tl.set_backend('numpy')
+    # Warm up, e.g. import SciPy
+    parafac(collinear_tensor(5, rank, 0), rank, n_iter_max=2)
+
+    print('{:<6} {:>10} {:>10} {:>12} {:>10} {:>10} {:>12}'.format(
+        'seed', 'ALS (it)', 'ALS (s)', 'ALS error', 'LS (it)', 'LS (s)', 'LS error'))
+    totals = np.zeros(4)
+    for seed in range(n_seeds):
+        tensor = collinear_tensor(size, rank, seed)
+        als_iterations, als_time, als_error = measure(tensor, rank, seed, False)
+        ls_iterations, ls_time, ls_error = measure(tensor, rank, seed, True)
+        totals += [als_iterations, als_time, ls_iterations, ls_time]
+        print('{:<6} {:>10} {:>10.3f} {:>12.3e} {:>10} {:>10.3f} {:>12.3e}'.format(
+            seed, als_iterations, als_time, als_error, ls_iterations, ls_time, ls_error))
+    print('{:<6} {:>10.0f} {:>10.3f} {:>12} {:>10.0f} {:>10.3f} {:>12}'.format(
+        'total', totals[0], totals[1], '', totals[2], totals[3], ''))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
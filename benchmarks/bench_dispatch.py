@@ -0,0 +1,81 @@
+"""Per-call overhead of the backend dispatch
+
+Compares, for a few cheap operations on small tensors, the overhead of
+going through tensorly's dispatch with respect to calling the backend
+directly, before and after caching the backend methods.
+
+Before, each call looked up the backend on the thread-local state and then
+the method on the backend. The previous dispatch is reproduced below.
+
+Usage::
+
+    python benchmarks/bench_dispatch.py
+"""
+import timeit
+
+import numpy as np
+import tensorly as tl
+from tensorly import backend as T
+
+
+def legacy_dispatch(method):
+    """Dispatch as it was done before methods were cached"""
+    name = method.__name__
+
+    def inner(*args, **kwargs):
+        backend = getattr(T._LOCAL_STATE, 'backend', T._DEFAULT_BACKEND)
+        return getattr(backend, name)(*args, **kwargs)
+    return inner
+
+
+def legacy_get_backend_method(key):
+    try:
+        return getattr(T._LOCAL_STATE.backend, key)
+    except AttributeError:
+        return getattr(T._LOADED_BACKENDS[T._DEFAULT_BACKEND], key)
+
+
+def timing(stmt, namespace, number):
+    """Best time per call, in nanoseconds"""
+    timer = timeit.Timer(stmt, globals=namespace)
+    return min(timer.repeat(repeat=7, number=number))/number*1e9
+
+
+def main(number=100000):
+    tl.set_backend('numpy')
+    backend = T._LOADED_BACKENDS['numpy']
+    tensor = tl.tensor(np.random.random_sample((10, 10, 10)))
+
+    cases = {'shape': ('backend.shape(tensor)', 'shape(tensor)'),
+             'ndim': ('backend.ndim(tensor)', 'ndim(tensor)'),
+             'dot': ('backend.dot(tensor[0], tensor[1])', 'dot(tensor[0], tensor[1])'),
+             'float32 (tl.*)': ('backend.float32', 'tl.float32')}
+
+    results = {}
+    for version in ['before', 'after']:
+        if version == 'before':
+            dispatcher = legacy_dispatch
+            getter = legacy_get_backend_method
+        else:
+            dispatcher = T.dispatch
+            getter = T._get_backend_method
+        # Attributes not explicitly defined go through the module's __getattr__
+        tl.__getattr__ = getter
+        namespace = {'tl': tl, 'backend': backend, 'tensor': tensor}
+        for name in ['shape', 'ndim', 'dot']:
+            namespace[name] = dispatcher(getattr(T.Backend, name))
+
+        for case, (direct, dispatched) in cases.items():
+            dispatched_time = timing(dispatched, namespace, number)
+            overhead = dispatched_time - timing(direct, namespace, number)
+            results.setdefault(case, {})[version] = overhead
+    tl.__getattr__ = T._get_backend_method
+
+    print('Dispatch overhead per call (ns)')
+    print('{:<16} {:>10} {:>10}'.format('operation', 'before', 'after'))
+    for case, res in results.items():
+        print('{:<16} {:>10.1f} {:>10.1f}'.format(case, res['before'], res['after']))
+
+
+if __name__ == '__main__':
+    main()
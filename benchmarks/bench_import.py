@@ -0,0 +1,57 @@
+"""Cold-start latency of `import tensorly`
+
+Each measurement starts a new Python interpreter. The time taken to start
+an interpreter that does not import anything is subtracted.
+
+Usage::
+
+    python benchmarks/bench_import.py [n_repeats]
+"""
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(code):
+    """Wall time, in seconds, of running `code` in a new interpreter"""
+    python_path = REPO + os.pathsep + os.environ.get('PYTHONPATH', '')
+    env = dict(os.environ, PYTHONPATH=python_path)
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], check=True, env=env)
+    return time.perf_counter() - start
+
+
+def main(n_repeats=20):
+    statements = {'python': 'pass',
+                  'numpy': 'import numpy',
+                  'tensorly': 'import tensorly',
+                  'tensorly.decomposition': 'import tensorly.decomposition',
+                  'tensorly + partial_svd': (
+                      'import numpy, tensorly; '
+                      'tensorly.partial_svd(numpy.random.rand(10, 10), 2)')}
+
+    timings = {name: [run(code) for _ in range(n_repeats)]
+               for name, code in statements.items()}
+    baseline = np.median(timings.pop('python'))
+
+    print('Import time (ms, median of {} cold starts, interpreter start-up '
+          'subtracted)'.format(n_repeats))
+    for name, times in timings.items():
+        print('{:<26} {:>8.1f}'.format(name, (np.median(times) - baseline)*1000))
+
+    # Modules loaded by `import tensorly` alone
+    code = ('import sys, tensorly; '
+            'print(*sorted({m.split(".")[0] for m in sys.modules}))')
+    env = dict(os.environ, PYTHONPATH=REPO)
+    out = subprocess.run([sys.executable, '-c', code], check=True, env=env,
+                         stdout=subprocess.PIPE, universal_newlines=True).stdout
+    print('scipy imported by `import tensorly`:', 'scipy' in out.split())
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,89 @@
+"""Memory allocated by n-mode products in tucker_to_tensor and HOOI
+
+Compares `multi_mode_dot`, which contracts each mode with `tensordot`
+and only permutes the axes at the end, with the previous implementation,
+which unfolds and refolds the tensor for each mode. For each, reports the
+peak memory allocated (measured with tracemalloc) and the wall time of
+`tucker_to_tensor`, of the projections computed at each iteration of
+HOOI and of `tucker` (HOOI) itself.
+
+Usage::
+
+    python benchmarks/bench_mode_dot.py [size] [rank]
+"""
+import sys
+import time
+import tracemalloc
+from unittest import mock
+
+import tensorly as tl
+from tensorly.base import unfold, fold
+from tensorly.decomposition import tucker
+from tensorly.random import random_tucker
+from tensorly.tucker_tensor import tucker_to_tensor
+
+
+def mode_dot_unfold(tensor, matrix, mode):
+    """Previous mode_dot, for matrices: unfold, dot and fold back"""
+    new_shape = list(tl.shape(tensor))
+    new_shape[mode] = tl.shape(matrix)[0]
+    return fold(tl.dot(matrix, unfold(tensor, mode)), mode, new_shape)
+
+
+def multi_mode_dot_unfold(tensor, matrices, modes=None, skip=None, transpose=False):
+    """Previous multi_mode_dot, for matrices: successive mode_dot_unfold"""
+    if modes is None:
+        modes = range(len(matrices))
+    res = tensor
+    for i, (matrix, mode) in enumerate(sorted(zip(matrices, modes), key=lambda x: x[1])):
+        if skip is not None and i == skip:
+            continue
+        if transpose:
+            matrix = tl.transpose(matrix)
+        res = mode_dot_unfold(res, matrix, mode)
+    return res
+
+
+def measure(fun, *args, **kwargs):
+    """Peak memory allocated, in MB, and wall time, in seconds, of `fun`"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    fun(*args, **kwargs)
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak/2**20, duration
+
+
+def hooi_projections(tensor, factors):
+    """Projections of `tensor` on all the factors but one, as computed by HOOI"""
+    for mode in range(len(factors)):
+        tl.tenalg.multi_mode_dot(tensor, factors, skip=mode, transpose=True)
+
+
+def main(size=100, rank=10):
+    tl.set_backend('numpy')
+    core, factors = random_tucker((size, size, size), rank=rank, random_state=0)
+    tensor = tucker_to_tensor(core, factors)
+    benchmarks = [('tucker_to_tensor', tucker_to_tensor, (core, factors), {}),
+                  ('HOOI projections', hooi_projections, (tensor, factors), {}),
+                  ('tucker (HOOI)', tucker, (tensor, [rank]*3),
+                   {'n_iter_max': 10, 'tol': 0})]
+
+    print('{:<18} {:>14} {:>12} {:>14} {:>12}'.format(
+        'function', 'unfold (MB)', 'unfold (s)', 'tensordot (MB)', 'tensordot (s)'))
+    for name, fun, args, kwargs in benchmarks:
+        # Warm up, e.g. import SciPy
+        fun(*args, **kwargs)
+        with mock.patch('tensorly.tucker_tensor.multi_mode_dot', multi_mode_dot_unfold), \
+                mock.patch('tensorly.decomposition._tucker.multi_mode_dot',
+                           multi_mode_dot_unfold), \
+                mock.patch('tensorly.tenalg.multi_mode_dot', multi_mode_dot_unfold):
+            old_memory, old_time = measure(fun, *args, **kwargs)
+        new_memory, new_time = measure(fun, *args, **kwargs)
+        print('{:<18} {:>14.1f} {:>12.3f} {:>14.1f} {:>12.3f}'.format(
+            name, old_memory, old_time, new_memory, new_time))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,93 @@
+"""Native partial SVD against the NumPy round-trip on HOOI workloads
+
+For each available backend, compares `Backend.partial_svd`, which
+converts the matrix to NumPy, calls SciPy and converts the result back,
+with the backend's own `partial_svd`. The matrices are the ones
+decomposed by HOOI (tucker): the unfoldings of the tensor, used for the
+initialisation, and the unfoldings of the tensor projected on the
+factors of the other modes, used at each iteration. Finally, the whole of
+HOOI is run through the default `'numpy_svd'` of `tl.SVD_FUNS`, which is
+the backend's own `partial_svd`, and with the round-trip in its place.
+
+Usage::
+
+    python benchmarks/bench_partial_svd.py [size] [rank]
+"""
+import functools
+import sys
+import time
+from unittest import mock
+
+import numpy as np
+import tensorly as tl
+from tensorly import backend as T
+from tensorly.decomposition import tucker
+from tensorly.tenalg import multi_mode_dot
+
+
+def timing(fun, *args, n_repeats=5, **kwargs):
+    """Best wall time, in seconds, of `fun(*args, **kwargs)`"""
+    fun(*args, **kwargs)
+    times = []
+    for _ in range(n_repeats):
+        start = time.perf_counter()
+        fun(*args, **kwargs)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def hooi_unfoldings(tensor, rank):
+    """Matrices whose partial SVD is computed in HOOI"""
+    n_modes = tl.ndim(tensor)
+    matrices = []
+    factors = []
+    for mode in range(n_modes):
+        matrices.append(('init mode {}'.format(mode), tl.unfold(tensor, mode)))
+        U, _, _ = tl.partial_svd(tl.unfold(tensor, mode), n_eigenvecs=rank)
+        factors.append(U)
+    for mode in range(n_modes):
+        core_approximation = multi_mode_dot(tensor, factors, skip=mode, transpose=True)
+        matrices.append(('iter mode {}'.format(mode),
+                         tl.unfold(core_approximation, mode)))
+    return matrices
+
+
+def main(size=100, rank=10):
+    tensor = np.random.random_sample((size, size, size)).astype(np.float32)
+
+    print('{:<12} {:<14} {:>14} {:>16} {:>10}'.format(
+        'backend', 'matrix', 'shape', 'round-trip (ms)', 'native (ms)'))
+    for backend_name in ['numpy', 'pytorch', 'tensorflow', 'mxnet', 'cupy']:
+        try:
+            tl.set_backend(backend_name)
+        except ImportError:
+            continue
+        backend = T._LOADED_BACKENDS[backend_name]
+
+        for name, matrix in hooi_unfoldings(tl.tensor(tensor, dtype=tl.float32), rank):
+            round_trip = timing(T.Backend.partial_svd, backend, matrix, n_eigenvecs=rank)
+            native = timing(backend.partial_svd, matrix, n_eigenvecs=rank)
+            print('{:<12} {:<14} {:>14} {:>16.2f} {:>10.2f}'.format(
+                backend_name, name, str(tuple(tl.shape(matrix))),
+                round_trip*1000, native*1000))
+
+        hooi_tensor = tl.tensor(tensor, dtype=tl.float32)
+        ranks = [rank]*tl.ndim(hooi_tensor)
+        native = timing(tucker, hooi_tensor, ranks, svd='numpy_svd', n_repeats=1)
+        svd_funs = dict(backend.SVD_FUNS,
+                        numpy_svd=functools.partial(T.Backend.partial_svd, backend))
+        svd_funs_property = property(lambda self: svd_funs)
+        with mock.patch.object(type(backend), 'SVD_FUNS', svd_funs_property):
+            # Resets the methods resolved by the dispatch
+            tl.set_backend(backend_name)
+            round_trip = timing(tucker, hooi_tensor, ranks, svd='numpy_svd', n_repeats=1)
+        tl.set_backend(backend_name)
+        print('{:<12} {:<14} {:>14} {:>16.2f} {:>10.2f}'.format(
+            backend_name, 'tucker (HOOI)', str(tuple(tl.shape(hooi_tensor))),
+            round_trip*1000, native*1000))
+
+    tl.set_backend('numpy')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
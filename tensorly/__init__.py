@@ -1,5 +1,6 @@
 __version__ = '0.4.4'
 import sys
+import importlib
 
 from .base import unfold, fold
 from .base import tensor_to_vec, vec_to_tensor
@@ -12,18 +13,33 @@ from .mps_tensor import mps_to_tensor, mps_to_unfolded, mps_to_vec
 
 from .backend import (set_backend, get_backend,
                       backend_context, _get_backend_dir,
+                      set_num_threads, get_num_threads, thread_limits, trace_backend,
                       _get_backend_method, override_module_dispatch)
 
 from .backend import (context, tensor, is_tensor, shape, ndim, to_numpy, copy,
                       concatenate, reshape, transpose, moveaxis, arange, ones,
                       zeros, zeros_like, eye, where, clip, max, min, argmax,
                       argmin, all, mean, sum, prod, sign, abs, sqrt, norm, dot,
-                      kron, solve, qr, kr, partial_svd, stack)
+                      tensordot, multiply, divide, kron, solve, solve_spd, qr, kr, kr_blocks,
+                      batched_dot, batched_solve, batched_qr, batched_svd, segment_sum,
+                      mttkrp, partial_svd, randomized_svd, stack)
+
+
+# Submodules imported on first access, e.g. tensorly.decomposition,
+# to keep `import tensorly` fast
+_LAZY_SUBMODULES = ['contrib', 'datasets', 'decomposition', 'metrics',
+                    'random', 'regression', 'tenalg']
+
+
+def _get_attribute(key):
+    if key in _LAZY_SUBMODULES:
+        return importlib.import_module('.' + key, __name__)
+    return _get_backend_method(key)
 
 
 def full_dir():
     static_items = list(sys.modules[__name__].__dict__.keys())
-    return _get_backend_dir() + static_items
+    return _get_backend_dir() + _LAZY_SUBMODULES + static_items
 
-override_module_dispatch(__name__, _get_backend_method, full_dir)
-del override_module_dispatch, full_dir, _get_backend_method
\ No newline at end of file
+override_module_dispatch(__name__, _get_attribute, full_dir)
+del override_module_dispatch, full_dir
\ No newline at end of file
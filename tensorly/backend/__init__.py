@@ -1,10 +1,13 @@
 import warnings
 from .core import Backend
+from .tracing import BackendTracer
 import importlib
 import os
 import sys
 import threading
+import time
 from contextlib import contextmanager
+import functools
 import inspect
 
 _DEFAULT_BACKEND = 'numpy'
@@ -17,6 +20,66 @@ _KNOWN_BACKENDS = {'numpy': 'NumpyBackend',
 _LOADED_BACKENDS = {}
 _LOCAL_STATE = threading.local()
 
+# Thread limits: the global one, set with set_num_threads, and those of the
+# thread_limits contexts currently active in any thread
+_NUM_THREADS = None
+_ACTIVE_THREAD_LIMITS = []
+_THREAD_LIMITS_LOCK = threading.Lock()
+
+
+class _MethodCache(dict):
+    """Maps method names to the corresponding attributes of a backend
+
+        Attributes are resolved with `getattr` the first time they are used
+        and then directly looked up.
+    """
+    def __init__(self, backend):
+        super().__init__()
+        self.backend = backend
+
+    def __missing__(self, name):
+        value = getattr(self.backend, name)
+        self[name] = value
+        return value
+
+
+class _TracingMethodCache(_MethodCache):
+    """Method cache whose backend methods record their calls in tracers
+
+        Only used while tracing, see `trace_backend`: otherwise, the methods
+        of the backend are called directly.
+    """
+    def __init__(self, backend, tracers):
+        super().__init__(backend)
+        self.tracers = tracers
+
+    def __missing__(self, name):
+        value = super().__missing__(name)
+        if name == 'SVD_FUNS':
+            value = {key: self._traced(key, function) for key, function in value.items()}
+        elif not name.startswith('_') and callable(getattr(Backend, name, None)):
+            value = self._traced(name, value)
+        self[name] = value
+        return value
+
+    def _traced(self, name, function):
+        tracers = self.tracers
+
+        def traced(*args, **kwargs):
+            start = time.perf_counter()
+            result = function(*args, **kwargs)
+            duration = time.perf_counter() - start
+            for tracer in tracers:
+                tracer.record(name, start, duration, args, kwargs)
+            return result
+
+        return traced
+
+
+# Cache of the default backend, used by the threads that did not set their own
+# It is replaced (not modified) when the default backend changes
+_DEFAULT_METHODS = None
+
 def initialize_backend():
     """Initialises the backend
 
@@ -31,18 +94,18 @@ def initialize_backend():
                         backend_name, _DEFAULT_BACKEND)
         warnings.warn(msg, UserWarning)
         backend_name = _DEFAULT_BACKEND
-    
+
     set_backend(backend_name, local_threadsafe=False)
 
 def register_backend(backend_name):
     """Registers a new backend by importing the corresponding module 
         and adding the correspond `Backend` class in Backend._LOADED_BACKEND
         under the key `backend_name`
-    
+
     Parameterss
     ----------
     backend_name : str, name of the backend to load
-    
+
     Raises
     ------
     ValueError
@@ -53,6 +116,9 @@ def register_backend(backend_name):
         module = importlib.import_module('tensorly.backend.{0}_backend'.format(backend_name))
         backend = getattr(module, _KNOWN_BACKENDS[backend_name])()
         _LOADED_BACKENDS[backend_name] = backend
+        n_threads = get_num_threads()
+        if n_threads is not None:
+            backend.limit_threads(n_threads)
     else:
         msg = "Unknown backend name {0!r}, known backends are [{1}]".format(
                 backend_name, ', '.join(map(repr, _KNOWN_BACKENDS)))
@@ -60,7 +126,7 @@ def register_backend(backend_name):
 
 def set_backend(backend, local_threadsafe=False):
     """Changes the backend to the specified one
-    
+
     Parameters
     ----------
     backend : tensorly.Backend or str
@@ -75,26 +141,34 @@ def set_backend(backend, local_threadsafe=False):
 
         backend = _LOADED_BACKENDS[backend]
 
-    # Set the backend
+    # Set the backend and invalidate the cached methods
+    methods = _MethodCache(backend)
     _LOCAL_STATE.backend = backend
-    
+    _LOCAL_STATE.methods = methods
+
     if not local_threadsafe:
-        global _DEFAULT_BACKEND
+        global _DEFAULT_BACKEND, _DEFAULT_METHODS
         _DEFAULT_BACKEND = backend.backend_name
+        _DEFAULT_METHODS = methods
 
 def get_backend():
     """Returns the name of the current backend
     """
     return _get_backend_method('backend_name')
 
-def _get_backend_method(key):
+def _get_methods():
+    """Returns the method cache of the backend of the current thread"""
     try:
-        return getattr(_LOCAL_STATE.backend, key)
+        return _LOCAL_STATE.methods
     except AttributeError:
-        return getattr(_LOADED_BACKENDS[_DEFAULT_BACKEND], key)
+        return _DEFAULT_METHODS
+
+def _get_backend_method(key):
+    return _get_methods()[key]
 
 def _get_backend_dir():
-    return [k for k in dir(_LOCAL_STATE.backend) if not k.startswith('_')]
+    backend = _get_methods().backend
+    return [k for k in dir(backend) if not k.startswith('_')]
 
 @contextmanager
 def backend_context(backend, local_threadsafe=False):
@@ -126,6 +200,145 @@ def backend_context(backend, local_threadsafe=False):
     finally:
         set_backend(_old_backend)
 
+@contextmanager
+def trace_backend():
+    """Context manager recording the backend operations called by the current thread
+
+        Records the calls dispatched to the backend, e.g. `tl.dot` or
+        `tl.partial_svd`, along with their duration, the shapes of their
+        arguments and an estimate of their number of floating point operations.
+        Outside of this context, the backend methods are called directly
+        and tracing has no cost.
+
+        Calls made after changing the backend within the context are not traced.
+
+    Yields
+    ------
+    tracer : tensorly.backend.tracing.BackendTracer
+        record of the calls, which can be summarised with ``tracer.table()``
+        or exported with ``tracer.to_chrome_trace(path)``
+
+    Examples
+    --------
+    >>> import tensorly as tl
+    >>> with tl.trace_backend() as tracer:
+    ...     _ = tl.dot(tl.ones((10, 5)), tl.ones((5, 2)))
+    >>> tracer.summary()['dot']['flops']
+    200
+    """
+    tracer = BackendTracer()
+    methods = _get_methods()
+    tracers = getattr(methods, 'tracers', []) + [tracer]
+    has_local_methods = hasattr(_LOCAL_STATE, 'methods')
+    _LOCAL_STATE.methods = _TracingMethodCache(methods.backend, tracers)
+    try:
+        yield tracer
+    finally:
+        if has_local_methods:
+            _LOCAL_STATE.methods = methods
+        else:
+            del _LOCAL_STATE.methods
+
+def _check_num_threads(n_threads):
+    if n_threads is not None and (not isinstance(n_threads, int) or n_threads < 1):
+        raise ValueError('The number of threads should be a positive integer or None, '
+                         'got {!r}.'.format(n_threads))
+
+def _apply_thread_limits():
+    """Applies the smallest of the current thread limits to all the loaded backends
+
+        Must be called with _THREAD_LIMITS_LOCK held.
+    """
+    n_threads = get_num_threads()
+    for backend in _LOADED_BACKENDS.values():
+        backend.limit_threads(n_threads)
+
+def get_num_threads():
+    """Returns the maximum number of threads the backends are currently allowed to use
+
+    Returns
+    -------
+    n_threads : int or None
+        smallest of the limits set with :func:`set_num_threads` and
+        :func:`thread_limits`, None if there is no limit
+    """
+    # The builtin min is shadowed by the dispatched tensorly.min in this module
+    n_threads = _NUM_THREADS
+    for limit in _ACTIVE_THREAD_LIMITS:
+        if n_threads is None or limit < n_threads:
+            n_threads = limit
+    return n_threads
+
+def set_num_threads(n_threads):
+    """Limits the number of threads used by the backends' BLAS and OpenMP libraries
+
+        Useful when running several decompositions concurrently, e.g. in a
+        thread pool, to avoid having each of them use all the cores.
+        For NumPy (and CuPy's host code), the limits are set with `threadpoolctl`,
+        if installed; for PyTorch with `torch.set_num_threads`.
+
+    Parameters
+    ----------
+    n_threads : int or None
+        maximum number of threads, if None, the limit is removed
+
+    See also
+    --------
+    thread_limits : limit the number of threads temporarily
+    """
+    global _NUM_THREADS
+    _check_num_threads(n_threads)
+    with _THREAD_LIMITS_LOCK:
+        _NUM_THREADS = n_threads
+        _apply_thread_limits()
+
+@contextmanager
+def thread_limits(n_threads):
+    """Context manager limiting the number of threads used by the backends
+
+        The thread pools of the BLAS and OpenMP libraries are shared by the
+        whole process: while several `thread_limits` are active, possibly in
+        different threads, the smallest limit is used. The previous limits
+        are restored once all of them are exited.
+
+    Parameters
+    ----------
+    n_threads : int or None
+        maximum number of threads, if None, the limits are left unchanged
+
+    Examples
+    --------
+    >>> import tensorly as tl
+    >>> with tl.thread_limits(2):
+    ...     pass
+    """
+    _check_num_threads(n_threads)
+    if n_threads is None:
+        yield
+        return
+
+    try:
+        with _THREAD_LIMITS_LOCK:
+            _ACTIVE_THREAD_LIMITS.append(n_threads)
+            _apply_thread_limits()
+        yield
+    finally:
+        with _THREAD_LIMITS_LOCK:
+            _ACTIVE_THREAD_LIMITS.remove(n_threads)
+            _apply_thread_limits()
+
+def thread_limited(function):
+    """Decorator running `function` within :func:`thread_limits` of its `n_jobs` parameter"""
+    signature = inspect.signature(function)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        n_jobs = signature.bind(*args, **kwargs).arguments.get('n_jobs')
+        with thread_limits(n_jobs):
+            return function(*args, **kwargs)
+
+    return wrapper
+
 def override_module_dispatch(module_name, getter_fun, dir_fun):
     """Override the module's dispatch mechanism
 
@@ -146,7 +359,7 @@ def override_module_dispatch(module_name, getter_fun, dir_fun):
 
             def __dir__(self):
                 out = set(super().__dir__())
-                out.update({k for k in dir(_LOCAL_STATE.backend) if not k.startswith('_')})
+                out.update(dir_fun())
                 return list(out)
 
         sys.modules[module_name].__class__ = BackendAttributeModuleType
@@ -157,8 +370,12 @@ def dispatch(method):
     name = method.__name__
 
     def inner(*args, **kwargs):
-        backend = getattr(_LOCAL_STATE, 'backend', _DEFAULT_BACKEND)
-        return getattr(backend, name)(*args, **kwargs)
+        # Inlined _get_methods: this is called for every backend operation
+        try:
+            methods = _LOCAL_STATE.methods
+        except AttributeError:
+            methods = _DEFAULT_METHODS
+        return methods[name](*args, **kwargs)
 
     # We don't use `functools.wraps` here because some of the dispatched
     # methods include the backend (`self`) as a parameter. Instead we manually
@@ -211,11 +428,23 @@ abs = dispatch(Backend.abs)
 sqrt = dispatch(Backend.sqrt)
 norm = dispatch(Backend.norm)
 dot = dispatch(Backend.dot)
+tensordot = dispatch(Backend.tensordot)
+multiply = dispatch(Backend.multiply)
+divide = dispatch(Backend.divide)
 kron = dispatch(Backend.kron)
 solve = dispatch(Backend.solve)
+solve_spd = dispatch(Backend.solve_spd)
 qr = dispatch(Backend.qr)
+batched_dot = dispatch(Backend.batched_dot)
+batched_solve = dispatch(Backend.batched_solve)
+batched_qr = dispatch(Backend.batched_qr)
+batched_svd = dispatch(Backend.batched_svd)
+segment_sum = dispatch(Backend.segment_sum)
 kr = dispatch(Backend.kr)
+mttkrp = dispatch(Backend.mttkrp)
+kr_blocks = dispatch(Backend.kr_blocks)
 partial_svd = dispatch(Backend.partial_svd)
+randomized_svd = dispatch(Backend.randomized_svd)
 
 
 # Initialise the backend to the default one
@@ -7,8 +7,12 @@ import types
 import warnings
 
 import numpy as np
-import scipy.linalg
-import scipy.sparse.linalg
+
+
+def _gaussian_test_matrix(n_rows, n_cols, random_state=None):
+    """Returns a random Gaussian matrix of shape (n_rows, n_cols), drawn at each call"""
+    from ..random import check_random_state
+    return check_random_state(random_state).standard_normal((n_rows, n_cols))
 
 
 class Backend(object):
@@ -43,6 +47,11 @@ class Backend(object):
 
     @property
     def SVD_FUNS(self):
+        """Dictionary of the SVD functions, by name
+
+            `'numpy_svd'`, the default of the decompositions, is the backend's
+            own :meth:`partial_svd`.
+        """
         raise NotImplementedError
 
     @staticmethod
@@ -279,7 +288,7 @@ class Backend(object):
         raise NotImplementedError
 
     @staticmethod
-    def clip(tensor, a_min=None, a_max=None):
+    def clip(tensor, a_min=None, a_max=None, out=None):
         """Clip the values of a tensor to within an interval.
 
         Given an interval, values outside the interval are clipped to the interval
@@ -296,6 +305,10 @@ class Backend(object):
             Minimum value. If `None`, clipping is not performed on lower bound.
         a_max : scalar, optional
             Maximum value. If `None`, clipping is not performed on upper bound.
+        out : tl.tensor, optional
+            If specified, and supported by the backend, the result is stored
+            in `out` (which can be `tensor` itself). Always use the returned
+            tensor, backends with immutable tensors ignore `out`.
 
         Returns
         -------
@@ -482,13 +495,18 @@ class Backend(object):
         raise NotImplementedError
 
     @staticmethod
-    def dot(a, b):
+    def dot(a, b, out=None):
         """Dot product of two tensors.
 
         Parameters
         ----------
         a, b : tensor
             The tensors to compute the dot product of.
+        out : tensor, optional
+            If specified, and supported by the backend, the result is stored
+            in `out`, which must have the right shape and dtype and must not
+            be `a` or `b`. Always use the returned tensor, backends with
+            immutable tensors ignore `out`.
 
         Returns
         -------
@@ -496,8 +514,84 @@ class Backend(object):
         """
         raise NotImplementedError
 
+    def tensordot(self, a, b, axes=2):
+        """Sum of the products of the elements of `a` and `b` over the given axes
+
+        Parameters
+        ----------
+        a, b : tensor
+        axes : int or (int list, int list), default is 2
+            if int, the last `axes` axes of `a` are contracted with the
+            first `axes` axes of `b`. Otherwise, ``axes[0]`` of `a` are
+            contracted with ``axes[1]`` of `b`.
+
+        Returns
+        -------
+        tensor
+            the free axes of `a` followed by the free axes of `b`
+        """
+        ndim_a, ndim_b = self.ndim(a), self.ndim(b)
+        if isinstance(axes, int):
+            axes_a = list(range(ndim_a - axes, ndim_a))
+            axes_b = list(range(axes))
+        else:
+            axes_a, axes_b = axes
+            if isinstance(axes_a, int):
+                axes_a = [axes_a]
+            if isinstance(axes_b, int):
+                axes_b = [axes_b]
+            axes_a = [axis % ndim_a for axis in axes_a]
+            axes_b = [axis % ndim_b for axis in axes_b]
+        if len(axes_a) != len(axes_b):
+            raise ValueError('Cannot contract {} axes of a with {} axes of b.'.format(
+                len(axes_a), len(axes_b)))
+
+        shape_a, shape_b = self.shape(a), self.shape(b)
+        free_a = [i for i in range(ndim_a) if i not in axes_a]
+        free_b = [i for i in range(ndim_b) if i not in axes_b]
+        size = int(np.prod([shape_a[i] for i in axes_a]))
+
+        a = self.reshape(self.transpose(a, free_a + axes_a), (-1, size))
+        b = self.reshape(self.transpose(b, axes_b + free_b), (size, -1))
+        shape = tuple(shape_a[i] for i in free_a) + tuple(shape_b[i] for i in free_b)
+        return self.reshape(self.dot(a, b), shape)
+
+    @staticmethod
+    def multiply(a, b, out=None):
+        """Element-wise product of two tensors.
+
+        Parameters
+        ----------
+        a, b : tensor
+        out : tensor, optional
+            If specified, and supported by the backend, the result is stored
+            in `out` (which can be `a` or `b`). Always use the returned tensor.
+
+        Returns
+        -------
+        tensor
+        """
+        return a*b
+
     @staticmethod
-    def solve(a, b):
+    def divide(a, b, out=None):
+        """Element-wise division of two tensors.
+
+        Parameters
+        ----------
+        a, b : tensor
+        out : tensor, optional
+            If specified, and supported by the backend, the result is stored
+            in `out` (which can be `a` or `b`). Always use the returned tensor.
+
+        Returns
+        -------
+        tensor
+        """
+        return a/b
+
+    @staticmethod
+    def solve(a, b, out=None):
         """Solve a linear matrix equation, or system of linear scalar equations.
 
         Computes the "exact" solution, `x`, of the well-determined, i.e., full
@@ -509,6 +603,9 @@ class Backend(object):
             The coefficient matrix.
         b : tensor, shape (M,) or (M, K)
             The ordinate values.
+        out : tensor, optional
+            If specified, and supported by the backend, the solution is
+            stored in `out`. Always use the returned tensor.
 
         Returns
         -------
@@ -517,6 +614,32 @@ class Backend(object):
         """
         raise NotImplementedError
 
+    def solve_spd(self, a, b, out=None):
+        """Solves `a x = b` for a symmetric positive (semi-)definite matrix `a`
+
+        Backends use a Cholesky factorisation, about twice cheaper than the
+        LU factorisation of :meth:`solve`, e.g. for the normal equations of
+        least squares problems. If `a` is only semi-definite, a small ridge
+        is added to its diagonal, and if the factorisation still fails,
+        :meth:`solve` is used instead.
+
+        Parameters
+        ----------
+        a : tensor, shape (M, M)
+            The symmetric positive (semi-)definite coefficient matrix.
+        b : tensor, shape (M,) or (M, K)
+            The ordinate values.
+        out : tensor, optional
+            If specified, and supported by the backend, the solution is
+            stored in `out`. Always use the returned tensor.
+
+        Returns
+        -------
+        x : tensor, shape (M,) or (M, K)
+            Solution to the system a x = b. Returned shape is identical to `b`.
+        """
+        return self.solve(a, b, out=out)
+
     @staticmethod
     def qr(a):
         """Compute the qr factorization of a matrix.
@@ -542,6 +665,96 @@ class Backend(object):
         """
         raise NotImplementedError
 
+    def batched_dot(self, a, b):
+        """Matrix products of two stacks of matrices
+
+        Parameters
+        ----------
+        a : tensor, shape (B, M, N)
+        b : tensor, shape (B, N, K)
+
+        Returns
+        -------
+        tensor, shape (B, M, K)
+            ``res[i] = dot(a[i], b[i])``
+        """
+        return self.stack([self.dot(a[i], b[i]) for i in range(self.shape(a)[0])])
+
+    def batched_solve(self, a, b):
+        """Solves a stack of linear systems
+
+        Parameters
+        ----------
+        a : tensor, shape (B, M, M)
+            The coefficient matrices.
+        b : tensor, shape (B, M) or (B, M, K)
+            The ordinate values.
+
+        Returns
+        -------
+        x : tensor, same shape as `b`
+            ``x[i]`` is the solution of ``a[i] x[i] = b[i]``
+        """
+        return self.stack([self.solve(a[i], b[i]) for i in range(self.shape(a)[0])])
+
+    def batched_qr(self, a):
+        """QR factorisations of a stack of matrices
+
+        Parameters
+        ----------
+        a : tensor, shape (B, M, N)
+
+        Returns
+        -------
+        Q, R : tensor
+            of shapes (B, M, K) and (B, K, N), with ``K = min(M, N)``
+        """
+        Q, R = zip(*[self.qr(a[i]) for i in range(self.shape(a)[0])])
+        return self.stack(Q), self.stack(R)
+
+    def batched_svd(self, a, n_eigenvecs=None):
+        """Truncated SVDs of a stack of matrices
+
+        Parameters
+        ----------
+        a : tensor, shape (B, M, N)
+        n_eigenvecs : int, optional, default is None
+            number of eigen[vectors-values] to return, by default ``min(M, N)``
+
+        Returns
+        -------
+        U : tensor, shape (B, M, n_eigenvecs)
+        S : tensor, shape (B, n_eigenvecs)
+        V : tensor, shape (B, n_eigenvecs, N)
+            such that ``a[i] = dot(U[i]*S[i], V[i])`` when no singular value is truncated
+        """
+        U, S, V = zip(*[self.partial_svd(a[i], n_eigenvecs=n_eigenvecs)
+                        for i in range(self.shape(a)[0])])
+        return self.stack(U), self.stack(S), self.stack(V)
+
+    def segment_sum(self, data, segment_ids, n_segments):
+        """Sums of the rows of `data` with the same segment id
+
+        Parameters
+        ----------
+        data : tensor, shape (N, ...)
+        segment_ids : int array, shape (N, )
+            segment, between 0 and ``n_segments - 1``, of each row of `data`
+        n_segments : int
+
+        Returns
+        -------
+        tensor, shape (n_segments, ...)
+            ``res[i]`` is the sum of the rows ``data[j]`` such that
+            ``segment_ids[j] == i``
+        """
+        if self.is_tensor(segment_ids):
+            segment_ids = self.to_numpy(segment_ids)
+        values = self.to_numpy(data)
+        res = np.zeros((n_segments, ) + values.shape[1:], dtype=values.dtype)
+        np.add.at(res, np.asarray(segment_ids), values)
+        return self.tensor(res, **self.context(data))
+
     def kron(self, a, b):
         """Kronecker product of two tensors.
 
@@ -605,6 +818,82 @@ class Backend(object):
             res = self.reshape(a * b, (-1, n_col))
         return res
 
+    def mttkrp(self, tensor, factors, mode, block_size=None):
+        """Matricized tensor times Khatri-Rao product
+
+        Computes ``dot(unfold(tensor, mode), khatri_rao(factors, skip_matrix=mode))``
+        without forming the rank-by-rank projected tensor.
+
+        Parameters
+        ----------
+        tensor : tensor
+        factors : list of tensors
+            one matrix per mode of `tensor`, all with the same number of columns `rank`.
+            The factor corresponding to `mode` is not used.
+        mode : int
+            mode on which to unfold `tensor`
+        block_size : int, optional
+            If specified, at most `block_size` rows of the Khatri-Rao product
+            are formed at a time, which bounds the additional memory
+            to ``block_size*rank`` elements.
+            By default, the Khatri-Rao product is formed in one go.
+
+        Returns
+        -------
+        mttkrp : tensor of shape ``(tensor.shape[mode], rank)``
+        """
+        shape = self.shape(tensor)
+        matrices = [factors[i] for i in range(len(factors)) if i != mode]
+        unfolded = self.reshape(self.moveaxis(tensor, mode, 0), (shape[mode], -1))
+        n_rows = self.shape(unfolded)[1]
+
+        if block_size is None or block_size >= n_rows:
+            if len(matrices) == 1:
+                return self.dot(unfolded, matrices[0])
+            return self.dot(unfolded, self.kr(matrices))
+
+        res = None
+        start = 0
+        for block in self.kr_blocks(matrices, block_size):
+            stop = start + self.shape(block)[0]
+            partial = self.dot(unfolded[:, start:stop], block)
+            start = stop
+            if res is None:
+                res = partial
+            else:
+                res = res + partial
+        return res
+
+    def kr_blocks(self, matrices, block_size):
+        """Khatri-Rao product of a list of matrices, by blocks of rows
+
+        Parameters
+        ----------
+        matrices : list of tensors
+            List of 2D tensors with the same number of columns
+        block_size : int
+            maximum number of rows in each block
+
+        Yields
+        ------
+        block : tensor of shape ``(n_rows, m)``, with ``n_rows <= block_size``
+            consecutive rows of ``kr(matrices)``, in order.
+            Only one block is formed at a time.
+        """
+        n_rows = int(np.prod([self.shape(matrix)[0] for matrix in matrices]))
+        for start in range(0, n_rows, block_size):
+            yield self._kr_rows(matrices, start, min(start + block_size, n_rows))
+
+    def _kr_rows(self, matrices, start, stop):
+        """Rows `start` to `stop` of the Khatri-Rao product of `matrices`"""
+        sizes = [self.shape(matrix)[0] for matrix in matrices]
+        indices = np.unravel_index(np.arange(start, stop), sizes)
+        # Fancy indexing returns a copy, which can be updated in place
+        res = matrices[0][indices[0]]
+        for matrix, index in zip(matrices[1:], indices[1:]):
+            res = self.multiply(res, matrix[index], out=res)
+        return res
+
     def partial_svd(self, matrix, n_eigenvecs=None):
         """Computes a fast partial SVD on `matrix`
 
@@ -647,9 +936,9 @@ class Backend(object):
             min_dim = dim_2
             max_dim = dim_1
 
-        if n_eigenvecs >= min_dim:
-            if n_eigenvecs > max_dim:
-                warnings.warn(('Trying to compute SVD with n_eigenvecs={1}, which '
+        if n_eigenvecs is None or n_eigenvecs >= min_dim:
+            if n_eigenvecs is not None and n_eigenvecs > max_dim:
+                warnings.warn(('Trying to compute SVD with n_eigenvecs={0}, which '
                                'is larger than max(matrix.shape)={1}. Setting '
                                'n_eigenvecs to {1}').format(n_eigenvecs, max_dim))
                 n_eigenvecs = max_dim
@@ -660,10 +949,13 @@ class Backend(object):
                 full_matrices = False
 
             # Default on standard SVD
+            # SciPy is only imported when needed as it is slow to import
+            import scipy.linalg
             U, S, V = scipy.linalg.svd(matrix, full_matrices=full_matrices)
             U, S, V = U[:, :n_eigenvecs], S[:n_eigenvecs], V[:n_eigenvecs, :]
         else:
             # We can perform a partial SVD
+            import scipy.sparse.linalg
             # First choose whether to use X * X.T or X.T *X
             if dim_1 < dim_2:
                 S, U = scipy.sparse.linalg.eigsh(
@@ -686,4 +978,114 @@ class Backend(object):
             U = self.tensor(U, **ctx)
             S = self.tensor(S, **ctx)
             V = self.tensor(V, **ctx)
-        return U, S, V
\ No newline at end of file
+        return U, S, V
+
+    def randomized_svd(self, matrix, n_eigenvecs=None, n_oversamples=5, n_iter=2,
+                       random_state=None):
+        """Computes a truncated SVD of `matrix` using random projections
+
+        The range of `matrix` is approximated by multiplying it with a random
+        Gaussian matrix of ``n_eigenvecs + n_oversamples`` columns,
+        refined with `n_iter` power iterations [1]_. The SVD is then computed
+        on the projection of `matrix` on that range, which is small.
+        Neither the full SVD nor the Gram matrix of `matrix` are computed.
+
+        Parameters
+        ----------
+        matrix : tensor
+            A 2D tensor.
+        n_eigenvecs : int, optional, default is None
+            number of eigen[vectors-values] to return.
+            If None, defaults to :meth:`partial_svd`.
+        n_oversamples : int, default is 5
+            number of additional random vectors used to approximate the range
+        n_iter : int, default is 2
+            number of power iterations, increase it if the singular values
+            of `matrix` decay slowly
+        random_state : {None, int, np.random.RandomState}, default is None
+            used to draw the random test matrix
+
+        Returns
+        -------
+        U : 2-D tensor, shape (matrix.shape[0], n_eigenvecs)
+            Contains the right singular vectors
+        S : 1-D tensor, shape (n_eigenvecs, )
+            Contains the singular values of `matrix`
+        V : 2-D tensor, shape (n_eigenvecs, matrix.shape[1])
+            Contains the left singular vectors
+
+        References
+        ----------
+        .. [1] N. Halko, P. G. Martinsson and J. A. Tropp,
+           "Finding structure with randomness: Probabilistic algorithms for
+           constructing approximate matrix decompositions",
+           SIAM Review, vol. 53, n. 2, pp. 217-288, 2011.
+        """
+        if self.ndim(matrix) != 2:
+            raise ValueError('matrix be a matrix. matrix.ndim is %d != 2'
+                             % self.ndim(matrix))
+
+        dim_1, dim_2 = self.shape(matrix)
+        min_dim = min(dim_1, dim_2)
+        if n_eigenvecs is None or 2*(n_eigenvecs + n_oversamples) >= min_dim:
+            # The projection would not be much smaller than the matrix itself,
+            # and the trailing singular values would be poorly approximated
+            return self.partial_svd(matrix, n_eigenvecs=n_eigenvecs)
+
+        # Work on the wide matrix so that the range, of dimension min_dim, is small
+        transposed = dim_1 > dim_2
+        if transposed:
+            matrix = self.transpose(matrix)
+
+        n_samples = n_eigenvecs + n_oversamples
+        omega = _gaussian_test_matrix(max(dim_1, dim_2), n_samples, random_state)
+        omega = self.tensor(omega, **self.context(matrix))
+
+        Q, _ = self.qr(self.dot(matrix, omega))
+        for _ in range(n_iter):
+            Q, _ = self.qr(self.dot(self.transpose(matrix), Q))
+            Q, _ = self.qr(self.dot(matrix, Q))
+
+        # SVD of the (n_samples, max_dim) projection
+        U, S, V = self.partial_svd(self.dot(self.transpose(Q), matrix),
+                                   n_eigenvecs=n_samples)
+        U = self.dot(Q, U[:, :n_eigenvecs])
+        S, V = S[:n_eigenvecs], V[:n_eigenvecs, :]
+
+        if transposed:
+            return self.transpose(V), S, self.transpose(U)
+        return U, S, V
+
+    def limit_threads(self, n_threads):
+        """Limits the number of threads used by the native libraries of the backend
+
+        The limit applies to the BLAS and OpenMP thread pools loaded in the
+        process, controlled with `threadpoolctl` if it is installed.
+        Users should rather use :func:`tensorly.set_num_threads` or
+        :func:`tensorly.thread_limits`, which call this method.
+
+        Parameters
+        ----------
+        n_threads : int or None
+            maximum number of threads, if None, the original limits are restored
+        """
+        limiter = getattr(self, '_thread_limiter', None)
+        if n_threads is None:
+            if limiter is not None:
+                limiter.restore_original_limits()
+                self._thread_limiter = None
+            return
+
+        try:
+            from threadpoolctl import threadpool_limits
+        except ImportError:
+            warnings.warn('Limiting the number of threads of the {} backend requires '
+                          'threadpoolctl, the limit of {} threads is ignored.'.format(
+                              self.backend_name, n_threads), RuntimeWarning)
+            return
+
+        if limiter is None:
+            # Keep the first limiter: it holds the original limits
+            self._thread_limiter = threadpool_limits(limits=n_threads)
+        else:
+            threadpool_limits(limits=n_threads)
@@ -41,8 +41,8 @@ class CupyBackend(Backend):
         return tensor.ndim
 
     @staticmethod
-    def clip(tensor, a_min=None, a_max=None):
-        return cp.clip(tensor, a_min, a_max)
+    def clip(tensor, a_min=None, a_max=None, out=None):
+        return cp.clip(tensor, a_min, a_max, out=out)
 
     def norm(self, tensor, order=2, axis=None):
         # handle difference in default axis notation
@@ -62,9 +62,9 @@ class CupyBackend(Backend):
             return self.to_numpy(res)
         return res
 
-    def solve(self, matrix1, matrix2):
+    def solve(self, matrix1, matrix2, out=None):
         try:
-            cp.linalg.solve(matrix1, matrix2)
+            return cp.linalg.solve(matrix1, matrix2)
         except cp.cuda.cusolver.CUSOLVERError:
             warnings.warn('CuPy solver failed, using numpy.linalg.solve instead.')
             ctx = self.context(matrix1)
@@ -110,15 +110,27 @@ class CupyBackend(Backend):
         U, S, V = U[:, :n_eigenvecs], S[:n_eigenvecs], V[:n_eigenvecs, :]
         return U, S, V
 
+    def partial_svd(self, matrix, n_eigenvecs=None):
+        """Computes a partial SVD on `matrix` with :meth:`truncated_svd`
+
+            Unlike the generic version, `matrix` is not converted to NumPy.
+        """
+        if self.ndim(matrix) != 2:
+            raise ValueError('matrix be a matrix. matrix.ndim is %d != 2'
+                             % self.ndim(matrix))
+        return self.truncated_svd(matrix, n_eigenvecs=n_eigenvecs)
+
     @property
     def SVD_FUNS(self):
         return {'numpy_svd': self.partial_svd,
-                'truncated_svd': self.truncated_svd}
+                'truncated_svd': self.truncated_svd,
+                'randomized_svd': self.randomized_svd}
 
 
 for name in ['float64', 'float32', 'int64', 'int32', 'reshape', 'moveaxis',
              'transpose', 'copy', 'ones', 'zeros', 'zeros_like', 'eye',
              'arange', 'where', 'dot', 'kron', 'qr', 'concatenate', 'max',
-             'min', 'all', 'mean', 'sum', 'prod', 'sign', 'abs', 'sqrt', 'stack']:
+             'min', 'all', 'mean', 'sum', 'prod', 'sign', 'abs', 'sqrt', 'stack',
+             'tensordot']:
     CupyBackend.register_method(name, getattr(cp, name))
 
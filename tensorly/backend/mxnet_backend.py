@@ -56,7 +56,7 @@ class MxnetBackend(Backend):
             shape = [1]
         return nd.reshape(tensor, shape)
 
-    def solve(self, matrix1, matrix2):
+    def solve(self, matrix1, matrix2, out=None):
         ctx = self.context(matrix1)
         matrix1 = self.to_numpy(matrix1)
         matrix2 = self.to_numpy(matrix2)
@@ -133,7 +133,8 @@ class MxnetBackend(Backend):
             return self.tensor(Q, **ctx), self.tensor(R, **ctx)
 
     @staticmethod
-    def clip(tensor, a_min=None, a_max=None, indlace=False):
+    def clip(tensor, a_min=None, a_max=None, indlace=False, out=None):
+        # `out` is ignored, a new tensor is returned
         if a_min is not None and a_max is not None:
             if indlace:
                 nd.max(nd.min(tensor, a_max, out=tensor), a_min, out=tensor)
@@ -259,22 +260,43 @@ class MxnetBackend(Backend):
             # we compute decomposition on the largest of the two to keep more eigenvecs
             dim_1, dim_2 = dim_2, dim_1
 
+        # syevd returns the eigenvectors as rows
+        # rounding errors can make the eigenvalues slightly negative
         if dim_1 < dim_2:
             U, S = nd.linalg.syevd(dot(matrix, transpose(matrix)))
-            S = self.sqrt(S)
+            U = transpose(U)
+            S = self.sqrt(nd.maximum(S, 0))
             V = dot(transpose(matrix), U / reshape(S, (1, -1)))
         else:
             V, S = nd.linalg.syevd(dot(transpose(matrix), matrix))
-            S = self.sqrt(S)
+            V = transpose(V)
+            S = self.sqrt(nd.maximum(S, 0))
             U = dot(matrix, V) / reshape(S, (1, -1))
 
         U, S, V = U[:, ::-1], S[::-1], transpose(V)[::-1, :]
         return U[:, :n_eigenvecs], S[:n_eigenvecs], V[:n_eigenvecs, :]
 
+    def partial_svd(self, matrix, n_eigenvecs=None):
+        """Computes a fast partial SVD on `matrix`
+
+            If `n_eigenvecs` is smaller than the dimensions of `matrix`,
+            :meth:`symeig_svd` is used without converting `matrix` to NumPy.
+            MXNet does not provide a full SVD: otherwise, the generic
+            (NumPy) version is used.
+        """
+        if self.ndim(matrix) != 2:
+            raise ValueError('matrix be a matrix. matrix.ndim is %d != 2'
+                             % self.ndim(matrix))
+
+        if n_eigenvecs is None or n_eigenvecs >= min(self.shape(matrix)):
+            return super().partial_svd(matrix, n_eigenvecs=n_eigenvecs)
+        return self.symeig_svd(matrix, n_eigenvecs=n_eigenvecs)
+
     @property
     def SVD_FUNS(self):
         return {'numpy_svd': self.partial_svd,
-                'symeig_svd': self.symeig_svd}
+                'symeig_svd': self.symeig_svd,
+                'randomized_svd': self.randomized_svd}
 
 for name in ['float64', 'float32', 'int64', 'int32']:
     MxnetBackend.register_method(name, getattr(numpy, name))
@@ -1,7 +1,21 @@
+from functools import lru_cache
+
 import numpy as np
 from .core import Backend
 
 
+@lru_cache(maxsize=128)
+def _einsum_path(subscripts, shapes, optimize):
+    """Contraction path of an einsum expression used by mttkrp, memoised
+
+        The path only depends on the shapes of the operands, which are
+        replaced by zero-strided arrays that take no memory.
+    """
+    operands = [np.broadcast_to(np.empty(()), shape) for shape in shapes]
+    path, _ = np.einsum_path(subscripts, *operands, optimize=optimize)
+    return path
+
+
 class NumpyBackend(Backend):
     backend_name = 'numpy'
 
@@ -30,12 +44,42 @@ class NumpyBackend(Backend):
         return tensor.ndim
 
     @staticmethod
-    def clip(tensor, a_min=None, a_max=None, inplace=False):
-        return np.clip(tensor, a_min, a_max)
+    def clip(tensor, a_min=None, a_max=None, inplace=False, out=None):
+        if inplace:
+            out = tensor
+        return np.clip(tensor, a_min, a_max, out=out)
+
+    @staticmethod
+    def dot(a, b, out=None):
+        return a.dot(b, out=out)
+
+    @staticmethod
+    def solve(a, b, out=None):
+        if out is None:
+            return np.linalg.solve(a, b)
+        out[...] = np.linalg.solve(a, b)
+        return out
 
     @staticmethod
-    def dot(a, b):
-        return a.dot(b)
+    def solve_spd(a, b, out=None):
+        # SciPy is only imported when first used
+        from scipy.linalg.lapack import get_lapack_funcs
+
+        posv, = get_lapack_funcs(('posv', ), (a, b))
+        _, x, info = posv(a, b)
+        if info > 0:
+            # Not positive definite: regularise the diagonal
+            ridge = np.sqrt(np.finfo(x.dtype).eps)*(np.trace(a)/a.shape[0] or 1)
+            _, x, info = posv(a + ridge*np.eye(a.shape[0], dtype=a.dtype), b)
+            if info > 0:
+                x = np.linalg.solve(a, b)
+        if info < 0:
+            raise ValueError('Illegal value in argument {} of the LAPACK routine '
+                             'posv.'.format(-info))
+        if out is None:
+            return x
+        out[...] = x
+        return out
 
     @staticmethod
     def norm(tensor, order=2, axis=None):
@@ -64,19 +108,68 @@ class NumpyBackend(Backend):
         operation = source + '->' + target + common_dim
         return np.einsum(operation, *matrices).reshape((-1, n_columns))
 
+    @staticmethod
+    def mttkrp(tensor, factors, mode, block_size=None):
+        n_modes = tensor.ndim
+        rank = chr(ord('a') + n_modes)
+        tensor_idx = ''.join(chr(ord('a') + i) for i in range(n_modes))
+        operands = [tensor]
+        subscripts = [tensor_idx]
+        for i, factor in enumerate(factors):
+            if i != mode:
+                operands.append(factor)
+                subscripts.append(tensor_idx[i] + rank)
+        subscripts = ','.join(subscripts) + '->' + tensor_idx[mode] + rank
+
+        if block_size is None:
+            optimize = 'greedy'
+        else:
+            optimize = ('greedy', block_size*factors[0].shape[1])
+        shapes = tuple(operand.shape for operand in operands)
+        path = _einsum_path(subscripts, shapes, optimize)
+        return np.einsum(subscripts, *operands, optimize=path)
+
+    @staticmethod
+    def batched_solve(a, b):
+        if b.ndim == a.ndim - 1:
+            # Stack of vectors: np.linalg.solve would take b for a single matrix
+            return np.linalg.solve(a, b[..., None])[..., 0]
+        return np.linalg.solve(a, b)
+
+    @staticmethod
+    def batched_svd(a, n_eigenvecs=None):
+        U, S, V = np.linalg.svd(a, full_matrices=False)
+        return U[..., :n_eigenvecs], S[..., :n_eigenvecs], V[..., :n_eigenvecs, :]
+
+    @staticmethod
+    def segment_sum(data, segment_ids, n_segments):
+        from scipy.sparse import csr_matrix
+
+        # Product with the (sparse) matrix selecting the rows of each segment
+        n_rows = data.shape[0]
+        selection = csr_matrix((np.ones(n_rows, dtype=data.dtype),
+                                (segment_ids, np.arange(n_rows))),
+                               shape=(n_segments, n_rows))
+        res = selection.dot(data.reshape((n_rows, -1)))
+        return res.reshape((n_segments, ) + data.shape[1:])
+
     @property
     def SVD_FUNS(self):
         return {'numpy_svd': self.partial_svd,
-                'truncated_svd': self.partial_svd}
+                'truncated_svd': self.partial_svd,
+                'randomized_svd': self.randomized_svd}
 
 
 for name in ['int64', 'int32', 'float64', 'float32', 'reshape', 'moveaxis',
              'where', 'copy', 'transpose', 'arange', 'ones', 'zeros',
              'zeros_like', 'eye', 'kron', 'concatenate', 'max', 'min',
              'all', 'mean', 'sum', 'prod', 'sign', 'abs', 'sqrt', 'argmin',
-             'argmax', 'stack']:
+             'argmax', 'stack', 'multiply', 'divide', 'tensordot']:
     NumpyBackend.register_method(name, getattr(np, name))
 
 
-for name in ['solve', 'qr']:
+for name in ['qr']:
     NumpyBackend.register_method(name, getattr(np.linalg, name))
+
+NumpyBackend.register_method('batched_dot', np.matmul)
+NumpyBackend.register_method('batched_qr', np.linalg.qr)
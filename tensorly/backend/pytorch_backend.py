@@ -64,16 +64,36 @@ class PyTorchBackend(Backend):
             return torch.arange(float(start), float(stop), float(step))
 
     @staticmethod
-    def clip(tensor, a_min=None, a_max=None, inplace=False):
+    def clip(tensor, a_min=None, a_max=None, inplace=False, out=None):
         if a_max is None:
             a_max = torch.max(tensor)
         if a_min is None:
             a_min = torch.min(tensor)
         if inplace:
-            return torch.clamp(tensor, a_min, a_max, out=tensor)
+            out = tensor
+        if out is not None:
+            return torch.clamp(tensor, a_min, a_max, out=out)
         else:
             return torch.clamp(tensor, a_min, a_max)
 
+    @staticmethod
+    def dot(a, b, out=None):
+        if out is not None:
+            return torch.matmul(a, b, out=out)
+        return torch.matmul(a, b)
+
+    @staticmethod
+    def multiply(a, b, out=None):
+        if out is not None:
+            return torch.mul(a, b, out=out)
+        return torch.mul(a, b)
+
+    @staticmethod
+    def divide(a, b, out=None):
+        if out is not None:
+            return torch.div(a, b, out=out)
+        return torch.div(a, b)
+
     @staticmethod
     def all(tensor):
         return torch.sum(tensor != 0)
@@ -103,15 +123,83 @@ class PyTorchBackend(Backend):
                              'tensor.ndim, got %d' % target)
         return tensor.permute(*axes)
 
-    def solve(self, matrix1, matrix2):
+    def solve(self, matrix1, matrix2, out=None):
         if self.ndim(matrix2) < 2:
             # Currently, gesv doesn't support vectors for matrix2
             # So we instead solve a least square problem...
             solution, _ = torch.gels(matrix2, matrix1)
         else:
             solution, _ = torch.gesv(matrix2, matrix1)
+        if out is not None:
+            return out.copy_(solution)
+        return solution
+
+    def solve_spd(self, a, b, out=None):
+        vector = self.ndim(b) < 2
+        if vector:
+            b = b.unsqueeze(-1)
+
+        def cholesky_solve(a, b):
+            if hasattr(torch, 'cholesky_solve'):
+                return torch.cholesky_solve(b, torch.cholesky(a))
+            return torch.potrs(b, torch.potrf(a, upper=False), upper=False)
+
+        try:
+            solution = cholesky_solve(a, b)
+        except RuntimeError:
+            # Not positive definite: regularise the diagonal
+            n = a.shape[0]
+            ridge = np.sqrt(torch.finfo(a.dtype).eps)*(float(torch.trace(a))/n or 1)
+            try:
+                ridge = ridge*torch.eye(n, dtype=a.dtype, device=a.device)
+                solution = cholesky_solve(a + ridge, b)
+            except RuntimeError:
+                if hasattr(torch, 'linalg') and hasattr(torch.linalg, 'solve'):
+                    solution = torch.linalg.solve(a, b)
+                else:
+                    solution, _ = torch.solve(b, a)
+        if vector:
+            solution = solution.squeeze(-1)
+        if out is not None:
+            return out.copy_(solution)
+        return solution
+
+    def batched_solve(self, a, b):
+        if LooseVersion(torch.__version__) < LooseVersion('1.2.0'):
+            # Older versions only solve single systems
+            return super().batched_solve(a, b)
+        vector = self.ndim(b) == self.ndim(a) - 1
+        if vector:
+            b = b.unsqueeze(-1)
+        if hasattr(torch, 'linalg') and hasattr(torch.linalg, 'solve'):
+            solution = torch.linalg.solve(a, b)
+        else:
+            solution, _ = torch.solve(b, a)
+        if vector:
+            solution = solution.squeeze(-1)
         return solution
 
+    @staticmethod
+    def segment_sum(data, segment_ids, n_segments):
+        segment_ids = torch.as_tensor(segment_ids, dtype=torch.int64, device=data.device)
+        res = torch.zeros((n_segments, ) + tuple(data.shape[1:]), dtype=data.dtype,
+                          device=data.device)
+        return res.index_add_(0, segment_ids, data)
+
+    def batched_qr(self, a):
+        if LooseVersion(torch.__version__) < LooseVersion('1.2.0'):
+            # Older versions only factorise single matrices
+            return super().batched_qr(a)
+        return torch.qr(a)
+
+    def batched_svd(self, a, n_eigenvecs=None):
+        if LooseVersion(torch.__version__) < LooseVersion('1.2.0'):
+            return super().batched_svd(a, n_eigenvecs=n_eigenvecs)
+        # torch.svd returns V such that a = U diag(S) V^T
+        U, S, V = torch.svd(a, some=True)
+        V = V.transpose(-2, -1)
+        return U[..., :n_eigenvecs], S[..., :n_eigenvecs], V[..., :n_eigenvecs, :]
+
     @staticmethod
     def norm(tensor, order=2, axis=None):
         # pytorch does not accept `None` for any keyword arguments. additionally,
@@ -177,6 +265,21 @@ class PyTorchBackend(Backend):
         indices = torch.arange(tensor.shape[axis] - 1, -1, -1, dtype=torch.int64)
         return tensor.index_select(axis, indices)
 
+    def _kr_rows(self, matrices, start, stop):
+        # Compute the row indices on the device of the matrices
+        # rather than transferring indices computed with NumPy
+        rows = torch.arange(start, stop, dtype=torch.int64, device=matrices[0].device)
+        res = None
+        for matrix in reversed(matrices):
+            size = self.shape(matrix)[0]
+            selected = matrix.index_select(0, rows % size)
+            rows = rows // size
+            if res is None:
+                res = selected
+            else:
+                res = res*selected
+        return res
+
     def truncated_svd(self, matrix, n_eigenvecs=None):
         """Computes a truncated SVD on `matrix` using pytorch's SVD
 
@@ -209,8 +312,9 @@ class PyTorchBackend(Backend):
         else:
             full_matrices = False
 
-        U, S, V = torch.svd(matrix, some=full_matrices)
-        U, S, V = U[:, :n_eigenvecs], S[:n_eigenvecs], V[:n_eigenvecs, :]
+        # torch.svd returns V such that matrix = U diag(S) V^T
+        U, S, V = torch.svd(matrix, some=not full_matrices)
+        U, S, V = U[:, :n_eigenvecs], S[:n_eigenvecs], self.transpose(V)[:n_eigenvecs, :]
         return U, S, V
 
     def symeig_svd(self, matrix, n_eigenvecs=None):
@@ -260,13 +364,16 @@ class PyTorchBackend(Backend):
             # we compute decomposition on the largest of the two to keep more eigenvecs
             dim_1, dim_2 = dim_2, dim_1
 
+        # Rounding errors can make the eigenvalues slightly negative
         if dim_1 < dim_2:
-            S, U = torch.symeig(self.dot(matrix, self.transpose(matrix)))
-            S = torch.sqrt(S)
+            S, U = torch.symeig(self.dot(matrix, self.transpose(matrix)),
+                                eigenvectors=True)
+            S = torch.sqrt(torch.clamp(S, min=0))
             V = self.dot(self.transpose(matrix), U / self.reshape(S, (1, -1)))
         else:
-            S, V = torch.symeig(self.dot(self.transpose(matrix), matrix))
-            S = torch.sqrt(S)
+            S, V = torch.symeig(self.dot(self.transpose(matrix), matrix),
+                                eigenvectors=True)
+            S = torch.sqrt(torch.clamp(S, min=0))
             U = self.dot(matrix, V) / self.reshape(S, (1, -1))
 
         U = self._reverse(U, 1)
@@ -274,11 +381,55 @@ class PyTorchBackend(Backend):
         V = self._reverse(self.transpose(V), 0)
         return U[:, :n_eigenvecs], S[:n_eigenvecs], V[:n_eigenvecs, :]
 
+    def partial_svd(self, matrix, n_eigenvecs=None):
+        """Computes a fast partial SVD on `matrix` with PyTorch
+
+            If `n_eigenvecs` is smaller than the dimensions of `matrix`,
+            :meth:`symeig_svd` is used, otherwise :meth:`truncated_svd`.
+            Unlike the generic version, the tensor is never converted to NumPy.
+
+        Parameters
+        ----------
+        matrix : 2D-array
+        n_eigenvecs : int, optional, default is None
+            if specified, number of eigen[vectors-values] to return
+
+        Returns
+        -------
+        U : 2D-array
+            of shape (matrix.shape[0], n_eigenvecs)
+            contains the right singular vectors
+        S : 1D-array
+            of shape (n_eigenvecs, )
+            contains the singular values of `matrix`
+        V : 2D-array
+            of shape (n_eigenvecs, matrix.shape[1])
+            contains the left singular vectors
+        """
+        if self.ndim(matrix) != 2:
+            raise ValueError('matrix be a matrix. matrix.ndim is %d != 2'
+                             % self.ndim(matrix))
+
+        if n_eigenvecs is None or n_eigenvecs >= min(self.shape(matrix)):
+            return self.truncated_svd(matrix, n_eigenvecs=n_eigenvecs)
+        return self.symeig_svd(matrix, n_eigenvecs=n_eigenvecs)
+
+    def limit_threads(self, n_threads):
+        # PyTorch sets the number of threads of its own OpenMP and MKL pools
+        if n_threads is None:
+            n_threads = getattr(self, '_default_num_threads', None)
+            if n_threads is None:
+                return
+        elif getattr(self, '_default_num_threads', None) is None:
+            self._default_num_threads = torch.get_num_threads()
+        torch.set_num_threads(n_threads)
+
     @property
     def SVD_FUNS(self):
         return {'numpy_svd': self.partial_svd,
                 'truncated_svd': self.truncated_svd,
-                'symeig_svd': self.symeig_svd}
+                'symeig_svd': self.symeig_svd,
+                'randomized_svd': self.randomized_svd}
 
     @staticmethod
     def stack(arrays, axis=0):
@@ -289,4 +440,5 @@ for name in ['float64', 'float32', 'int64', 'int32', 'is_tensor', 'ones',
              'abs', 'sqrt', 'sign', 'where', 'qr']:
     PyTorchBackend.register_method(name, getattr(torch, name))
 
-PyTorchBackend.register_method('dot', torch.matmul)
+PyTorchBackend.register_method('batched_dot', torch.matmul)
+
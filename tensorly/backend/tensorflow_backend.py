@@ -57,7 +57,8 @@ class TensorflowBackend(Backend):
             start = 0
         return tf.range(start=start, limit=stop, delta=step, dtype=dtype)
 
-    def clip(self, tensor_, a_min=None, a_max=None, inplace=False):
+    def clip(self, tensor_, a_min=None, a_max=None, inplace=False, out=None):
+        # TensorFlow tensors are immutable: `inplace` and `out` are ignored
         if a_min is not None:
             a_min = self.tensor(a_min, **self.context(tensor_))
         else:
@@ -96,11 +97,11 @@ class TensorflowBackend(Backend):
             return res.numpy()
         return res
 
-    def dot(self, tensor1, tensor2):
+    def dot(self, tensor1, tensor2, out=None):
         return tf.tensordot(tensor1, tensor2, axes=([self.ndim(tensor1) - 1], [0]))
 
     @staticmethod
-    def solve(lhs, rhs):
+    def solve(lhs, rhs, out=None):
         squeeze = []
         if rhs.ndim == 1:
             squeeze = [-1]
@@ -146,10 +147,21 @@ class TensorflowBackend(Backend):
         U, S, V = U[:, :n_eigenvecs], S[:n_eigenvecs], tf.transpose(V)[:n_eigenvecs, :]
         return U, S, V
 
+    def partial_svd(self, matrix, n_eigenvecs=None):
+        """Computes a partial SVD on `matrix` with :meth:`truncated_svd`
+
+            Unlike the generic version, `matrix` is not converted to NumPy.
+        """
+        if self.ndim(matrix) != 2:
+            raise ValueError('matrix be a matrix. matrix.ndim is %d != 2'
+                             % self.ndim(matrix))
+        return self.truncated_svd(matrix, n_eigenvecs=n_eigenvecs)
+
     @property
     def SVD_FUNS(self):
         return {'numpy_svd': self.partial_svd,
-                'truncated_svd': self.truncated_svd}
+                'truncated_svd': self.truncated_svd,
+                'randomized_svd': self.randomized_svd}
 
 _FUN_NAMES = [
     # source_fun, target_fun
@@ -180,6 +192,8 @@ _FUN_NAMES = [
     (tf.reduce_sum, 'sum'),
     (tf.reduce_prod, 'prod'),
     (tf.reduce_all, 'all'),
+    (tf.tensordot, 'tensordot'),
+    (tf.unsorted_segment_sum, 'segment_sum'),
     ]
 for source_fun, target_fun_name in _FUN_NAMES:
     TensorflowBackend.register_method(target_fun_name, source_fun)
@@ -0,0 +1,268 @@
+"""Recording of the backend operations called through tensorly
+
+The calls are recorded by :func:`tensorly.trace_backend`, which replaces
+the methods dispatched to the backend by timed versions: when not tracing,
+the backend is called directly.
+"""
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+
+def _shape(argument):
+    """Shape of a tensor, list of shapes for a list of tensors, None otherwise"""
+    shape = getattr(argument, 'shape', None)
+    if shape is not None:
+        return tuple(shape)
+    if isinstance(argument, (list, tuple)) and argument and \
+            all(hasattr(item, 'shape') for item in argument):
+        return [tuple(item.shape) for item in argument]
+    return None
+
+
+def _size(shape):
+    return int(np.prod(shape)) if shape else 1
+
+
+def _elementwise_flops(shapes, args, kwargs):
+    return max((_size(s) for s in shapes if isinstance(s, tuple)), default=0)
+
+
+def _dot_flops(shapes, args, kwargs):
+    a, b = shapes[:2]
+    if not a or not b:
+        return _size(a)*_size(b)
+    return 2*_size(a)*_size(b)//b[0] if len(b) > 1 else 2*_size(a)
+
+
+def _tensordot_flops(shapes, args, kwargs):
+    a, b = shapes[:2]
+    axes = args[2] if len(args) > 2 else kwargs.get('axes', 2)
+    if isinstance(axes, int):
+        contracted = a[len(a) - axes:]
+    else:
+        contracted = [a[i] for i in np.atleast_1d(axes[0])]
+    return 2*_size(a)*_size(b)//_size(contracted)
+
+
+def _solve_flops(shapes, args, kwargs):
+    a, b = shapes[:2]
+    n = a[0]
+    n_rhs = b[1] if len(b) > 1 else 1
+    return 2*n**3//3 + 2*n**2*n_rhs
+
+
+def _solve_spd_flops(shapes, args, kwargs):
+    a, b = shapes[:2]
+    n = a[0]
+    n_rhs = b[1] if len(b) > 1 else 1
+    return n**3//3 + 2*n**2*n_rhs
+
+
+def _qr_flops(shapes, args, kwargs):
+    m, n = shapes[0]
+    k = min(m, n)
+    return 2*max(m, n)*k**2 - 2*k**3//3
+
+
+def _svd_flops(shapes, args, kwargs):
+    m, n = shapes[0]
+    k = min(m, n)
+    # Golub-Kahan bidiagonalisation followed by the computation of the vectors
+    return 4*m*n*k + 8*k**3
+
+
+def _randomized_svd_flops(shapes, args, kwargs):
+    m, n = shapes[0]
+    n_eigenvecs = args[1] if len(args) > 1 else kwargs.get('n_eigenvecs')
+    if n_eigenvecs is None:
+        return _svd_flops(shapes, args, kwargs)
+    n_oversamples = args[2] if len(args) > 2 else kwargs.get('n_oversamples', 5)
+    n_samples = n_eigenvecs + n_oversamples
+    n_iter = args[3] if len(args) > 3 else kwargs.get('n_iter', 2)
+    # One product with the matrix for the sketch, two per power iteration
+    # and one for the projection
+    return 2*m*n*n_samples*(2*n_iter + 2) + _svd_flops([(n_samples, max(m, n))], (), {})
+
+
+def _kron_flops(shapes, args, kwargs):
+    return _size(shapes[0])*_size(shapes[1])
+
+
+def _kr_flops(shapes, args, kwargs):
+    matrices = shapes[0]
+    rank = matrices[0][1]
+    return (len(matrices) - 1)*_size([s[0] for s in matrices])*rank
+
+
+def _mttkrp_flops(shapes, args, kwargs):
+    tensor, factors = shapes[:2]
+    mode = args[2] if len(args) > 2 else kwargs['mode']
+    rank = factors[0][1]
+    n_rows = _size(tensor)//tensor[mode]
+    # Khatri-Rao product of all the factors but one, then its product with the unfolding
+    return (len(factors) - 2)*n_rows*rank + 2*_size(tensor)*rank
+
+
+def _batched(flops):
+    """FLOP estimate of a batched method from that of the method on a single matrix"""
+    def batched_flops(shapes, args, kwargs):
+        batch_size = shapes[0][0]
+        shapes = [shape[1:] if isinstance(shape, tuple) else shape for shape in shapes]
+        return batch_size*flops(shapes, args, kwargs)
+    return batched_flops
+
+
+def _no_flops(shapes, args, kwargs):
+    return 0
+
+
+#: Estimated number of floating point operations of the backend methods,
+#: as a function of the shapes of the arguments, the arguments and keyword arguments
+FLOP_ESTIMATES = {'dot': _dot_flops,
+                  'tensordot': _tensordot_flops,
+                  'solve': _solve_flops,
+                  'solve_spd': _solve_spd_flops,
+                  'qr': _qr_flops,
+                  'partial_svd': _svd_flops,
+                  'truncated_svd': _svd_flops,
+                  'symeig_svd': _svd_flops,
+                  'numpy_svd': _svd_flops,
+                  'randomized_svd': _randomized_svd_flops,
+                  'kron': _kron_flops,
+                  'kr': _kr_flops,
+                  'mttkrp': _mttkrp_flops,
+                  'batched_dot': _batched(_dot_flops),
+                  'batched_solve': _batched(_solve_flops),
+                  'batched_qr': _batched(_qr_flops),
+                  'batched_svd': _batched(_svd_flops)}
+for _name in ['multiply', 'divide', 'segment_sum', 'clip', 'abs', 'sqrt', 'sign', 'where',
+              'sum', 'mean', 'prod', 'max', 'min', 'argmax', 'argmin', 'norm', 'all']:
+    FLOP_ESTIMATES[_name] = _elementwise_flops
+for _name in ['shape', 'ndim', 'context', 'is_tensor', 'reshape', 'transpose', 'moveaxis',
+              'copy', 'concatenate', 'stack', 'to_numpy', 'tensor', 'arange', 'ones',
+              'zeros', 'zeros_like', 'eye']:
+    FLOP_ESTIMATES[_name] = _no_flops
+
+
+class BackendTracer(object):
+    """Record of the backend operations called while tracing
+
+        Created by :func:`tensorly.trace_backend`. For each call, stores the
+        name of the method, its start time and duration, the shapes of its
+        tensor arguments and, when known, an estimate of its number of
+        floating point operations (FLOPs).
+
+        Note that, for asynchronous backends (e.g. on GPU), the durations are
+        those of launching the operations.
+
+    Attributes
+    ----------
+    events : list of tuple
+        ``(name, start, duration, shapes, flops, thread_id)`` for each call,
+        with the times in seconds
+    """
+    def __init__(self):
+        self.events = []
+        self.start = time.perf_counter()
+
+    def record(self, name, start, duration, args, kwargs):
+        """Records a call to the backend method `name`"""
+        shapes = [_shape(argument) for argument in args]
+        try:
+            flops = FLOP_ESTIMATES[name](shapes, args, kwargs)
+        except Exception:
+            # Unknown method or arguments which cannot be interpreted
+            flops = None
+        self.events.append((name, start, duration, shapes, flops, threading.get_ident()))
+
+    def summary(self):
+        """Statistics for each traced method
+
+        Returns
+        -------
+        dict
+            for each method name, a dict with the number of calls (``'calls'``),
+            the cumulative time in seconds (``'time'``), the estimated number
+            of FLOPs (``'flops'``, None if unknown) and the distinct input
+            shapes (``'shapes'``)
+        """
+        summary = {}
+        for name, _, duration, shapes, flops, _ in self.events:
+            stats = summary.setdefault(name, {'calls': 0, 'time': 0., 'flops': 0,
+                                              'shapes': []})
+            stats['calls'] += 1
+            stats['time'] += duration
+            if flops is None or stats['flops'] is None:
+                stats['flops'] = None
+            else:
+                stats['flops'] += flops
+            if shapes not in stats['shapes']:
+                stats['shapes'].append(shapes)
+        return summary
+
+    def table(self, sort_by='time'):
+        """Summary of the traced methods as a text table
+
+        Parameters
+        ----------
+        sort_by : {'time', 'calls', 'flops'}, default is 'time'
+            column by which to sort the methods, in decreasing order
+
+        Returns
+        -------
+        str
+        """
+        if sort_by not in ['time', 'calls', 'flops']:
+            raise ValueError("sort_by should be one of 'time', 'calls' or 'flops', "
+                             "got {!r}.".format(sort_by))
+        summary = self.summary()
+        names = sorted(summary, key=lambda name: -(summary[name][sort_by] or 0))
+
+        lines = ['{:<20} {:>8} {:>12} {:>12} {:>12} {:>10}'.format(
+            'method', 'calls', 'time (s)', 'mean (ms)', 'GFLOP', 'GFLOP/s')]
+        for name in names:
+            stats = summary[name]
+            if stats['flops'] is None:
+                gflops = rate = '-'
+            else:
+                gflops = '{:.3f}'.format(stats['flops']/1e9)
+                if stats['time']:
+                    rate = '{:.2f}'.format(stats['flops']/1e9/stats['time'])
+                else:
+                    rate = '-'
+            lines.append('{:<20} {:>8} {:>12.4f} {:>12.4f} {:>12} {:>10}'.format(
+                name, stats['calls'], stats['time'], 1e3*stats['time']/stats['calls'],
+                gflops, rate))
+        return '\n'.join(lines)
+
+    def to_chrome_trace(self, path=None):
+        """Exports the calls in the Chrome trace event format
+
+            The trace can be opened in chrome://tracing or Perfetto.
+
+        Parameters
+        ----------
+        path : str, optional
+            if given, the trace is written to this file in JSON
+
+        Returns
+        -------
+        dict
+            the trace, serialisable in JSON
+        """
+        pid = os.getpid()
+        events = []
+        for name, start, duration, shapes, flops, thread_id in self.events:
+            events.append({'name': name, 'ph': 'X', 'pid': pid, 'tid': thread_id,
+                           'ts': 1e6*(start - self.start), 'dur': 1e6*duration,
+                           'args': {'shapes': shapes, 'flops': flops}})
+        trace = {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+        if path is not None:
+            with open(path, 'w') as f:
+                json.dump(trace, f)
+        return trace
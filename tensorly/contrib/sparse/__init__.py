@@ -5,8 +5,9 @@ from .backend import (tensor, is_tensor, context, shape, ndim, to_numpy, copy,
                       concatenate, reshape, moveaxis, transpose,
                       arange, ones, zeros, zeros_like, eye,
                       clip, where, max, min, all, mean, sum,
-                      prod, sign, abs, sqrt, norm, dot, kron,
-                      kr, solve, qr, partial_svd)
+                      prod, sign, abs, sqrt, norm, dot, tensordot, multiply, divide, kron,
+                      kr, mttkrp, solve, solve_spd, qr, partial_svd,
+                      randomized_svd)
 
 from .core import wrap
 
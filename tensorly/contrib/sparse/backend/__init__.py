@@ -23,11 +23,11 @@ def register_sparse_backend(backend_name):
     """Registers a new backend by importing the corresponding module 
         and adding the correspond `Backend` class in Backend._LOADED_BACKEND
         under the key `backend_name`
-    
+
     Parameterss
     ----------
     backend_name : str, name of the backend to load
-    
+
     Raises
     ------
     ValueError
@@ -97,11 +97,17 @@ abs = dispatch_sparse(backend.abs)
 sqrt = dispatch_sparse(backend.sqrt)
 norm = dispatch_sparse(backend.norm)
 dot = dispatch_sparse(backend.dot)
+tensordot = dispatch_sparse(backend.tensordot)
+multiply = dispatch_sparse(backend.multiply)
+divide = dispatch_sparse(backend.divide)
 kron = dispatch_sparse(backend.kron)
 kr = dispatch_sparse(backend.kr)
+mttkrp = dispatch_sparse(backend.mttkrp)
 solve = dispatch_sparse(backend.solve)
+solve_spd = dispatch_sparse(backend.solve_spd)
 qr = dispatch_sparse(backend.qr)
 partial_svd = dispatch_sparse(backend.partial_svd)
+randomized_svd = dispatch_sparse(backend.randomized_svd)
 unfold = dispatch_sparse(base.unfold)
 fold = dispatch_sparse(base.fold)
 tensor_to_vec = dispatch_sparse(base.tensor_to_vec)
@@ -8,7 +8,7 @@ import scipy.sparse.linalg
 import sparse
 
 from . import register_sparse_backend
-from ....backend.core import Backend
+from ....backend.core import Backend, _gaussian_test_matrix
 
 
 _MIN_SPARSE_VERSION = '0.4.1+10.g81eccee'
@@ -66,12 +66,19 @@ class NumpySparseBackend(Backend):
         else:
             return np.sum(np.abs(tensor)**order, axis=axis)**(1 / order)
 
-    def dot(self, x, y):
+    @staticmethod
+    def clip(tensor, a_min=None, a_max=None, out=None):
+        # Sparse arrays cannot be used as outputs
+        if is_sparse(tensor) or is_sparse(out):
+            return np.clip(tensor, a_min, a_max)
+        return np.clip(tensor, a_min, a_max, out=out)
+
+    def dot(self, x, y, out=None):
         if is_sparse(x) or is_sparse(y):
             return sparse.dot(x, y)
-        return np.dot(x, y)
+        return np.dot(x, y, out=out)
 
-    def solve(self, A, b):
+    def solve(self, A, b, out=None):
         """
         Compute x s.t. Ax = b
         """
@@ -83,6 +90,40 @@ class NumpySparseBackend(Backend):
 
         return x
 
+    def kr_blocks(self, matrices, block_size):
+        if not any(is_sparse(matrix) for matrix in matrices):
+            yield from super().kr_blocks(matrices, block_size)
+            return
+
+        # The size of a sparse Khatri-Rao product depends on its number of non-zeros,
+        # not on its number of rows: return it in one block
+        yield self.kr(matrices)
+
+    def mttkrp(self, tensor, factors, mode, block_size=None):
+        if not is_sparse(tensor):
+            return super().mttkrp(tensor, factors, mode, block_size=block_size)
+
+        # Only the non-zero elements contribute to the MTTKRP:
+        # accumulate their product with the corresponding rows of the factors
+        factors = [f.todense() if is_sparse(f) else f for f in factors]
+        rank = factors[0].shape[1]
+        coords, data = tensor.coords, tensor.data
+        n_nonzero = data.shape[0]
+        if block_size is None:
+            block_size = n_nonzero
+
+        res = np.zeros((tensor.shape[mode], rank), dtype=np.result_type(data, *factors))
+        for start in range(0, n_nonzero, block_size):
+            stop = min(start + block_size, n_nonzero)
+            rows = data[start:stop, None]
+            for i, factor in enumerate(factors):
+                if i != mode:
+                    rows = rows*factor[coords[i, start:stop]]
+            for r in range(rank):
+                res[:, r] += np.bincount(coords[mode, start:stop], weights=rows[:, r],
+                                         minlength=tensor.shape[mode])
+        return sparse.COO.from_numpy(res)
+
     @staticmethod
     def partial_svd(matrix, n_eigenvecs=None):
         # Check that matrix is... a matrix!
@@ -138,19 +179,55 @@ class NumpySparseBackend(Backend):
             U, S, V = U[:, ::-1], S[::-1], V[:, ::-1]
         return U, S, V.T.conj()
 
+    def randomized_svd(self, matrix, n_eigenvecs=None, n_oversamples=5, n_iter=2,
+                       random_state=None):
+        if matrix.ndim != 2:
+            raise ValueError('matrix be a matrix. matrix.ndim is {} != 2'.format(
+                matrix.ndim))
+
+        dim_1, dim_2 = matrix.shape
+        min_dim = min(dim_1, dim_2)
+        if n_eigenvecs is None or n_eigenvecs + n_oversamples >= min_dim:
+            return self.partial_svd(matrix, n_eigenvecs=n_eigenvecs)
+
+        def dense_dot(x, y):
+            res = self.dot(x, y)
+            return res.todense() if is_sparse(res) else res
+
+        transposed = dim_1 > dim_2
+        if transposed:
+            matrix = matrix.T
+
+        # The random matrix and the range are dense, only `matrix` is sparse
+        n_samples = n_eigenvecs + n_oversamples
+        omega = _gaussian_test_matrix(max(dim_1, dim_2), n_samples, random_state)
+        omega = omega.astype(matrix.dtype)
+        Q, _ = np.linalg.qr(dense_dot(matrix, omega))
+        for _ in range(n_iter):
+            Q, _ = np.linalg.qr(dense_dot(matrix.T, Q))
+            Q, _ = np.linalg.qr(dense_dot(matrix, Q))
+
+        U, S, V = scipy.linalg.svd(dense_dot(Q.T, matrix), full_matrices=False)
+        U, S, V = np.dot(Q, U[:, :n_eigenvecs]), S[:n_eigenvecs], V[:n_eigenvecs, :]
+
+        if transposed:
+            return V.T, S, U.T
+        return U, S, V
+
     @property
     def SVD_FUNS(self):
         return {'numpy_svd': self.partial_svd,
-                'truncated_svd': self.partial_svd}
+                'truncated_svd': self.partial_svd,
+                'randomized_svd': self.randomized_svd}
 
 
 for name in ['int64', 'int32', 'float64', 'float32', 'moveaxis', 'transpose',
              'reshape', 'ndim', 'shape', 'max', 'min', 'all', 'mean', 'sum',
-             'prod', 'sqrt', 'abs', 'sign', 'clip', 'arange']:
+             'prod', 'sqrt', 'abs', 'sign', 'arange']:
     NumpySparseBackend.register_method(name, getattr(np, name))
 
 for name in ['where', 'concatenate', 'kron', 'zeros', 'zeros_like', 'eye',
-             'ones', 'stack']:
+             'ones', 'stack', 'tensordot']:
     NumpySparseBackend.register_method(name, getattr(sparse, name))
 
 
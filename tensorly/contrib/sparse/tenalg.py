@@ -1,5 +1,5 @@
 from ...tenalg import (mode_dot, multi_mode_dot, 
-                       kronecker, khatri_rao, inner,
+                       kronecker, khatri_rao, kr_dot, inner,
                        unfolding_dot_khatri_rao)
 from .core import wrap
 
@@ -8,5 +8,6 @@ mode_dot = wrap(mode_dot)
 multi_mode_dot = wrap(multi_mode_dot)
 kronecker = wrap(kronecker)
 khatri_rao = wrap(khatri_rao)
+kr_dot = wrap(kr_dot)
 inner = wrap(inner)
 unfolding_dot_khatri_rao = wrap(unfolding_dot_khatri_rao)
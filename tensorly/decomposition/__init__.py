@@ -7,4 +7,6 @@ from .candecomp_parafac import parafac, non_negative_parafac, randomised_parafac
 from ._tucker import tucker, partial_tucker, non_negative_tucker
 from .robust_decomposition import robust_pca
 from .mps_decomposition import matrix_product_state
+from .batched import batched_parafac, batched_tucker
+from .multistart import multistart_parafac
 
@@ -1,8 +1,10 @@
 import tensorly as tl
+from ..backend import thread_limited
 from ..base import unfold
 from ..tenalg import multi_mode_dot, mode_dot
 from ..tucker_tensor import tucker_to_tensor
 from ..random import check_random_state
+from .candecomp_parafac import _hals_update
 from math import sqrt
 
 import warnings
@@ -11,8 +13,54 @@ import warnings
 
 # License: BSD 3 clause
 
+
+def _check_initial_tucker(tensor, modes, rank, init):
+    """Checks the shapes of the initial factors, or (core, factors), and copies them
+
+    Parameters
+    ----------
+    tensor : ndarray
+    modes : int list
+        modes of the decomposition
+    rank : int list
+        rank of the decomposition for each mode in `modes`
+    init : ndarray list or (ndarray, ndarray list)
+        initial factors, optionally with the initial core
+
+    Returns
+    -------
+    core : ndarray or None
+        initial core, None if only the factors were given
+    factors : ndarray list
+    """
+    if len(init) == 2 and isinstance(init[1], (list, tuple)):
+        core, factors = init
+    else:
+        core, factors = None, init
+
+    if len(factors) != len(modes):
+        raise ValueError('Got {} initial factors for a decomposition along {} '
+                         'modes.'.format(len(factors), len(modes)))
+    core_shape = list(tl.shape(tensor))
+    for index, (mode, factor) in enumerate(zip(modes, factors)):
+        core_shape[mode] = rank[index]
+        if tuple(tl.shape(factor)) != (tl.shape(tensor)[mode], rank[index]):
+            raise ValueError('The initial factor of mode {} should be of shape {}, '
+                             'got {}.'.format(mode, (tl.shape(tensor)[mode], rank[index]),
+                                              tuple(tl.shape(factor))))
+
+    if core is not None:
+        if tuple(tl.shape(core)) != tuple(core_shape):
+            raise ValueError('The initial core should be of shape {}, got {}.'.format(
+                tuple(core_shape), tuple(tl.shape(core))))
+        core = tl.copy(core)
+    return core, [tl.copy(factor) for factor in factors]
+
+
+@thread_limited
 def partial_tucker(tensor, modes, rank=None, n_iter_max=100, init='svd', tol=10e-5,
-                   svd='numpy_svd', random_state=None, verbose=False, ranks=None):
+                   svd='numpy_svd', random_state=None, verbose=False, ranks=None,
+                   n_jobs=None):
     """Partial tucker decomposition via Higher Order Orthogonal Iteration (HOI)
 
         Decomposes `tensor` into a Tucker decomposition exclusively along the provided modes.
@@ -26,7 +74,10 @@ def partial_tucker(tensor, modes, rank=None, n_iter_max=100, init='svd', tol=10e
             size of the core tensor, ``(len(ranks) == len(modes))``
     n_iter_max : int
                  maximum number of iteration
-    init : {'svd', 'random'}, optional
+    init : {'svd', 'random'}, ndarray list or (ndarray, ndarray list), optional
+        type of initialization, or initial factors of the modes in `modes`
+        (e.g. those of a previous decomposition), with or without the core.
+        Only the factors are used by HOOI.
     svd : str, default is 'numpy_svd'
         function to use to compute the SVD,
         acceptable values in tensorly.SVD_FUNS
@@ -36,6 +87,9 @@ def partial_tucker(tensor, modes, rank=None, n_iter_max=100, init='svd', tol=10e
     random_state : {None, int, np.random.RandomState}
     verbose : int, optional
         level of verbosity
+    n_jobs : int, optional, default is None
+        maximum number of threads the backend may use (e.g. for BLAS),
+        see :func:`tensorly.thread_limits`. If None, the limits are left unchanged.
 
     Returns
     -------
@@ -67,8 +121,10 @@ def partial_tucker(tensor, modes, rank=None, n_iter_max=100, init='svd', tol=10e
                 svd, tl.get_backend(), tl.SVD_FUNS)
         raise ValueError(message)
 
+    if isinstance(init, (list, tuple)):
+        _, factors = _check_initial_tucker(tensor, modes, rank, init)
     # SVD init
-    if init == 'svd':
+    elif init == 'svd':
         factors = []
         for index, mode in enumerate(modes):
             eigenvecs, _, _ = svd_fun(unfold(tensor, mode), n_eigenvecs=rank[index])
@@ -107,7 +163,7 @@ def partial_tucker(tensor, modes, rank=None, n_iter_max=100, init='svd', tol=10e
 
 
 def tucker(tensor, rank=None, ranks=None, n_iter_max=100, init='svd',
-           svd='numpy_svd', tol=10e-5, random_state=None, verbose=False):
+           svd='numpy_svd', tol=10e-5, random_state=None, verbose=False, n_jobs=None):
     """Tucker decomposition via Higher Order Orthogonal Iteration (HOI)
 
         Decomposes `tensor` into a Tucker decomposition:
@@ -120,7 +176,9 @@ def tucker(tensor, rank=None, ranks=None, n_iter_max=100, init='svd',
             size of the core tensor, ``(len(ranks) == tensor.ndim)``
     n_iter_max : int
                  maximum number of iteration
-    init : {'svd', 'random'}, optional
+    init : {'svd', 'random'}, ndarray list or (ndarray, ndarray list), optional
+        type of initialization, or initial factors (e.g. those of a previous
+        decomposition), with or without the core, see :func:`partial_tucker`
     svd : str, default is 'numpy_svd'
         function to use to compute the SVD,
         acceptable values in tensorly.SVD_FUNS
@@ -130,6 +188,9 @@ def tucker(tensor, rank=None, ranks=None, n_iter_max=100, init='svd',
     random_state : {None, int, np.random.RandomState}
     verbose : int, optional
         level of verbosity
+    n_jobs : int, optional, default is None
+        maximum number of threads the backend may use (e.g. for BLAS),
+        see :func:`tensorly.thread_limits`. If None, the limits are left unchanged.
 
     Returns
     -------
@@ -146,14 +207,22 @@ def tucker(tensor, rank=None, ranks=None, n_iter_max=100, init='svd',
     """
     modes = list(range(tl.ndim(tensor)))
     return partial_tucker(tensor, modes, rank=rank, ranks=ranks, n_iter_max=n_iter_max, init=init,
-                          svd=svd, tol=tol, random_state=random_state, verbose=verbose)
+                          svd=svd, tol=tol, random_state=random_state, verbose=verbose,
+                          n_jobs=n_jobs)
 
 
+@thread_limited
 def non_negative_tucker(tensor, rank, n_iter_max=10, init='svd', tol=10e-5,
-                        random_state=None, verbose=False, ranks=None):
+                        random_state=None, verbose=False, ranks=None, method='mu',
+                        n_iter_core=10, n_jobs=None):
     """Non-negative Tucker decomposition
 
-        Iterative multiplicative update, see [2]_
+        Iterative multiplicative update, see [2]_, or HALS updates of the factors
+        and accelerated projected gradient updates of the core, see [3]_.
+
+        With HALS, the tensor is only used through its projections on the factors,
+        which are of the size of the core for all the modes but one:
+        the full-size tensor is never reconstructed.
 
     Parameters
     ----------
@@ -162,8 +231,25 @@ def non_negative_tucker(tensor, rank, n_iter_max=10, init='svd', tol=10e-5,
             number of components
     n_iter_max : int
                  maximum number of iteration
-    init : {'svd', 'random'}
+    init : {'svd', 'random'}, ndarray list or (ndarray, ndarray list)
+        type of initialization, or initial factors (e.g. those of a previous
+        decomposition), with or without the core. If the core is not given,
+        it is initialized with the projection of `tensor` on the factors.
+    tol : float, optional
+        tolerance: the algorithm stops when the variation in
+        the reconstruction error is less than the tolerance
     random_state : {None, int, np.random.RandomState}
+    verbose : int, optional
+        level of verbosity
+    method : {'mu', 'hals'}, default is 'mu'
+        'mu' for multiplicative updates, 'hals' for HALS updates of the factors
+        and accelerated projected gradient updates of the core (not supported
+        by TensorFlow, whose tensors cannot be updated in place)
+    n_iter_core : int, default is 10
+        with HALS, number of projected gradient steps on the core per iteration
+    n_jobs : int, optional, default is None
+        maximum number of threads the backend may use (e.g. for BLAS),
+        see :func:`tensorly.thread_limits`. If None, the limits are left unchanged.
 
     Returns
     -------
@@ -180,12 +266,16 @@ def non_negative_tucker(tensor, rank, n_iter_max=10, init='svd', tol=10e-5,
        "Nonnegative tucker decomposition",
        IEEE Conference on Computer Vision and Pattern Recognition s(CVPR),
        pp 1-8, 2007
+    .. [3] Guoxu Zhou, Andrzej Cichocki and Shengli Xie,
+       "Fast nonnegative matrix/tensor factorization based on low-rank approximation",
+       IEEE Transactions on Signal Processing, vol. 60, n. 6, pp 2928-2940, 2012
     """
     if ranks is not None:
         message = "'ranks' is depreciated, please use 'rank' instead"
         warnings.warn(message, DeprecationWarning)
         rank = ranks
 
+    modes = list(range(tl.ndim(tensor)))
     if rank is None:
         rank = [tl.shape(tensor)[mode] for mode in modes]
     elif isinstance(rank, int):
@@ -193,11 +283,20 @@ def non_negative_tucker(tensor, rank, n_iter_max=10, init='svd', tol=10e-5,
         warnings.warn(message, DeprecationWarning)
         rank = [rank for _ in modes]
 
+    if method not in ['mu', 'hals']:
+        raise ValueError("method should be 'mu' or 'hals', got {!r}.".format(method))
+
 
     epsilon = 10e-12
 
     # Initialisation
-    if init == 'svd':
+    if isinstance(init, (list, tuple)):
+        core, factors = _check_initial_tucker(tensor, modes, rank, init)
+        if core is None:
+            core = multi_mode_dot(tensor, factors, transpose=True)
+        nn_factors = [tl.abs(f) for f in factors]
+        nn_core = tl.abs(core)
+    elif init == 'svd':
         core, factors = tucker(tensor, rank)
         nn_factors = [tl.abs(f) for f in factors]
         nn_core = tl.abs(core)
@@ -208,30 +307,44 @@ def non_negative_tucker(tensor, rank, n_iter_max=10, init='svd', tol=10e-5,
         nn_factors = [tl.abs(f) for f in factors]
         nn_core = tl.abs(core)
 
+    if method == 'hals':
+        return _non_negative_tucker_hals(tensor, nn_core, nn_factors,
+                                         n_iter_max=n_iter_max, tol=tol,
+                                         n_iter_core=n_iter_core, verbose=verbose)
+
     n_factors = len(nn_factors)
     norm_tensor = tl.norm(tensor, 2)
     rec_errors = []
+    # Buffers for the multiplicative updates of the factors,
+    # allocated at the first iteration
+    numerators = [None]*n_factors
+    denominators = [None]*n_factors
 
     for iteration in range(n_iter_max):
         for mode in range(tl.ndim(tensor)):
             B = tucker_to_tensor(nn_core, nn_factors, skip_factor=mode)
             B = tl.transpose(unfold(B, mode))
 
-            numerator = tl.dot(unfold(tensor, mode), B)
-            numerator = tl.clip(numerator, a_min=epsilon, a_max=None)
-            denominator = tl.dot(nn_factors[mode], tl.dot(tl.transpose(B), B))
-            denominator = tl.clip(denominator, a_min=epsilon, a_max=None)
-            nn_factors[mode] *= numerator / denominator
+            numerator = tl.dot(unfold(tensor, mode), B, out=numerators[mode])
+            numerator = tl.clip(numerator, a_min=epsilon, a_max=None, out=numerator)
+            denominator = tl.dot(nn_factors[mode], tl.dot(tl.transpose(B), B),
+                                 out=denominators[mode])
+            denominator = tl.clip(denominator, a_min=epsilon, a_max=None, out=denominator)
+            numerators[mode] = tl.divide(numerator, denominator, out=numerator)
+            denominators[mode] = denominator
+            nn_factors[mode] = tl.multiply(nn_factors[mode], numerators[mode],
+                                           out=nn_factors[mode])
 
         numerator = tucker_to_tensor(tensor, nn_factors, transpose_factors=True)
-        numerator = tl.clip(numerator, a_min=epsilon, a_max=None)
+        numerator = tl.clip(numerator, a_min=epsilon, a_max=None, out=numerator)
         for i, f in enumerate(nn_factors):
             if i:
                 denominator = mode_dot(denominator, tl.dot(tl.transpose(f), f), i)
             else:
                 denominator = mode_dot(nn_core, tl.dot(tl.transpose(f), f), i)
-        denominator = tl.clip(denominator, a_min=epsilon, a_max=None)
-        nn_core *= numerator / denominator
+        denominator = tl.clip(denominator, a_min=epsilon, a_max=None, out=denominator)
+        numerator = tl.divide(numerator, denominator, out=numerator)
+        nn_core = tl.multiply(nn_core, numerator, out=nn_core)
 
         rec_error = tl.norm(tensor - tucker_to_tensor(nn_core, nn_factors), 2) / norm_tensor
         rec_errors.append(rec_error)
@@ -245,3 +358,83 @@ def non_negative_tucker(tensor, rank, n_iter_max=10, init='svd', tol=10e-5,
             break
 
     return nn_core, nn_factors
+
+
+def _non_negative_tucker_hals(tensor, core, factors, n_iter_max=10, tol=10e-5,
+                              n_iter_core=10, verbose=False):
+    """Non-negative Tucker decomposition with HALS and accelerated projected gradient
+
+        For each mode, the least squares problem in the factor only involves
+        the projection of the tensor on the other factors and the Gram matrices
+        of the factors, on which the columns of the factor are updated with HALS.
+        The core is then updated with `n_iter_core` steps of Nesterov's
+        accelerated projected gradient, on the projection of the tensor on all
+        the factors.
+
+    Parameters
+    ----------
+    tensor : ndarray
+    core : ndarray
+        non-negative initial core
+    factors : ndarray list
+        non-negative initial factors, updated in place
+    n_iter_max : int
+    tol : float
+    n_iter_core : int
+    verbose : int
+
+    Returns
+    -------
+    core, factors
+    """
+    n_modes = tl.ndim(tensor)
+    norm_tensor = tl.norm(tensor, 2)
+    grams = [tl.dot(tl.transpose(f), f) for f in factors]
+    rec_errors = []
+
+    for iteration in range(n_iter_max):
+        for mode in range(n_modes):
+            # Normal equations of the factor: factor . (B^T B) = unfold(tensor) . B,
+            # with B = kron(other factors) . unfold(core)^T, computed without forming B
+            unfolded_core = unfold(core, mode)
+            projection = multi_mode_dot(tensor, factors, skip=mode, transpose=True)
+            mttkrp = tl.dot(unfold(projection, mode), tl.transpose(unfolded_core))
+            pseudo_inverse = tl.dot(unfold(multi_mode_dot(core, grams, skip=mode), mode),
+                                    tl.transpose(unfolded_core))
+            factors[mode] = _hals_update(factors[mode], mttkrp, pseudo_inverse)
+            grams[mode] = tl.dot(tl.transpose(factors[mode]), factors[mode])
+
+        # Gradient of the loss in the core: core x_k grams[k] - tensor x_k factors[k]^T
+        projection = multi_mode_dot(projection, [factors[-1]], modes=[n_modes - 1],
+                                    transpose=True)
+        lipschitz = 1
+        for gram in grams:
+            lipschitz *= tl.partial_svd(gram)[1][0]
+
+        momentum_core = core
+        t = 1
+        for _ in range(n_iter_core):
+            gradient = multi_mode_dot(momentum_core, grams) - projection
+            new_core = tl.clip(momentum_core - gradient/lipschitz, a_min=0, a_max=None)
+            new_t = (1 + sqrt(1 + 4*t**2))/2
+            momentum_core = new_core + ((t - 1)/new_t)*(new_core - core)
+            core, t = new_core, new_t
+
+        # ||tensor - rec||^2
+        #     = ||tensor||^2 - 2 <projection, core> + <core x_k grams[k], core>
+        rec_norm = tl.sum(core*multi_mode_dot(core, grams))
+        iprod = tl.sum(core*projection)
+        rec_error = sqrt(abs(norm_tensor**2 - 2*iprod + rec_norm))/norm_tensor
+        rec_errors.append(rec_error)
+
+        if iteration > 1:
+            if verbose:
+                print('reconstruction error={}, variation={}.'.format(
+                    rec_errors[-1], rec_errors[-2] - rec_errors[-1]))
+
+            if tol and abs(rec_errors[-2] - rec_errors[-1]) < tol:
+                if verbose:
+                    print('converged in {} iterations.'.format(iteration))
+                break
+
+    return core, factors
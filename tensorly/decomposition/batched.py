@@ -0,0 +1,274 @@
+import tensorly as tl
+from ..backend import thread_limited
+from ..random import check_random_state
+
+# License: BSD 3 clause
+
+
+def _batched_unfold(tensors, mode):
+    """Mode-`mode` unfoldings of a stack of tensors, of shape (B, I_mode, -1)"""
+    batch_size = tl.shape(tensors)[0]
+    n_rows = tl.shape(tensors)[mode + 1]
+    return tl.reshape(tl.moveaxis(tensors, mode + 1, 1), (batch_size, n_rows, -1))
+
+
+def _batched_transpose(matrices):
+    return tl.transpose(matrices, (0, 2, 1))
+
+
+def _batched_mode_dot(tensors, matrices, mode):
+    """Products, for each i, of ``tensors[i]`` by ``matrices[i]`` in mode `mode`
+
+        ``matrices`` is of shape (B, J, I_mode).
+    """
+    batch_size = tl.shape(tensors)[0]
+    res = tl.moveaxis(tensors, mode + 1, -1)
+    shape = tl.shape(res)[:-1] + (tl.shape(matrices)[1], )
+    res = tl.batched_dot(tl.reshape(res, (batch_size, -1, tl.shape(res)[-1])),
+                         _batched_transpose(matrices))
+    return tl.moveaxis(tl.reshape(res, shape), -1, mode + 1)
+
+
+def _batched_mttkrp(tensors, factors, mode):
+    """MTTKRPs of a stack of tensors with their stacked CP factors
+
+    Parameters
+    ----------
+    tensors : tensor of shape (B, I_1, ..., I_N)
+    factors : list of N tensors of shape (B, I_k, rank)
+    mode : int
+
+    Returns
+    -------
+    tensor of shape (B, I_mode, rank)
+        ``res[i] = dot(unfold(tensors[i], mode),
+        khatri_rao([f[i] for f in factors], skip_matrix=mode))``
+    """
+    shape = tl.shape(tensors)
+    batch_size, n_modes = shape[0], len(shape) - 1
+    rank = tl.shape(factors[0])[2]
+
+    # The last mode (or the one before) is contracted first with a batched matrix
+    # product, which does not require copying the tensors
+    first = n_modes - 1 if mode != n_modes - 1 else n_modes - 2
+    res = tl.moveaxis(tensors, first + 1, -1)
+    kept_shape = tl.shape(res)[:-1]
+    res = tl.batched_dot(tl.reshape(res, (batch_size, -1, shape[first + 1])),
+                         factors[first])
+    res = tl.reshape(res, kept_shape + (rank, ))
+
+    # The other modes are contracted one by one, keeping the rank index
+    modes = [k for k in range(n_modes) if k != first]
+    for k in reversed(modes):
+        if k == mode:
+            continue
+        axis = modes.index(k) + 1
+        factor_shape = [batch_size] + [1]*len(modes) + [rank]
+        factor_shape[axis] = shape[k + 1]
+        res = tl.sum(res*tl.reshape(factors[k], factor_shape), axis=axis)
+        modes.remove(k)
+    return res
+
+
+def _random_factors(tensors, rank, rng):
+    batch_size, *shape = tl.shape(tensors)
+    return [tl.tensor(rng.random_sample((batch_size, size, r)), **tl.context(tensors))
+            for size, r in zip(shape, rank)]
+
+
+@thread_limited
+def batched_parafac(tensors, rank, n_iter_max=100, init='svd', tol=1e-8,
+                    random_state=None, verbose=False, return_errors=False, n_jobs=None):
+    """CP decompositions of a stack of tensors via batched alternating least squares
+
+        Fits, in lockstep, one rank-`rank` CP decomposition of each
+        ``tensors[i]``. Each step of ALS is computed for all the tensors at
+        once with batched linear algebra (e.g. :func:`tensorly.batched_solve`),
+        rather than with one small call per tensor.
+
+    Parameters
+    ----------
+    tensors : ndarray
+        stack of B tensors, of shape ``(B, I_1, ..., I_N)``
+    rank  : int
+        Number of components.
+    n_iter_max : int
+        Maximum number of iteration
+    init : {'svd', 'random'}, optional
+        Type of factor matrix initialization, see :func:`tensorly.decomposition.parafac`.
+    tol : float, optional
+        Relative reconstruction error tolerance: the algorithm stops when the
+        variation in the reconstruction error of all the tensors is less than `tol`.
+    random_state : {None, int, np.random.RandomState}
+    verbose : int, optional
+        Level of verbosity
+    return_errors : bool, optional
+        Activate return of iteration errors
+    n_jobs : int, optional, default is None
+        maximum number of threads the backend may use, see :func:`tensorly.thread_limits`
+
+    Returns
+    -------
+    factors : ndarray list
+        List of the stacked factors: element `k` is of shape ``(B, I_k, rank)``
+        and ``factors[k][i]`` is the `k`-th factor of the decomposition of ``tensors[i]``
+    errors : list
+        A list of reconstruction errors, of shape ``(B, )``, at each iteration.
+    """
+    rng = check_random_state(random_state)
+    batch_size, *shape = tl.shape(tensors)
+    n_modes = len(shape)
+
+    if init == 'random':
+        factors = _random_factors(tensors, [rank]*n_modes, rng)
+    elif init == 'svd':
+        factors = []
+        for mode in range(n_modes):
+            U, _, _ = tl.batched_svd(_batched_unfold(tensors, mode), n_eigenvecs=rank)
+            if shape[mode] < rank:
+                random_shape = (batch_size, shape[mode], rank - shape[mode])
+                random_part = tl.tensor(rng.random_sample(random_shape),
+                                        **tl.context(tensors))
+                U = tl.concatenate([U, random_part], axis=2)
+            factors.append(U)
+    else:
+        raise ValueError('Initialization method "{}" not recognized'.format(init))
+
+    grams = [tl.batched_dot(_batched_transpose(f), f) for f in factors]
+    norm_tensors = tl.sum(tl.reshape(tensors, (batch_size, -1))**2, axis=1)
+    rec_errors = []
+
+    for iteration in range(n_iter_max):
+        for mode in range(n_modes):
+            pseudo_inverse = None
+            for i, gram in enumerate(grams):
+                if i != mode:
+                    if pseudo_inverse is None:
+                        pseudo_inverse = gram
+                    else:
+                        pseudo_inverse = pseudo_inverse*gram
+
+            mttkrp = _batched_mttkrp(tensors, factors, mode)
+            factor = tl.batched_solve(pseudo_inverse, _batched_transpose(mttkrp))
+            factor = _batched_transpose(factor)
+            factors[mode] = factor
+            grams[mode] = tl.batched_dot(_batched_transpose(factor), factor)
+
+        if tol:
+            # ||tensor - rec||^2 = ||tensor||^2 + ||rec||^2 - 2*<tensor, rec>
+            factors_norm = tl.reshape(pseudo_inverse*grams[-1], (batch_size, -1))
+            factors_norm = tl.sum(factors_norm, axis=1)
+            iprod = tl.sum(tl.reshape(mttkrp*factor, (batch_size, -1)), axis=1)
+            rec_error = tl.abs(norm_tensors + factors_norm - 2*iprod)
+            rec_error = tl.sqrt(rec_error/norm_tensors)
+            rec_errors.append(rec_error)
+
+            if iteration >= 1:
+                variation = tl.max(tl.abs(rec_errors[-2] - rec_errors[-1]))
+                if verbose:
+                    print('mean reconstruction error={}, max variation={}.'.format(
+                        tl.mean(rec_errors[-1]), variation))
+
+                if variation < tol:
+                    if verbose:
+                        print('converged in {} iterations.'.format(iteration))
+                    break
+
+    if return_errors:
+        return factors, rec_errors
+    else:
+        return factors
+
+
+@thread_limited
+def batched_tucker(tensors, rank, n_iter_max=100, init='svd', tol=10e-5,
+                   random_state=None, verbose=False, n_jobs=None):
+    """Tucker decompositions of a stack of tensors via batched HOOI
+
+        Fits, in lockstep, one Tucker decomposition of each ``tensors[i]``,
+        computing the projections and SVDs of all the tensors at once with
+        batched linear algebra (e.g. :func:`tensorly.batched_svd`).
+
+    Parameters
+    ----------
+    tensors : ndarray
+        stack of B tensors, of shape ``(B, I_1, ..., I_N)``
+    rank : int or int list
+        size of the core tensors, ``(len(rank) == N)``
+    n_iter_max : int
+        maximum number of iteration
+    init : {'svd', 'random'}, optional
+    tol : float, optional
+        the algorithm stops when the variation in the reconstruction
+        error of all the tensors is less than the tolerance
+    random_state : {None, int, np.random.RandomState}
+    verbose : int, optional
+        level of verbosity
+    n_jobs : int, optional, default is None
+        maximum number of threads the backend may use, see :func:`tensorly.thread_limits`
+
+    Returns
+    -------
+    core : ndarray
+        stacked core tensors, of shape ``(B, rank[0], ..., rank[-1])``
+    factors : ndarray list
+        stacked factors: element `k` is of shape ``(B, I_k, rank[k])``
+    """
+    batch_size, *shape = tl.shape(tensors)
+    n_modes = len(shape)
+    if isinstance(rank, int):
+        rank = [rank]*n_modes
+    elif len(rank) != n_modes:
+        raise ValueError('Got {} ranks for tensors of order {}: should verify '
+                         'len(rank) == tl.ndim(tensors) - 1.'.format(len(rank), n_modes))
+
+    if init == 'svd':
+        factors = [tl.batched_svd(_batched_unfold(tensors, mode),
+                                  n_eigenvecs=rank[mode])[0]
+                   for mode in range(n_modes)]
+    elif init == 'random':
+        factors = _random_factors(tensors, rank, check_random_state(random_state))
+    else:
+        raise ValueError('Initialization method "{}" not recognized'.format(init))
+
+    norm_tensors = tl.sum(tl.reshape(tensors, (batch_size, -1))**2, axis=1)
+    rec_errors = []
+
+    for iteration in range(n_iter_max):
+        for mode in range(n_modes):
+            core_approximation = tensors
+            for k in range(n_modes):
+                if k != mode:
+                    core_approximation = _batched_mode_dot(
+                        core_approximation, _batched_transpose(factors[k]), k)
+            U, _, _ = tl.batched_svd(_batched_unfold(core_approximation, mode),
+                                     n_eigenvecs=rank[mode])
+            factors[mode] = U
+
+        core = _batched_mode_dot(core_approximation, _batched_transpose(factors[-1]),
+                                 n_modes - 1)
+
+        # The factors are orthonormal and therefore do not affect the norms
+        # of the reconstructed tensors
+        norm_cores = tl.sum(tl.reshape(core, (batch_size, -1))**2, axis=1)
+        rec_error = tl.sqrt(tl.abs(norm_tensors - norm_cores)/norm_tensors)
+        rec_errors.append(rec_error)
+
+        if iteration > 1:
+            variation = tl.max(tl.abs(rec_errors[-2] - rec_errors[-1]))
+            if verbose:
+                print('mean reconstruction error={}, max variation={}.'.format(
+                    tl.mean(rec_errors[-1]), variation))
+
+            if tol and variation < tol:
+                if verbose:
+                    print('converged in {} iterations.'.format(iteration))
+                break
+
+    if not rec_errors:
+        # No iteration was run: the cores are the projections on the initial factors
+        core = tensors
+        for k in range(n_modes):
+            core = _batched_mode_dot(core, _batched_transpose(factors[k]), k)
+
+    return core, factors
@@ -1,11 +1,13 @@
 import numpy as np
 import warnings
+from functools import lru_cache
 
 import tensorly as tl
+from ..backend import thread_limited
 from ..random import check_random_state
 from ..base import unfold
 from ..kruskal_tensor import kruskal_to_tensor
-from ..tenalg import khatri_rao
+from ..tenalg import khatri_rao, DimensionTree, FactorGramCache
 
 # Authors: Jean Kossaifi <jean.kossaifi+tensors@gmail.com>
 #          Chris Swierczewski <csw@amazon.com>
@@ -56,19 +58,121 @@ def normalize_factors(factors):
     return normalized_factors, weights
 
 
+def _hals_update(factor, mttkrp, pseudo_inverse, l1_reg=0, epsilon=10e-12):
+    """Updates, in place, each column of a non-negative factor in turn (HALS)
+
+        Each column is the exact minimiser of the (regularised) least squares
+        problem, the other columns being fixed: one sweep over the columns
+        costs about as much as a least squares update of the factor.
+
+    Parameters
+    ----------
+    factor : ndarray of shape (I, rank)
+    mttkrp : ndarray of shape (I, rank)
+        product of the unfolding of the tensor with the Khatri-Rao product
+        of the other factors
+    pseudo_inverse : ndarray of shape (rank, rank)
+        Hadamard product of the Gram matrices of the other factors
+    l1_reg : float, default is 0
+        weight of the L1 penalty on the factor
+    """
+    rank = tl.shape(factor)[1]
+    # The diagonal is clipped once, on the device, rather than once per column
+    diag = tl.sum(pseudo_inverse*tl.eye(rank, **tl.context(pseudo_inverse)), axis=0)
+    diag = tl.clip(diag, a_min=epsilon, a_max=None)
+    for r in range(rank):
+        residual = mttkrp[:, r] - tl.dot(factor, pseudo_inverse[:, r]) - l1_reg
+        column = factor[:, r] + residual/diag[r]
+        factor[:, r] = tl.clip(column, a_min=0, a_max=None)
+    return factor
+
+
+def _solve_rows(row_grams, rhs, epsilon=10e-12):
+    """Solves the normal equations of each row of a factor
+
+    Parameters
+    ----------
+    row_grams : ndarray of shape (I, rank, rank)
+    rhs : ndarray of shape (I, rank)
+    """
+    # Rows without observed entries would have singular normal equations
+    eye = tl.eye(tl.shape(rhs)[1], **tl.context(rhs))
+    return tl.batched_solve(row_grams + epsilon*eye, rhs)
+
+
+def _weighted_als_update(factors, mode, observed, mask, epsilon=10e-12):
+    """Least squares update of a factor, over the observed entries only
+
+        Each row of the factor is the solution of its own normal equations,
+        which only involve the observed entries of the corresponding slice.
+
+    Parameters
+    ----------
+    factors : ndarray list
+    mode : int
+    observed : ndarray
+        tensor with zeros at the missing entries
+    mask : ndarray
+        1 at the observed entries, 0 at the missing ones
+
+    Returns
+    -------
+    ndarray of shape (tensor.shape[mode], rank)
+    """
+    rank = tl.shape(factors[0])[1]
+    kr = khatri_rao(factors, skip_matrix=mode)
+    kr_pairs = tl.reshape(kr, (-1, rank, 1))*tl.reshape(kr, (-1, 1, rank))
+    kr_pairs = tl.reshape(kr_pairs, (-1, rank*rank))
+    row_grams = tl.reshape(tl.dot(unfold(mask, mode), kr_pairs), (-1, rank, rank))
+    rhs = tl.tenalg.unfolding_dot_khatri_rao(observed, factors, mode)
+    return _solve_rows(row_grams, rhs, epsilon)
+
+
+def _sparse_weighted_als_update(factors, mode, indices, values, epsilon=10e-12):
+    """Same as `_weighted_als_update`, from the coordinates of the observed entries
+
+        The cost is proportional to the number of observed entries,
+        not to the size of the tensor.
+
+    Parameters
+    ----------
+    factors : ndarray list
+    mode : int
+    indices : int array of shape (len(factors), n_observed)
+        coordinates of the observed entries
+    values : 1D tensor
+        observed entries
+
+    Returns
+    -------
+    ndarray of shape (tensor.shape[mode], rank)
+    """
+    n_rows, rank = tl.shape(factors[mode])
+    others = [factor for i, factor in enumerate(factors) if i != mode]
+    kr_rows = _khatri_rao_rows(others, np.delete(indices, mode, axis=0))
+    kr_pairs = tl.reshape(kr_rows, (-1, rank, 1))*tl.reshape(kr_rows, (-1, 1, rank))
+    kr_pairs = tl.reshape(kr_pairs, (-1, rank*rank))
+    row_grams = tl.segment_sum(kr_pairs, indices[mode], n_rows)
+    row_grams = tl.reshape(row_grams, (n_rows, rank, rank))
+    rhs = tl.segment_sum(kr_rows*tl.reshape(values, (-1, 1)), indices[mode], n_rows)
+    return _solve_rows(row_grams, rhs, epsilon)
+
+
 def initialize_factors(tensor, rank, init='svd', svd='numpy_svd', random_state=None, non_negative=False):
     r"""Initialize factors used in `parafac`.
 
     The type of initialization is set using `init`. If `init == 'random'` then
     initialize factor matrices using `random_state`. If `init == 'svd'` then
     initialize the `m`th factor matrix using the `rank` left singular vectors
-    of the `m`th unfolding of the input tensor.
+    of the `m`th unfolding of the input tensor. If `init` is a list of factors
+    (e.g. from a previous decomposition), their shapes are checked and copies
+    of them are returned.
 
     Parameters
     ----------
     tensor : ndarray
     rank : int
-    init : {'svd', 'random'}, optional
+    init : {'svd', 'random'} or ndarray list, optional
     svd : str, default is 'numpy_svd'
         function to use to compute the SVD, acceptable values in tensorly.SVD_FUNS
     non_negative : bool, default is False
@@ -81,6 +185,22 @@ def initialize_factors(tensor, rank, init='svd', svd='numpy_svd', random_state=N
         is of shape (tensor.shape[i], rank)
 
     """
+    if isinstance(init, (list, tuple)):
+        if len(init) != tl.ndim(tensor):
+            raise ValueError('Got {} initial factors for a tensor of order {}.'.format(
+                len(init), tl.ndim(tensor)))
+        for mode, factor in enumerate(init):
+            if tuple(tl.shape(factor)) != (tl.shape(tensor)[mode], rank):
+                raise ValueError('The initial factor of mode {} should be of shape {}, '
+                                 'got {}.'.format(mode, (tl.shape(tensor)[mode], rank),
+                                                  tuple(tl.shape(factor))))
+        # Some of the updates are done in place
+        factors = [tl.copy(factor) for factor in init]
+        if non_negative:
+            return [tl.abs(f) for f in factors]
+        else:
+            return factors
+
     rng = check_random_state(random_state)
 
     if init == 'random':
@@ -117,9 +237,11 @@ def initialize_factors(tensor, rank, init='svd', svd='numpy_svd', random_state=N
     raise ValueError('Initialization method "{}" not recognized'.format(init))
 
 
+@thread_limited
 def parafac(tensor, rank, n_iter_max=100, init='svd', svd='numpy_svd', tol=1e-8,
             orthogonalise=False, random_state=None, verbose=False,
-            return_errors=False, non_negative=False):
+            return_errors=False, non_negative=False, dimension_tree=False, l1_reg=0,
+            linesearch=False, callback=None, mask=None, mask_method='em', n_jobs=None):
     """CANDECOMP/PARAFAC decomposition via alternating least squares (ALS)
 
     Computes a rank-`rank` decomposition of `tensor` [1]_ such that,
@@ -133,8 +255,9 @@ def parafac(tensor, rank, n_iter_max=100, init='svd', svd='numpy_svd', tol=1e-8,
         Number of components.
     n_iter_max : int
         Maximum number of iteration
-    init : {'svd', 'random'}, optional
-        Type of factor matrix initialization. See `initialize_factors`.
+    init : {'svd', 'random'} or ndarray list, optional
+        Type of factor matrix initialization, or initial factors, e.g. those
+        of a previous decomposition. See `initialize_factors`.
     svd : str, default is 'numpy_svd'
         function to use to compute the SVD, acceptable values in tensorly.SVD_FUNS
     tol : float, optional
@@ -146,8 +269,48 @@ def parafac(tensor, rank, n_iter_max=100, init='svd', svd='numpy_svd', tol=1e-8,
         Level of verbosity
     return_errors : bool, optional
         Activate return of iteration errors
-    non_negative : bool, optional
-        Perform non_negative PARAFAC. See :func:`non_negative_parafac`.
+    non_negative : {False, True, 'mu', 'hals'}, optional
+        Perform non_negative PARAFAC, with multiplicative updates (True or 'mu')
+        or with HALS ('hals'). See :func:`non_negative_parafac`.
+    dimension_tree : bool, optional, default is False
+        If True, the MTTKRP are computed with a :class:`tensorly.tenalg.DimensionTree`
+        which reuses partial contractions across modes: one iteration then costs
+        about two passes over the tensor instead of one per mode.
+        Mostly useful for tensors of order 4 or higher.
+    l1_reg : float, optional, default is 0
+        weight of the L1 penalty on the factors, only used with ``non_negative='hals'``
+    linesearch : bool, optional, default is False
+        If True, every other iteration, the factors are extrapolated along the
+        direction of the last ALS update [2]_ and the extrapolated factors are
+        kept if they lower the reconstruction error. This usually reduces the
+        number of iterations needed when the components are collinear (swamps).
+        Not available with `non_negative`.
+    callback : callable, optional
+        function called after each iteration as ``callback(factors, rec_error)``,
+        with the current factors and relative reconstruction error:
+        the algorithm stops if it returns True.
+    mask : ndarray, optional
+        array of booleans with the same shape as `tensor`, 0 where the values
+        are missing and 1 everywhere else. The missing values are initially
+        replaced by the mean of the observed ones and the reconstruction error
+        is that of the observed entries.
+    mask_method : {'em', 'weighted', 'weighted_sparse'}, default is 'em'
+        how the missing values are handled:
+
+        * 'em': at each iteration, the missing values are imputed with the
+          current reconstruction (expectation maximization)
+        * 'weighted': each row of the factors is fitted to the observed
+          entries only (weighted ALS), which costs about `rank` times more
+          than an ALS update
+        * 'weighted_sparse': same as 'weighted', computed from the coordinates
+          of the observed entries: the cost is proportional to their number,
+          which is cheaper when only a small fraction of the entries is observed
+
+        The line search is not available with a mask, nor are the
+        non-negative updates with the weighted methods.
+    n_jobs : int, optional, default is None
+        maximum number of threads the backend may use (e.g. for BLAS),
+        see :func:`tensorly.thread_limits`. If None, the limits are left unchanged.
 
     Returns
     -------
@@ -161,17 +324,67 @@ def parafac(tensor, rank, n_iter_max=100, init='svd', svd='numpy_svd', tol=1e-8,
     ----------
     .. [1] tl.G.Kolda and B.W.Bader, "Tensor Decompositions and Applications",
        SIAM REVIEW, vol. 51, n. 3, pp. 455-500, 2009.
+
+    .. [2] R. Bro, "Multi-Way Analysis in the Food Industry: Models, Algorithms, and
+       Applications", PhD thesis, University of Amsterdam, 1998.
     """
     epsilon = 10e-12
 
     if orthogonalise and not isinstance(orthogonalise, int):
         orthogonalise = n_iter_max
 
+    if mask is not None:
+        if mask_method not in ['em', 'weighted', 'weighted_sparse']:
+            raise ValueError("mask_method should be one of 'em', 'weighted' or "
+                             "'weighted_sparse', got {!r}.".format(mask_method))
+        if tuple(tl.shape(mask)) != tuple(tl.shape(tensor)):
+            raise ValueError('The mask should be of the same shape as the tensor, '
+                             'got {} and {}.'.format(tuple(tl.shape(mask)),
+                                                     tuple(tl.shape(tensor))))
+        if linesearch:
+            raise ValueError('The line search is not available with a mask.')
+        if non_negative and mask_method != 'em':
+            raise ValueError('Non-negative PARAFAC with a mask is only available '
+                             "with mask_method='em'.")
+
+        mask = tl.tensor(mask, **tl.context(tensor))
+        observed = tensor*mask
+        # Mean imputation of the missing values, for the initialization and EM
+        tensor = observed + (1 - mask)*tl.sum(observed)/tl.sum(mask)
+        if mask_method == 'weighted_sparse':
+            indices = np.stack(np.nonzero(tl.to_numpy(mask)))
+            values = tl.to_numpy(observed)[tuple(indices)]
+            values = tl.tensor(values, **tl.context(tensor))
+
     factors = initialize_factors(tensor, rank, init=init, svd=svd,
                                  random_state=random_state,
                                  non_negative=non_negative)
     rec_errors = []
-    norm_tensor = tl.norm(tensor, 2)
+    if mask is None:
+        norm_tensor = tl.norm(tensor, 2)
+    else:
+        norm_tensor = tl.norm(observed, 2)
+    weighted = mask is not None and mask_method != 'em'
+    grams = FactorGramCache(factors)
+    if dimension_tree:
+        tree = DimensionTree(tensor, factors)
+    if non_negative is True:
+        non_negative = 'mu'
+    if non_negative not in [False, 'mu', 'hals']:
+        raise ValueError("non_negative should be one of False, True, 'mu' or 'hals', "
+                         "got {!r}.".format(non_negative))
+    if linesearch and non_negative:
+        raise ValueError('The line search is not available for non-negative PARAFAC.')
+    if linesearch:
+        # The extrapolation step is iteration**(1/acc_pow): acc_pow is increased,
+        # i.e. the steps shortened, after max_fail rejected extrapolations
+        acc_pow = 2
+        acc_fail = 0
+        max_fail = 4
+    if non_negative == 'mu':
+        # Buffers for the multiplicative updates, allocated at the first iteration
+        numerators = [None]*tl.ndim(tensor)
+        denominators = [None]*tl.ndim(tensor)
 
     for iteration in range(n_iter_max):
         if orthogonalise and iteration <= orthogonalise:
@@ -179,47 +392,115 @@ def parafac(tensor, rank, n_iter_max=100, init='svd', svd='numpy_svd', tol=1e-8,
 
         if verbose:
             print("Starting iteration", iteration)
+        if linesearch and iteration % 2 == 0:
+            # The unconstrained updates return new factors: no need to copy them
+            factors_last = list(factors)
+
         for mode in range(tl.ndim(tensor)):
             if verbose:
                 print("Mode", mode, "of", tl.ndim(tensor))
-            if non_negative:
-                accum = 1
+            if not weighted:
                 # khatri_rao(factors).tl.dot(khatri_rao(factors))
-                # simplifies to multiplications
-                sub_indices = [i for i in range(len(factors)) if i != mode]
-                for i, e in enumerate(sub_indices):
-                    if i:
-                        accum *= tl.dot(tl.transpose(factors[e]), factors[e])
-                    else:
-                        accum = tl.dot(tl.transpose(factors[e]), factors[e])
-
-            pseudo_inverse = tl.tensor(np.ones((rank, rank)), **tl.context(tensor))
-            for i, factor in enumerate(factors):
-                if i != mode:
-                    pseudo_inverse = pseudo_inverse*tl.dot(tl.transpose(factor), factor)
-
-            mttkrp = tl.tenalg.unfolding_dot_khatri_rao(tensor, factors, mode)
-
-            if non_negative:
-                numerator = tl.clip(mttkrp, a_min=epsilon, a_max=None)
-                denominator = tl.dot(factors[mode], accum)
-                denominator = tl.clip(denominator, a_min=epsilon, a_max=None)
-                factor = factors[mode] * numerator / denominator
+                # simplifies to multiplications of the Gram matrices
+                pseudo_inverse = grams.hadamard(skip=mode)
+
+                if dimension_tree:
+                    mttkrp = tree.mttkrp(mode)
+                else:
+                    mttkrp = tl.tenalg.unfolding_dot_khatri_rao(tensor, factors, mode)
+
+            if weighted and mask_method == 'weighted_sparse':
+                factor = _sparse_weighted_als_update(factors, mode, indices, values,
+                                                     epsilon=epsilon)
+            elif weighted:
+                factor = _weighted_als_update(factors, mode, observed, mask,
+                                              epsilon=epsilon)
+            elif non_negative == 'hals':
+                factor = _hals_update(factors[mode], mttkrp, pseudo_inverse,
+                                      l1_reg=l1_reg)
+            elif non_negative:
+                # factors[mode] * numerator / denominator, updated in place
+                numerator = tl.clip(mttkrp, a_min=epsilon, a_max=None,
+                                    out=numerators[mode])
+                denominator = tl.dot(factors[mode], pseudo_inverse,
+                                     out=denominators[mode])
+                denominator = tl.clip(denominator, a_min=epsilon, a_max=None,
+                                      out=denominator)
+                numerators[mode] = tl.divide(numerator, denominator, out=numerator)
+                denominators[mode] = denominator
+                factor = tl.multiply(factors[mode], numerators[mode], out=factors[mode])
             else:
-                factor = tl.transpose(tl.solve(tl.transpose(pseudo_inverse), tl.transpose(mttkrp)))
+                factor = tl.transpose(tl.solve_spd(pseudo_inverse, tl.transpose(mttkrp)))
 
             factors[mode] = factor
-
-        if tol:
+            grams.update(mode, factor)
+            if dimension_tree:
+                tree.update_factor(mode, factor)
+
+        if mask is not None:
+            # Error of the observed entries
+            if mask_method == 'weighted_sparse':
+                residual = values - tl.sum(_khatri_rao_rows(factors, indices), axis=1)
+                rec_error = tl.norm(residual, 2) / norm_tensor
+            else:
+                reconstruction = kruskal_to_tensor(factors)
+                rec_error = tl.norm(observed - mask*reconstruction, 2) / norm_tensor
+                if mask_method == 'em':
+                    tensor = observed + (1 - mask)*reconstruction
+                    if dimension_tree:
+                        tree = DimensionTree(tensor, factors)
+
+        elif tol or linesearch or callback is not None:
             # ||tensor - rec||^2 = ||tensor||^2 + ||rec||^2 - 2*<tensor, rec>
             # This is ||kruskal_to_tensor(factors)||^2
-            factors_norm = tl.sum(tl.prod(tl.stack([tl.dot(tl.transpose(f), f) for f in factors], 0), 0))
+            factors_norm = tl.sum(grams.hadamard())
             # mttkrp and factor for the last mode. This is equivalent to the
             # inner product <tensor, factorization>
             iprod = tl.sum(mttkrp*factor)
             rec_error = tl.sqrt(tl.abs(norm_tensor**2 + factors_norm - 2*iprod)) / norm_tensor
+
+        if linesearch and iteration % 2 == 0 and iteration > 5:
+            jump = iteration ** (1/acc_pow)
+            factors_ls = [last + (current - last)*jump
+                          for (last, current) in zip(factors_last, factors)]
+
+            # Same error formula, which only costs one more MTTKRP
+            hadamard_ls = tl.ones((rank, rank), **tl.context(tensor))
+            for factor in factors_ls:
+                hadamard_ls = hadamard_ls*tl.dot(tl.transpose(factor), factor)
+            last_mode = tl.ndim(tensor) - 1
+            mttkrp_ls = tl.tenalg.unfolding_dot_khatri_rao(tensor, factors_ls, last_mode)
+            iprod = tl.sum(mttkrp_ls*factors_ls[last_mode])
+            rec_error_ls = tl.abs(norm_tensor**2 + tl.sum(hadamard_ls) - 2*iprod)
+            rec_error_ls = tl.sqrt(rec_error_ls) / norm_tensor
+
+            if rec_error_ls < rec_error:
+                factors = factors_ls
+                for i, factor in enumerate(factors):
+                    grams.update(i, factor)
+                    if dimension_tree:
+                        tree.update_factor(i, factor)
+                rec_error = rec_error_ls
+                acc_fail = 0
+                if verbose:
+                    print('Accepted line search jump of {}.'.format(jump))
+            else:
+                acc_fail += 1
+                if acc_fail == max_fail:
+                    acc_pow += 1
+                    acc_fail = 0
+                if verbose:
+                    print('Line search failed for jump of {}.'.format(jump))
+
+        if tol or callback is not None:
             rec_errors.append(rec_error)
 
+            if callback is not None and callback(factors, rec_error):
+                if verbose:
+                    print('stopped by the callback after {} iterations.'.format(
+                        iteration))
+                break
+
             if iteration >= 1:
                 if verbose:
                     print('reconstruction error={}, variation={}.'.format(
@@ -240,13 +521,16 @@ def parafac(tensor, rank, n_iter_max=100, init='svd', svd='numpy_svd', tol=1e-8,
 
 
 def non_negative_parafac(tensor, rank, n_iter_max=100, init='svd', svd='numpy_svd',
-                         tol=10e-7, random_state=None, verbose=0):
+                         tol=10e-7, random_state=None, verbose=0, method='mu', l1_reg=0,
+                         n_jobs=None):
     """
     Non-negative CP decomposition
 
-    Uses multiplicative updates, see [2]_
+    Uses multiplicative updates, see [2]_, or hierarchical alternating
+    least squares (HALS), see [3]_, which usually converges in much fewer
+    iterations for the same cost per iteration.
 
-    This is the same as parafac(non_negative=True).
+    This is the same as parafac(non_negative=method).
 
     Parameters
     ----------
@@ -255,7 +539,8 @@ def non_negative_parafac(tensor, rank, n_iter_max=100, init='svd', svd='numpy_sv
             number of components
     n_iter_max : int
                  maximum number of iteration
-    init : {'svd', 'random'}, optional
+    init : {'svd', 'random'} or ndarray list, optional
+        type of initialization, or initial factors, see :func:`parafac`
     svd : str, default is 'numpy_svd'
         function to use to compute the SVD, acceptable values in tensorly.SVD_FUNS
     tol : float, optional
@@ -264,6 +549,15 @@ def non_negative_parafac(tensor, rank, n_iter_max=100, init='svd', svd='numpy_sv
     random_state : {None, int, np.random.RandomState}
     verbose : int, optional
         level of verbosity
+    method : {'mu', 'hals'}, default is 'mu'
+        'mu' for multiplicative updates, 'hals' to update the columns of the
+        factors one at a time with HALS (not supported by TensorFlow, whose
+        tensors cannot be updated in place)
+    l1_reg : float, default is 0
+        with HALS, weight of the L1 penalty on the factors, which makes them sparser
+    n_jobs : int, optional, default is None
+        maximum number of threads the backend may use (e.g. for BLAS),
+        see :func:`tensorly.thread_limits`. If None, the limits are left unchanged.
 
     Returns
     -------
@@ -277,13 +571,68 @@ def non_negative_parafac(tensor, rank, n_iter_max=100, init='svd', svd='numpy_sv
        "Non-negative tensor factorization with applications to statistics and computer vision",
        In Proceedings of the International Conference on Machine Learning (ICML),
        pp 792-799, ICML, 2005
+    .. [3] Andrzej Cichocki and Anh-Huy Phan,
+       "Fast local algorithms for large scale nonnegative matrix and tensor
+       factorizations", IEICE Transactions on Fundamentals of Electronics,
+       Communications and Computer Sciences,
+       vol. 92, n. 3, pp 708-721, 2009
     """
+    if method not in ['mu', 'hals']:
+        raise ValueError("method should be 'mu' or 'hals', got {!r}.".format(method))
+    if l1_reg and method != 'hals':
+        raise ValueError("The L1 penalty, l1_reg, is only supported by method='hals'.")
     return parafac(tensor, rank, n_iter_max=n_iter_max, init=init, svd=svd,
-                   tol=tol, random_state=random_state, verbose=verbose, non_negative=True)
+                   tol=tol, random_state=random_state, verbose=verbose,
+                   non_negative=method, l1_reg=l1_reg, n_jobs=n_jobs)
+
+
+def _random_indices(rng, sizes, n_samples):
+    """Draws, for each size, `n_samples` integers between 0 and size - 1
+
+    Returns
+    -------
+    int array of shape (len(sizes), n_samples)
+    """
+    high = np.array(sizes)[:, None]
+    if isinstance(rng, getattr(np.random, 'Generator', ())):
+        return rng.integers(0, high, size=(len(sizes), n_samples))
+    return rng.randint(0, high, size=(len(sizes), n_samples))
+
+
+def _khatri_rao_rows(matrices, indices):
+    """Rows of ``khatri_rao(matrices)`` given the row index in each matrix
+
+        The rows of all the matrices are gathered in one pass
+        from the concatenated matrices.
+
+    Parameters
+    ----------
+    matrices : ndarray list
+    indices : int array of shape (len(matrices), n_rows)
+        indices[i, j] is the row of matrices[i] used for the j-th row
+
+    Returns
+    -------
+    ndarray of shape (n_rows, rank)
+    """
+    offsets = np.cumsum([0] + [tl.shape(m)[0] for m in matrices[:-1]])
+    rows = tl.concatenate(matrices, axis=0)[np.asarray(indices) + offsets[:, None]]
+    res = rows[0]
+    for row in rows[1:]:
+        res = res*row
+    return res
+
+
+@lru_cache(maxsize=128)
+def _fiber_offsets(shape, mode):
+    """Strides of a C-ordered tensor and offsets of the elements of its mode fibers"""
+    strides = np.cumprod((shape[1:] + (1, ))[::-1])[::-1]
+    return strides, np.arange(shape[mode])*strides[mode]
 
 
 def sample_khatri_rao(matrices, n_samples, skip_matrix=None,
-                      return_sampled_rows=False, random_state=None):
+                      return_sampled_rows=False, random_state=None,
+                      return_fiber_indices=False):
     """Random subsample of the Khatri-Rao product of the given list of matrices
 
         If one matrix only is given, that matrix is directly returned.
@@ -302,14 +651,20 @@ def sample_khatri_rao(matrices, n_samples, skip_matrix=None,
     skip_matrix : None or int, optional, default is None
         if not None, index of a matrix to skip
 
-    random_state : None, int or numpy.random.RandomState
-        if int, used to set the seed of the random number generator
-        if numpy.random.RandomState, used to generate random_samples
+    random_state : None, int, numpy.random.RandomState or numpy.random.Generator
+        if None, NumPy's global random number generator is used
+        if int, used to set the seed of a new random number generator
+        otherwise, used to generate random_samples
 
     returned_sampled_rows : bool, default is False
         if True, also returns a list of the rows sampled from the full
         khatri-rao product
 
+    return_fiber_indices : bool, default is False
+        if True, `skip_matrix` must be specified and the linear indices, in
+        the raveled tensor of shape ``[tl.shape(m)[0] for m in matrices]``,
+        of the fibers corresponding to the sampled rows are also returned
+
     Returns
     -------
     sampled_Khatri_Rao : ndarray
@@ -320,42 +675,83 @@ def sample_khatri_rao(matrices, n_samples, skip_matrix=None,
 
     indices_kr : int list
         list of length `n_samples` containing the sampled row indices
+        (only if `return_sampled_rows` is True)
+
+    fiber_indices : int array of shape (n_samples, tl.shape(matrices[skip_matrix])[0])
+        ``tl.reshape(tensor, (-1, ))[fiber_indices]`` is the sampled
+        unfolding of `tensor`, with one row per sampled row of the
+        Khatri-Rao product (only if `return_fiber_indices` is True)
     """
-    if random_state is None or not isinstance(random_state, np.random.RandomState):
+    if random_state is None:
+        rng = np.random
+    elif isinstance(random_state, int):
         rng = check_random_state(random_state)
         warnings.warn('You are creating a new random number generator at each call.\n'
-                      'If you are calling sample_khatri_rao inside a loop this will be slow:'
+                      'If you are calling sample_khatri_rao inside a loop this will be'
+                      ' slow and return the same samples:'
                       ' best to create a rng outside and pass it as argument (random_state=rng).')
     else:
         rng = random_state
 
+    if return_fiber_indices:
+        if skip_matrix is None:
+            raise ValueError('The fiber indices are only defined when skipping a matrix.')
+        shape = tuple(tl.shape(m)[0] for m in matrices)
+
     if skip_matrix is not None:
         matrices = [matrices[i] for i in range(len(matrices)) if i != skip_matrix]
 
-    rank = tl.shape(matrices[0])[1]
     sizes = [tl.shape(m)[0] for m in matrices]
 
     # For each matrix, randomly choose n_samples indices for which to compute the khatri-rao product
-    indices_list = [rng.randint(0, tl.shape(m)[0], size=n_samples, dtype=int) for m in matrices]
+    indices = _random_indices(rng, sizes, n_samples)
+    sampled_kr = _khatri_rao_rows(matrices, indices)
+    res = [sampled_kr, list(indices)]
+
     if return_sampled_rows:
         # Compute corresponding rows of the full khatri-rao product
-        indices_kr = np.zeros((n_samples), dtype=int)
-        for size, indices in zip(sizes, indices_list):
-            indices_kr = indices_kr*size + indices
+        res.append(np.ravel_multi_index(tuple(indices), sizes))
 
-    # Compute the Khatri-Rao product for the chosen indices
-    sampled_kr = tl.ones((n_samples, rank), **tl.context(matrices[0]))
-    for indices, matrix in zip(indices_list, matrices):
-        sampled_kr = sampled_kr*matrix[indices, :]
+    if return_fiber_indices:
+        strides, offsets = _fiber_offsets(shape, skip_matrix)
+        strides = np.delete(strides, skip_matrix)
+        res.append(np.dot(strides, indices)[:, None] + offsets[None, :])
+
+    return tuple(res)
 
-    if return_sampled_rows:
-        return sampled_kr, indices_list, indices_kr
-    else:
-        return sampled_kr, indices_list
 
+def _sampled_relative_error(tensor_values, factors, indices, norm_tensor):
+    """Estimates the relative reconstruction error from a sample of entries
 
+    Parameters
+    ----------
+    tensor_values : 1D tensor
+        entries of the tensor at `indices`
+    factors : ndarray list
+        factors of the CP decomposition
+    indices : int array list
+        indices of the sampled entries, one array per mode, drawn uniformly
+    norm_tensor : float
+        norm of the full tensor
+
+    Returns
+    -------
+    float
+        estimate of ``norm(tensor - kruskal_to_tensor(factors))/norm_tensor``,
+        the squared error of the sampled entries being rescaled to the
+        size of the tensor
+    """
+    residual = tensor_values - tl.sum(_khatri_rao_rows(factors, indices), axis=1)
+
+    size = int(np.prod([tl.shape(f)[0] for f in factors]))
+    n_entries = tl.shape(tensor_values)[0]
+    return tl.sqrt(tl.sum(residual**2)*size/n_entries)/norm_tensor
+
+
+@thread_limited
 def randomised_parafac(tensor, rank, n_samples, n_iter_max=100, init='random', svd='numpy_svd',
-                       tol=10e-9, max_stagnation=20, random_state=None, verbose=1):
+                       tol=10e-9, max_stagnation=20, random_state=None, verbose=1,
+                       error_check_every=1, n_error_samples=None, n_jobs=None):
     """Randomised CP decomposition via sampled ALS
 
     Parameters
@@ -365,9 +761,13 @@ def randomised_parafac(tensor, rank, n_samples, n_iter_max=100, init='random', s
             number of components
     n_samples : int
                 number of samples per ALS step
+                if, for a given mode, this is at least the number of rows of the
+                full Khatri-Rao product, the exact ALS update is used instead,
+                with the MTTKRP computed using a :class:`tensorly.tenalg.DimensionTree`
     n_iter_max : int
                  maximum number of iteration
-    init : {'svd', 'random'}, optional
+    init : {'svd', 'random'} or ndarray list, optional
+        type of initialization, or initial factors, see :func:`parafac`
     svd : str, default is 'numpy_svd'
         function to use to compute the SVD, acceptable values in tensorly.SVD_FUNS
     tol : float, optional
@@ -375,10 +775,21 @@ def randomised_parafac(tensor, rank, n_samples, n_iter_max=100, init='random', s
           the reconstruction error is less than the tolerance
     max_stagnation: int, optional, default is 0
                     if not zero, the maximum allowed number
-                    of iterations with no decrease in fit
+                    of error checks with no decrease in fit
     random_state : {None, int, np.random.RandomState}, default is None
     verbose : int, optional
         level of verbosity
+    error_check_every : int, default is 1
+        the reconstruction error, used by `tol` and `max_stagnation`,
+        is computed every `error_check_every` iterations
+    n_error_samples : int, optional
+        number of entries of the tensor, sampled once, used to estimate the
+        reconstruction error. The tensor is never reconstructed, so the cost
+        of the error check does not depend on the size of the tensor.
+        Default is `n_samples`.
+    n_jobs : int, optional, default is None
+        maximum number of threads the backend may use (e.g. for BLAS),
+        see :func:`tensorly.thread_limits`. If None, the limits are left unchanged.
 
     Returns
     -------
@@ -395,29 +806,54 @@ def randomised_parafac(tensor, rank, n_samples, n_iter_max=100, init='random', s
     factors = initialize_factors(tensor, rank, init=init, svd=svd, random_state=random_state)
     rec_errors = []
     n_dims = tl.ndim(tensor)
-    norm_tensor = tl.norm(tensor, 2)
     min_error = 0
 
+    if max_stagnation or tol:
+        # Fixed set of entries used to estimate the reconstruction error
+        if n_error_samples is None:
+            n_error_samples = n_samples
+        _, error_indices, flat_indices = sample_khatri_rao(
+            factors, n_error_samples, return_sampled_rows=True, random_state=rng)
+        tensor_values = tl.reshape(tensor, (-1, ))[flat_indices]
+        norm_tensor = tl.norm(tensor, 2)
+
+    # Modes for which sampling n_samples rows is not cheaper than using the
+    # full Khatri-Rao product: for those, we fall back to the exact ALS update
+    n_rows = [int(np.prod(tl.shape(tensor)))//s for s in tl.shape(tensor)]
+    dense_modes = [n_samples >= n for n in n_rows]
+    if any(dense_modes):
+        tree = DimensionTree(tensor, factors)
+        grams = FactorGramCache(factors)
+
     for iteration in range(n_iter_max):
         for mode in range(n_dims):
-            kr_prod, indices_list = sample_khatri_rao(factors, n_samples, skip_matrix=mode, random_state=rng)
-            indices_list = [i.tolist() for i in indices_list]
-            # Keep all the elements of the currently considered mode
-            indices_list.insert(mode, slice(None, None, None))
-            # MXNet will not be happy if this is a list insteaf of a tuple
-            indices_list = tuple(indices_list)
-            if mode:
-                sampled_unfolding = tensor[indices_list]
-            else:
-                sampled_unfolding = tl.transpose(tensor[indices_list])
+            if dense_modes[mode]:
+                pseudo_inverse = grams.hadamard(skip=mode)
+                factor = tl.solve_spd(pseudo_inverse, tl.transpose(tree.mttkrp(mode)))
+                factor = tl.transpose(factor)
+                factors[mode] = factor
+                tree.update_factor(mode, factor)
+                grams.update(mode, factor)
+                continue
+
+            kr_prod, _, fiber_indices = sample_khatri_rao(
+                factors, n_samples, skip_matrix=mode, random_state=rng,
+                return_fiber_indices=True)
+            # Fibers of the current mode corresponding to the sampled rows,
+            # of shape (n_samples, I_mode)
+            sampled_unfolding = tl.reshape(tensor, (-1, ))[fiber_indices]
 
             pseudo_inverse = tl.dot(tl.transpose(kr_prod), kr_prod)
             factor = tl.dot(tl.transpose(kr_prod), sampled_unfolding)
-            factor = tl.transpose(tl.solve(pseudo_inverse, factor))
+            factor = tl.transpose(tl.solve_spd(pseudo_inverse, factor))
             factors[mode] = factor
+            if any(dense_modes):
+                tree.update_factor(mode, factor)
+                grams.update(mode, factor)
 
-        if max_stagnation or tol:
-            rec_error = tl.norm(tensor - kruskal_to_tensor(factors), 2) / norm_tensor
+        if (max_stagnation or tol) and (iteration + 1) % error_check_every == 0:
+            rec_error = _sampled_relative_error(tensor_values, factors, error_indices,
+                                                norm_tensor)
             if not min_error or rec_error < min_error:
                 min_error = rec_error
                 stagnation = -1
@@ -425,7 +861,7 @@ def randomised_parafac(tensor, rank, n_samples, n_iter_max=100, init='random', s
 
             rec_errors.append(rec_error)
 
-            if iteration > 1:
+            if len(rec_errors) > 2:
                 if verbose:
                     print('reconstruction error={}, variation={}.'.format(
                         rec_errors[-1], rec_errors[-2] - rec_errors[-1]))
@@ -1,6 +1,9 @@
 import tensorly as tl
+from ..backend import thread_limited
 
-def matrix_product_state(input_tensor, rank, verbose=False):
+
+@thread_limited
+def matrix_product_state(input_tensor, rank, verbose=False, n_jobs=None):
     """MPS decomposition via recursive SVD
 
         Decomposes `input_tensor` into a sequence of order-3 tensors (factors)
@@ -15,6 +18,9 @@ def matrix_product_state(input_tensor, rank, verbose=False):
             if int list, then rank[k] is the rank of the kth factor
     verbose : boolean, optional
             level of verbosity
+    n_jobs : int, optional, default is None
+        maximum number of threads the backend may use (e.g. for BLAS),
+        see :func:`tensorly.thread_limits`. If None, the limits are left unchanged.
 
     Returns
     -------
@@ -0,0 +1,163 @@
+import multiprocessing
+
+import numpy as np
+
+import tensorly as tl
+from ..random import check_random_state
+from .candecomp_parafac import parafac
+
+# License: BSD 3 clause
+
+
+# Number of iterations before a restart can be stopped early
+_MIN_ITERATIONS = 10
+
+# State of the worker processes, set once per process by _init_worker
+_WORKER_STATE = {}
+
+
+def _init_worker(tensor_buffer, shape, dtype, errors_buffer, n_iter_max, backend):
+    """Maps, without copying them, the shared tensor and error traces in a worker"""
+    tl.set_backend(backend)
+    tensor = np.frombuffer(tensor_buffer, dtype=dtype).reshape(shape)
+    errors = np.frombuffer(errors_buffer, dtype=np.float64).reshape((-1, n_iter_max))
+    if backend != 'numpy':
+        # Only the other backends need a copy, tl.tensor would copy the NumPy view too
+        tensor = tl.tensor(tensor)
+    _WORKER_STATE.update(tensor=tensor, errors=errors)
+
+
+def _fit_restart(tensor, errors, restart, rank, seed, early_stopping, kwargs):
+    """Fits one restart, recording its errors in row `restart` of `errors`
+
+        The restart is stopped when its error is more than ``(1 + early_stopping)``
+        times the best error of the other restarts and, at the rate at which it
+        decreased during the last `_MIN_ITERATIONS` iterations, would not reach
+        it within the remaining iterations.
+    """
+    n_iter_max = errors.shape[1]
+    trace = errors[restart]
+    iteration = 0
+
+    def callback(factors, rec_error):
+        nonlocal iteration
+        trace[iteration] = rec_error
+        iteration += 1
+        if early_stopping is None or iteration <= _MIN_ITERATIONS:
+            return False
+        others = np.delete(errors, restart, axis=0)
+        if np.all(np.isnan(others)):
+            return False
+        # The errors of ALS do not increase: the last one of each restart is its lowest
+        best = np.nanmin(others)
+        gap = rec_error - best
+        decrease = (trace[iteration - 1 - _MIN_ITERATIONS] - rec_error)/_MIN_ITERATIONS
+        return gap > early_stopping*best and gap > decrease*(n_iter_max - iteration)
+
+    factors, rec_errors = parafac(tensor, rank, init='random', random_state=seed,
+                                  return_errors=True, callback=callback, **kwargs)
+    return [tl.to_numpy(f) for f in factors], rec_errors
+
+
+def _pool_fit_restart(args):
+    return _fit_restart(_WORKER_STATE['tensor'], _WORKER_STATE['errors'], *args)
+
+
+def multistart_parafac(tensor, rank, n_restarts=10, n_iter_max=100, tol=1e-8,
+                       random_state=None, early_stopping=0.1, n_processes=None,
+                       verbose=False, **kwargs):
+    """CP decomposition with the best of several randomly initialised restarts
+
+        ALS only converges to a local minimum: `parafac` is run `n_restarts`
+        times from random initial factors and the best fit is returned.
+
+        The restarts can be run in parallel in `n_processes` processes. The tensor
+        is then copied once to shared memory, as a NumPy array, instead of being
+        sent to each process, and the threads of the backends are shared between
+        the processes.
+
+        The restarts whose reconstruction error stalls clearly above that of
+        another restart are stopped early.
+
+    Parameters
+    ----------
+    tensor : ndarray
+    rank  : int
+        Number of components.
+    n_restarts : int, default is 10
+        number of random initialisations
+    n_iter_max : int
+        Maximum number of iteration of each restart
+    tol : float, optional
+        tolerance of each restart, see :func:`parafac`
+    random_state : {None, int, np.random.RandomState}
+        used to draw the random state of each restart
+    early_stopping : float or None, default is 0.1
+        a restart is stopped if its relative reconstruction error is more than
+        ``(1 + early_stopping)`` times the best one of the other restarts and,
+        at the rate at which it decreased during the last 10 iterations, it would
+        not reach it within `n_iter_max` iterations.
+        If None, all the restarts are run to convergence.
+    n_processes : int, optional, default is None
+        number of processes in which to run the restarts.
+        If None or 1, the restarts are run sequentially in the current process.
+    verbose : int, optional
+        Level of verbosity
+    kwargs : dict
+        other parameters of :func:`parafac` (e.g. `linesearch`).
+        When the restarts run in several processes, `n_jobs` defaults to
+        ``cpu_count() // n_processes`` threads in each of them.
+
+    Returns
+    -------
+    factors : ndarray list
+        factors of the restart with the lowest reconstruction error
+    errors : list
+        reconstruction errors at each iteration of each restart
+        (``errors[i]`` is shorter for the restarts stopped early)
+    """
+    if n_restarts < 1:
+        raise ValueError('n_restarts should be a positive integer, got {}.'.format(
+            n_restarts))
+    if early_stopping is not None and early_stopping < 0:
+        raise ValueError('early_stopping should be a non-negative float or None, '
+                         'got {}.'.format(early_stopping))
+
+    rng = check_random_state(random_state)
+    seeds = rng.randint(np.iinfo(np.int32).max, size=n_restarts)
+    kwargs = dict(kwargs, n_iter_max=n_iter_max, tol=tol)
+    parallel = n_processes is not None and n_processes > 1
+    if parallel and kwargs.get('n_jobs') is None:
+        # Each process gets its share of the threads, instead of all of them
+        kwargs['n_jobs'] = max(1, multiprocessing.cpu_count()//n_processes)
+    tasks = [(restart, rank, int(seed), early_stopping, kwargs)
+             for restart, seed in enumerate(seeds)]
+
+    if not parallel:
+        errors = np.full((n_restarts, n_iter_max), np.nan)
+        results = [_fit_restart(tensor, errors, *task) for task in tasks]
+    else:
+        array = tl.to_numpy(tensor)
+        tensor_buffer = multiprocessing.RawArray(np.ctypeslib.as_ctypes_type(array.dtype),
+                                                 array.size)
+        np.frombuffer(tensor_buffer, dtype=array.dtype)[:] = array.ravel()
+        errors_buffer = multiprocessing.RawArray('d', n_restarts*n_iter_max)
+        np.frombuffer(errors_buffer, dtype=np.float64)[:] = np.nan
+
+        initargs = (tensor_buffer, array.shape, array.dtype, errors_buffer, n_iter_max,
+                    tl.get_backend())
+        with multiprocessing.Pool(n_processes, initializer=_init_worker,
+                                  initargs=initargs) as pool:
+            results = pool.map(_pool_fit_restart, tasks, chunksize=1)
+
+    errors = [rec_errors for _, rec_errors in results]
+    final_errors = [rec_errors[-1] if rec_errors else np.inf for rec_errors in errors]
+    best = int(np.argmin(final_errors))
+    if verbose:
+        for restart, rec_errors in enumerate(errors):
+            print('restart {}: {} iterations, reconstruction error={}.'.format(
+                restart, len(rec_errors), rec_errors[-1] if rec_errors else None))
+        print('best restart: {}.'.format(best))
+
+    factors = [tl.tensor(f, **tl.context(tensor)) for f in results[best][0]]
+    return factors, errors
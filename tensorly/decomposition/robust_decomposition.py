@@ -4,15 +4,17 @@ from ..tenalg import khatri_rao
 from ..random import check_random_state
 from ..tenalg.proximal import soft_thresholding, svd_thresholding
 from .. import backend as T
+from ..backend import thread_limited
 
 # Author: Jean Kossaifi
 
 # License: BSD 3 clause
 
 
+@thread_limited
 def robust_pca(X, mask=None, tol=10e-7, reg_E=1, reg_J=1,
                mu_init=10e-5, mu_max=10e9, learning_rate=1.1,
-               n_iter_max=100, random_state=None, verbose=1):
+               n_iter_max=100, random_state=None, verbose=1, n_jobs=None):
     """Robust Tensor PCA via ALM with support for missing values
 
         Decomposes a tensor `X` into the sum of a low-rank component `D`
@@ -42,6 +44,9 @@ def robust_pca(X, mask=None, tol=10e-7, reg_E=1, reg_J=1,
     random_state : None, int or RandomState, optional, default is None
     verbose : int, default is 1
         level of verbosity
+    n_jobs : int, optional, default is None
+        maximum number of threads the backend may use (e.g. for BLAS),
+        see :func:`tensorly.thread_limits`. If None, the limits are left unchanged.
 
     Returns
     -------
@@ -103,12 +108,13 @@ def robust_pca(X, mask=None, tol=10e-7, reg_E=1, reg_J=1,
         for i in range(T.ndim(X)):
             L[i] += mu * (D - J[i])
 
-        L_x += mu*(X - D - E)
+        residual = X - D - E
+        L_x += mu*residual
 
         mu = min(mu*learning_rate, mu_max)
 
         # Evolution of the reconstruction errors
-        rec_X.append(T.norm(X - D - E, 2))
+        rec_X.append(T.norm(residual, 2))
         rec_D.append(np.max([T.norm(low_rank - D, 2) for low_rank in J]))
 
         # Convergence check
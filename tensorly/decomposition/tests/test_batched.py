@@ -0,0 +1,80 @@
+import pytest
+
+import tensorly as tl
+from ..batched import batched_parafac, batched_tucker, _batched_mttkrp
+from ..candecomp_parafac import parafac
+from .._tucker import tucker
+from ...base import unfold
+from ...kruskal_tensor import kruskal_to_tensor
+from ...tucker_tensor import tucker_to_tensor
+from ...random import check_random_state, random_kruskal
+from ...tenalg import khatri_rao
+from ...testing import assert_array_almost_equal, assert_
+
+
+def test_batched_mttkrp():
+    rng = check_random_state(1234)
+    tensors = tl.tensor(rng.random_sample((3, 4, 5, 6)))
+    factors = [tl.tensor(rng.random_sample((3, s, 2))) for s in (4, 5, 6)]
+    for mode in range(3):
+        res = _batched_mttkrp(tensors, factors, mode)
+        for i in range(3):
+            kr = khatri_rao([f[i] for f in factors], skip_matrix=mode)
+            assert_array_almost_equal(res[i], tl.dot(unfold(tensors[i], mode), kr))
+
+
+def test_batched_parafac():
+    """Test for the batched CP decomposition"""
+    shape, rank = (5, 6, 4), 3
+    tensors = tl.stack([random_kruskal(shape, rank, full=True, random_state=i)
+                        for i in range(4)])
+
+    factors = batched_parafac(tensors, rank, n_iter_max=50, tol=0)
+    for i in range(4):
+        assert_(all(tl.shape(f[i]) == (s, rank) for f, s in zip(factors, shape)))
+        # Same iterates as fitting each tensor separately
+        true_factors = parafac(tensors[i], rank, n_iter_max=50, tol=0)
+        assert_array_almost_equal(kruskal_to_tensor([f[i] for f in factors]),
+                                  kruskal_to_tensor(true_factors), decimal=4)
+
+    factors, errors = batched_parafac(tensors, rank, n_iter_max=50, tol=1e-10,
+                                      return_errors=True)
+    assert_(tl.shape(errors[-1]) == (4, ))
+    for i in range(4):
+        rec = kruskal_to_tensor([f[i] for f in factors])
+        error = float(tl.norm(rec - tensors[i], 2)/tl.norm(tensors[i], 2))
+        assert_(abs(error - float(errors[-1][i])) < 1e-3)
+
+    factors = batched_parafac(tensors, 7, n_iter_max=2, init='random', random_state=0)
+    assert_(tl.shape(factors[0]) == (4, 5, 7))
+
+    with pytest.raises(ValueError):
+        batched_parafac(tensors, rank, init='bogus')
+
+
+def test_batched_tucker():
+    """Test for the batched Tucker decomposition"""
+    rng = check_random_state(1234)
+    tensors = tl.tensor(rng.random_sample((4, 5, 6, 7)))
+    rank = [2, 3, 4]
+
+    core, factors = batched_tucker(tensors, rank, n_iter_max=10, tol=0)
+    assert_(tl.shape(core) == (4, 2, 3, 4))
+    for i in range(4):
+        true_core, true_factors = tucker(tensors[i], rank, n_iter_max=10, tol=0)
+        assert_array_almost_equal(tucker_to_tensor(core[i], [f[i] for f in factors]),
+                                  tucker_to_tensor(true_core, true_factors))
+
+    core, factors = batched_tucker(tensors, 2, n_iter_max=2, init='random',
+                                   random_state=0)
+    assert_(tl.shape(core) == (4, 2, 2, 2))
+
+    # Without iterations, the cores are the projections on the initial factors
+    core, factors = batched_tucker(tensors, rank, n_iter_max=0)
+    assert_(tl.shape(core) == (4, 2, 3, 4))
+    for i in range(4):
+        true_core = tucker_to_tensor(tensors[i], [tl.transpose(f[i]) for f in factors])
+        assert_array_almost_equal(core[i], true_core)
+
+    with pytest.raises(ValueError):
+        batched_tucker(tensors, [2, 3])
@@ -4,12 +4,12 @@ import pytest
 import tensorly as tl
 from ..candecomp_parafac import (
     parafac, non_negative_parafac, normalize_factors, initialize_factors,
-    sample_khatri_rao, randomised_parafac)
+    sample_khatri_rao, randomised_parafac, _sampled_relative_error)
 from ...kruskal_tensor import kruskal_to_tensor
 from ...random import check_random_state, random_kruskal
 from ...tenalg import khatri_rao
 from ... import backend as T
-from ...testing import assert_array_equal, assert_
+from ...testing import assert_array_equal, assert_array_almost_equal, assert_
 
 
 def test_parafac():
@@ -44,6 +44,15 @@ def test_parafac():
         rank = 4
         _ = initialize_factors(tensor, rank, init='bogus init type')
 
+    # Using a dimension tree for the MTTKRP should not change the result
+    tensor = T.tensor(rng.random_sample((3, 4, 2, 3)))
+    factors = parafac(tensor, rank=3, n_iter_max=20, init='random', random_state=1234,
+                      tol=0)
+    factors_tree = parafac(tensor, rank=3, n_iter_max=20, init='random',
+                           random_state=1234, tol=0, dimension_tree=True)
+    assert_array_almost_equal(kruskal_to_tensor(factors), kruskal_to_tensor(factors_tree),
+                              decimal=4)
+
 
 def test_non_negative_parafac():
     """Test for non-negative PARAFAC
@@ -85,6 +94,139 @@ def test_non_negative_parafac():
     assert_(T.max(T.abs(rec_svd - rec_random)) < tol_max_abs,
             'abs norm of difference between svd and random init too high')
 
+    with np.testing.assert_raises(ValueError):
+        non_negative_parafac(tensor, rank=3, method='bogus')
+    with np.testing.assert_raises(ValueError):
+        non_negative_parafac(tensor, rank=3, l1_reg=1)
+
+
+@pytest.mark.xfail(tl.get_backend() == 'tensorflow',
+                   reason='Item assignment not supported by tensorflow')
+def test_non_negative_parafac_hals():
+    """Test for non-negative PARAFAC with HALS"""
+    # The initial factors are drawn from another random state than the true ones
+    rng = check_random_state(1234)
+    factors = [T.tensor(rng.random_sample((s, 3))) for s in (10, 11, 12)]
+    tensor = kruskal_to_tensor(factors)
+
+    errors = {}
+    for method in ['mu', 'hals']:
+        nn_factors = non_negative_parafac(tensor, rank=3, n_iter_max=50, tol=0,
+                                          init='random', random_state=0, method=method)
+        for factor in nn_factors:
+            assert_(T.all(factor >= 0))
+        error = T.norm(kruskal_to_tensor(nn_factors) - tensor, 2)/T.norm(tensor, 2)
+        errors[method] = error
+    assert_(errors['hals'] < 0.01,
+            'reconstruction error of {} with HALS'.format(errors['hals']))
+    assert_(errors['hals'] < errors['mu'])
+
+    # The L1 penalty gives sparser factors
+    sparse_factors = non_negative_parafac(tensor, rank=3, n_iter_max=50, tol=0,
+                                          init='random', random_state=0, method='hals',
+                                          l1_reg=0.5)
+    n_zeros = sum(T.sum(f == 0) for f in nn_factors)
+    assert_(sum(T.sum(f == 0) for f in sparse_factors) > n_zeros)
+
+
+def test_parafac_linesearch():
+    """Test for PARAFAC with line search on a tensor with collinear components"""
+    rng = check_random_state(1234)
+    factors = []
+    for size in (10, 11, 12):
+        common = rng.standard_normal((size, 1))
+        factors.append(T.tensor(0.9*common + 0.45*rng.standard_normal((size, 3))))
+    tensor = kruskal_to_tensor(factors) + T.tensor(1e-3*rng.standard_normal((10, 11, 12)))
+
+    _, errors = parafac(tensor, rank=3, n_iter_max=500, tol=1e-9, init='random',
+                        random_state=0, return_errors=True)
+    ls_factors, ls_errors = parafac(tensor, rank=3, n_iter_max=500, tol=1e-9,
+                                    init='random', random_state=0, return_errors=True,
+                                    linesearch=True)
+    assert_(len(ls_errors) < len(errors),
+            'line search took {} iterations instead of {}'.format(len(ls_errors),
+                                                                  len(errors)))
+    assert_(ls_errors[-1] <= errors[-1] + 1e-6)
+
+    # The errors are those of the returned factors
+    error = T.norm(kruskal_to_tensor(ls_factors) - tensor, 2)/T.norm(tensor, 2)
+    assert_array_almost_equal(ls_errors[-1], error, decimal=5)
+
+    with pytest.raises(ValueError):
+        parafac(tensor, rank=3, linesearch=True, non_negative=True)
+
+
+def test_parafac_callback():
+    """Test for the callback of parafac"""
+    tensor = random_kruskal((5, 6, 7), 3, full=True, random_state=1234)
+    calls = []
+
+    def callback(factors, rec_error):
+        calls.append(rec_error)
+        return len(calls) == 5
+
+    _, errors = parafac(tensor, 3, n_iter_max=100, tol=0, callback=callback,
+                        return_errors=True)
+    assert_(len(calls) == 5)
+    assert_array_almost_equal(T.tensor(errors), T.tensor(calls))
+
+
+def test_parafac_init():
+    """Test for PARAFAC initialised with given factors"""
+    tensor = random_kruskal((5, 6, 7), 3, full=True, random_state=1234)
+    factors = parafac(tensor, rank=3, n_iter_max=100, tol=0, init='random',
+                      random_state=0)
+    error = T.norm(kruskal_to_tensor(factors) - tensor, 2)
+
+    # Warm start from a converged decomposition: the given factors are not modified
+    init = [T.copy(f) for f in factors]
+    for non_negative in [False, 'hals']:
+        warm_factors = parafac(tensor, rank=3, n_iter_max=1, tol=0, init=init,
+                               non_negative=non_negative)
+        assert_(T.norm(kruskal_to_tensor(warm_factors) - tensor, 2) <= error + 1e-8)
+    for factor, init_factor in zip(factors, init):
+        assert_array_equal(factor, init_factor)
+
+    with pytest.raises(ValueError):
+        parafac(tensor, rank=3, init=factors[:2])
+    with pytest.raises(ValueError):
+        parafac(tensor, rank=2, init=factors)
+
+
+def test_parafac_mask():
+    """Test for PARAFAC with missing values"""
+    rng = check_random_state(1234)
+    tensor = random_kruskal((10, 11, 12), 3, full=True, random_state=rng)
+    mask = T.tensor(rng.random_sample((10, 11, 12)) > 0.4)
+    # The missing values must not be used
+    corrupted = tensor*mask + 10*(1 - mask)
+
+    all_errors = {}
+    for mask_method in ['em', 'weighted', 'weighted_sparse']:
+        factors, errors = parafac(corrupted, rank=3, n_iter_max=200, tol=1e-10, mask=mask,
+                                  mask_method=mask_method, return_errors=True)
+        error = T.norm(kruskal_to_tensor(factors) - tensor, 2)/T.norm(tensor, 2)
+        assert_(error < 0.01,
+                'reconstruction error of {} with {}'.format(error, mask_method))
+        # The errors are those of the observed entries
+        observed_error = T.norm(mask*(kruskal_to_tensor(factors) - tensor), 2)
+        observed_error = observed_error/T.norm(mask*tensor, 2)
+        assert_array_almost_equal(errors[-1], observed_error)
+        all_errors[mask_method] = errors
+
+    # Same updates, computed from the coordinates of the observed entries
+    assert_array_almost_equal(T.tensor(all_errors['weighted']),
+                              T.tensor(all_errors['weighted_sparse']))
+
+    with pytest.raises(ValueError):
+        parafac(corrupted, rank=3, mask=mask, mask_method='mean')
+    with pytest.raises(ValueError):
+        parafac(corrupted, rank=3, mask=mask[:5])
+    with pytest.raises(ValueError):
+        parafac(corrupted, rank=3, mask=mask, linesearch=True)
+    with pytest.raises(ValueError):
+        parafac(corrupted, rank=3, mask=mask, mask_method='weighted', non_negative=True)
+
 
 @pytest.mark.xfail(tl.get_backend() == 'tensorflow', reason='Fails on tensorflow')
 def test_sample_khatri_rao():
@@ -111,6 +253,21 @@ def test_sample_khatri_rao():
     for ix, j in enumerate(sampled_rows):
         assert_array_equal(true_kr[j], sampled_kr[int(ix)], err_msg='Sampled khatri_rao product doesnt correspond to product')
 
+    # Fiber indices select, in the raveled tensor, the rows of the unfolding
+    # matching the sampled rows
+    rng = np.random.default_rng(1234)
+    sampled_kr, sampled_indices, fiber_indices = sample_khatri_rao(
+        factors, num_samples, skip_matrix=skip_matrix, random_state=rng,
+        return_fiber_indices=True)
+    assert_(np.shape(fiber_indices) == (num_samples, t_shape[skip_matrix]))
+    sampled_fibers = T.reshape(tensor, (-1, ))[fiber_indices]
+    for ix, (i, k) in enumerate(zip(*sampled_indices)):
+        assert_array_equal(sampled_fibers[ix], tensor[i, :, k])
+        assert_array_equal(sampled_kr[ix], factors[0][i]*factors[2][k])
+
+    with np.testing.assert_raises(ValueError):
+        sample_khatri_rao(factors, num_samples, return_fiber_indices=True)
+
 
 @pytest.mark.xfail(tl.get_backend() == 'tensorflow', reason='Fails on tensorflow')
 def test_randomised_parafac():
@@ -134,3 +291,23 @@ def test_randomised_parafac():
     reconstruction = kruskal_to_tensor(factors)
     error = float(T.norm(reconstruction - tensor, 2)/T.norm(tensor, 2))
     assert_(error < tolerance, msg='reconstruction of {} (higher than tolerance of {})'.format(error, tolerance))
+
+    # Sampling more rows than the Khatri-Rao has falls back to exact ALS
+    tensor = random_kruskal(shape=(3, 4, 5), rank=2, full=True, random_state=rng)
+    factors = randomised_parafac(tensor, rank=2, n_samples=20, n_iter_max=50, tol=0,
+                                 random_state=rng, verbose=0)
+    error = float(T.norm(kruskal_to_tensor(factors) - tensor, 2)/T.norm(tensor, 2))
+    assert_(error < tolerance,
+            msg='reconstruction of {} (higher than tolerance of {})'.format(
+                error, tolerance))
+
+    # The reconstruction error is estimated from sampled entries
+    tensor = T.tensor(rng.random_sample((10, 12, 14)))
+    factors = randomised_parafac(tensor, rank=3, n_samples=50, n_iter_max=20, tol=10e-5,
+                                 error_check_every=5, random_state=rng, verbose=0)
+    error = float(T.norm(kruskal_to_tensor(factors) - tensor, 2)/T.norm(tensor, 2))
+    indices = [rng.randint(0, s, size=20000) for s in T.shape(tensor)]
+    values = tensor[tuple(indices)]
+    estimate = _sampled_relative_error(values, factors, indices, T.norm(tensor, 2))
+    assert_(abs(estimate - error) < 0.05*error,
+            msg='error estimate of {}, true error of {}'.format(estimate, error))
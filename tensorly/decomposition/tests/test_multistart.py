@@ -0,0 +1,108 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+import tensorly as tl
+from .. import multistart
+from ..multistart import multistart_parafac, _init_worker, _WORKER_STATE
+from ...kruskal_tensor import kruskal_to_tensor
+from ...random import check_random_state
+from ...testing import assert_array_almost_equal, assert_
+
+
+def _swamp_tensor():
+    """Tensor with collinear components, on which some restarts stall in local minima"""
+    rng = check_random_state(2)
+    factors = [rng.standard_normal((12, 1))*1.5 + rng.standard_normal((12, 5))
+               for _ in range(3)]
+    tensor = kruskal_to_tensor(factors)
+    noise = rng.standard_normal((12, 12, 12))
+    return tl.tensor(tensor + 0.05*np.linalg.norm(tensor)/np.linalg.norm(noise)*noise)
+
+
+def test_multistart_parafac():
+    """Test for the multi-start CP decomposition"""
+    tensor = _swamp_tensor()
+    factors, errors = multistart_parafac(tensor, 5, n_restarts=6, n_iter_max=300,
+                                         tol=1e-9, random_state=0, early_stopping=None)
+    assert_(len(errors) == 6)
+    final_errors = [float(rec_errors[-1]) for rec_errors in errors]
+    error = tl.norm(kruskal_to_tensor(factors) - tensor, 2)/tl.norm(tensor, 2)
+    assert_array_almost_equal(error, min(final_errors), decimal=5)
+
+    # The restarts that stall clearly above the best error are stopped early
+    _, stopped_errors = multistart_parafac(tensor, 5, n_restarts=6, n_iter_max=300,
+                                           tol=1e-9, random_state=0, early_stopping=0.1)
+    n_iterations = [len(rec_errors) for rec_errors in stopped_errors]
+    assert_(sum(n_iterations) < sum(len(rec_errors) for rec_errors in errors))
+    assert_array_almost_equal(min(float(rec_errors[-1]) for rec_errors in stopped_errors),
+                              min(final_errors), decimal=5)
+
+    with pytest.raises(ValueError):
+        multistart_parafac(tensor, 5, n_restarts=0)
+
+
+def test_multistart_parafac_processes():
+    """Test for the multi-start CP decomposition in several processes"""
+    tensor = _swamp_tensor()
+    factors, errors = multistart_parafac(tensor, 5, n_restarts=4, n_iter_max=100,
+                                         random_state=0, early_stopping=None)
+    pool_factors, pool_errors = multistart_parafac(tensor, 5, n_restarts=4,
+                                                   n_iter_max=100, random_state=0,
+                                                   early_stopping=None, n_processes=2)
+    for rec_errors, pool_rec_errors in zip(errors, pool_errors):
+        assert_array_almost_equal(tl.tensor(rec_errors), tl.tensor(pool_rec_errors))
+    for factor, pool_factor in zip(factors, pool_factors):
+        assert_array_almost_equal(factor, pool_factor)
+
+
+def test_multistart_parafac_threads(monkeypatch):
+    """Test that the threads of the backends are shared between the processes"""
+    n_jobs = []
+
+    def parafac(*args, **kwargs):
+        n_jobs.append(kwargs['n_jobs'])
+        return [tl.ones((3, 2))]*3, [0.1]
+
+    class Pool:
+        """Runs the tasks in the current process"""
+        def __init__(self, processes, initializer, initargs):
+            initializer(*initargs)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            _WORKER_STATE.clear()
+
+        def map(self, function, tasks, chunksize=1):
+            return [function(task) for task in tasks]
+
+    monkeypatch.setattr(multistart, 'parafac', parafac)
+    monkeypatch.setattr(multistart.multiprocessing, 'Pool', Pool)
+    monkeypatch.setattr(multistart.multiprocessing, 'cpu_count', lambda: 8)
+    tensor = tl.ones((3, 3, 3))
+
+    multistart_parafac(tensor, 2, n_restarts=2, n_processes=2)
+    assert_(n_jobs == [4, 4])
+    del n_jobs[:]
+    multistart_parafac(tensor, 2, n_restarts=2, n_processes=2, n_jobs=1)
+    assert_(n_jobs == [1, 1])
+    del n_jobs[:]
+    multistart_parafac(tensor, 2, n_restarts=2, n_jobs=3)
+    assert_(n_jobs == [3, 3])
+
+
+@pytest.mark.skipif(tl.get_backend() != 'numpy',
+                    reason='Only NumPy arrays can share the buffer')
+def test_multistart_worker_shares_tensor():
+    """The workers use the tensor in shared memory without copying it"""
+    tensor_buffer = multiprocessing.RawArray('d', 24)
+    errors_buffer = multiprocessing.RawArray('d', 2*5)
+    _init_worker(tensor_buffer, (2, 3, 4), np.float64, errors_buffer, 5, 'numpy')
+    try:
+        assert_(np.shares_memory(_WORKER_STATE['tensor'], np.frombuffer(tensor_buffer)))
+        assert_(np.shares_memory(_WORKER_STATE['errors'], np.frombuffer(errors_buffer)))
+    finally:
+        _WORKER_STATE.clear()
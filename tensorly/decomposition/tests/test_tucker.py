@@ -1,3 +1,5 @@
+import pytest
+
 import tensorly as tl
 from .._tucker import tucker, partial_tucker, non_negative_tucker
 from ...tucker_tensor import tucker_to_tensor
@@ -111,3 +113,70 @@ def test_non_negative_tucker():
             'norm 2 of difference between svd and random init too high')
     assert_(tl.norm(rec_svd - rec_random, 'inf') < tol_max_abs,
             'abs norm of difference between svd and random init too high')
+
+
+@pytest.mark.xfail(tl.get_backend() == 'tensorflow',
+                   reason='Item assignment not supported by tensorflow')
+def test_non_negative_tucker_hals():
+    """Test for non-negative Tucker with HALS"""
+    rng = check_random_state(1234)
+    rank = [2, 3, 4]
+    true_core = tl.tensor(rng.random_sample(rank))
+    true_factors = [tl.tensor(rng.random_sample((s, r)))
+                    for s, r in zip((8, 9, 10), rank)]
+    tensor = tucker_to_tensor(true_core, true_factors)
+
+    errors = {}
+    for method in ['mu', 'hals']:
+        core, factors = non_negative_tucker(tensor, rank=rank, n_iter_max=50, tol=0,
+                                            init='random', random_state=0, method=method)
+        for factor in factors:
+            assert_(tl.all(factor >= 0))
+        assert_(tl.all(core >= 0))
+        error = tl.norm(tucker_to_tensor(core, factors) - tensor, 2)/tl.norm(tensor, 2)
+        errors[method] = error
+    assert_(errors['hals'] < 0.05,
+            'reconstruction error of {} with HALS'.format(errors['hals']))
+    assert_(errors['hals'] < errors['mu'])
+
+    # A single rank is used for all the modes
+    with pytest.warns(DeprecationWarning):
+        core, _ = non_negative_tucker(tensor, rank=2, n_iter_max=2, method='hals')
+    assert_(tl.shape(core) == (2, 2, 2))
+
+    with pytest.raises(ValueError):
+        non_negative_tucker(tensor, rank=rank, method='bogus')
+
+
+def test_tucker_init():
+    """Test for the Tucker decompositions initialised with given factors"""
+    rng = check_random_state(1234)
+    tensor = tl.tensor(rng.random_sample((5, 6, 7)))
+    rank = [2, 3, 4]
+    core, factors = tucker(tensor, rank=rank, n_iter_max=100, tol=0)
+    error = tl.norm(tucker_to_tensor(core, factors) - tensor, 2)
+
+    # Warm start from a converged decomposition: the given factors are not modified
+    init_factors = [tl.copy(f) for f in factors]
+    for init in [init_factors, (core, init_factors)]:
+        warm_core, warm_factors = tucker(tensor, rank=rank, n_iter_max=1, init=init)
+        warm_error = tl.norm(tucker_to_tensor(warm_core, warm_factors) - tensor, 2)
+        assert_(abs(warm_error - error) < 1e-6)
+    for factor, init_factor in zip(factors, init_factors):
+        assert_(tl.max(tl.abs(factor - init_factor)) == 0)
+
+    nn_core, nn_factors = non_negative_tucker(tensor, rank=rank, n_iter_max=100, tol=0)
+    nn_error = tl.norm(tucker_to_tensor(nn_core, nn_factors) - tensor, 2)
+    for method in ['mu', 'hals']:
+        warm_core, warm_factors = non_negative_tucker(tensor, rank=rank, n_iter_max=1,
+                                                      method=method,
+                                                      init=(nn_core, nn_factors))
+        warm_error = tl.norm(tucker_to_tensor(warm_core, warm_factors) - tensor, 2)
+        assert_(warm_error <= nn_error*1.01)
+
+    with pytest.raises(ValueError):
+        tucker(tensor, rank=rank, init=factors[:2])
+    with pytest.raises(ValueError):
+        tucker(tensor, rank=[2, 3, 3], init=factors)
+    with pytest.raises(ValueError):
+        non_negative_tucker(tensor, rank=rank, init=(core[:1], factors))
@@ -2,9 +2,11 @@
 Core operations on Kruskal tensors.
 """
 
+import numpy as np
+
 from . import backend as T
 from .base import fold, tensor_to_vec
-from .tenalg import khatri_rao
+from .tenalg import khatri_rao, khatri_rao_blocks
 
 # Author: Jean Kossaifi
 
@@ -39,9 +41,33 @@ def kruskal_to_tensor(factors, weights=None):
     """
     shape = [T.shape(factor)[0] for factor in factors]
     if weights is not None:
-        full_tensor = T.dot(factors[0]*weights, T.transpose(khatri_rao(factors[1:])))
+        first_factor = factors[0]*weights
     else:
-        full_tensor = T.dot(factors[0], T.transpose(khatri_rao(factors[1:])))
+        first_factor = factors[0]
+    # The Khatri-Rao product is formed by blocks of rows, each giving a block of
+    # columns of the unfolding, which is allocated once and filled in place
+    n_columns = int(np.prod(shape[1:]))
+    full_tensor = None
+    parts = None
+    start = 0
+    for block in khatri_rao_blocks(factors[1:]):
+        part = T.dot(first_factor, T.transpose(block))
+        stop = start + T.shape(part)[1]
+        if start == 0 and stop == n_columns:
+            return fold(part, 0, shape)
+        if parts is not None:
+            parts.append(part)
+        else:
+            if full_tensor is None:
+                full_tensor = T.zeros((shape[0], n_columns), **T.context(part))
+            try:
+                full_tensor[:, start:stop] = part
+            except TypeError:
+                # Immutable tensors (e.g. TensorFlow) cannot be written into
+                full_tensor, parts = None, [part]
+        start = stop
+    if parts:
+        full_tensor = T.concatenate(parts, axis=1)
     return fold(full_tensor, 0, shape)
 
 
@@ -87,7 +113,7 @@ def kruskal_to_vec(factors):
 
             for u in U:
                 u[i].shape == (s_i, R)
-                
+
         where `R` is fixed while `s_i` can vary with `i`
 
     Returns
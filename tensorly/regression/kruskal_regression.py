@@ -1,6 +1,6 @@
 import numpy as np
 from ..base import partial_tensor_to_vec, partial_unfold
-from ..tenalg import  khatri_rao
+from ..tenalg import kr_dot, FactorGramCache
 from ..kruskal_tensor import kruskal_to_tensor, kruskal_to_vec
 from ..random import check_random_state
 from .. import backend as T
@@ -74,20 +74,21 @@ class KruskalRegressor():
 
         # Norm of the weight tensor at each iteration
         norm_W = []
+        grams = FactorGramCache(W)
 
         for iteration in range(self.n_iter_max):
 
             # Optimise each factor of W
             for i in range(len(W)):
-                phi = T.reshape(
-                          T.dot(partial_unfold(X, i, skip_begin=1),
-                                khatri_rao(W, skip_matrix=i)),
-                      (X.shape[0], -1))
+                phi = kr_dot(partial_unfold(X, i, skip_begin=1), W, skip_matrix=i)
+                phi = T.reshape(phi, (X.shape[0], -1))
                 inv_term = T.dot(T.transpose(phi), phi) + self.reg_W*T.tensor(np.eye(phi.shape[1]), **T.context(X))
-                W[i] = T.reshape(T.solve(inv_term, T.dot(T.transpose(phi), y)), (X.shape[i + 1], self.weight_rank))
+                W[i] = T.reshape(T.solve_spd(inv_term, T.dot(T.transpose(phi), y)),
+                                 (X.shape[i + 1], self.weight_rank))
+                grams.update(i, W[i])
 
-            weight_tensor_ = kruskal_to_tensor(W)
-            norm_W.append(T.norm(weight_tensor_, 2))
+            # ||kruskal_to_tensor(W)||, without forming the weight tensor
+            norm_W.append(T.sqrt(T.sum(grams.hadamard())))
 
             # Convergence check
             if iteration > 1:
@@ -98,7 +99,7 @@ class KruskalRegressor():
                         print('\nConverged in {} iterations'.format(iteration))
                     break
 
-        self.weight_tensor_ = weight_tensor_
+        self.weight_tensor_ = kruskal_to_tensor(W)
         self.kruskal_weight_ = W
         self.vec_W_ = kruskal_to_vec(W)
         self.n_iterations_ = iteration + 1
@@ -1,7 +1,7 @@
 import numpy as np
 from ..base import unfold, vec_to_tensor
 from ..base import partial_tensor_to_vec, partial_unfold
-from ..tenalg import kronecker
+from ..tenalg import KroneckerOperator
 from ..tucker_tensor import tucker_to_tensor, tucker_to_vec
 from ..random import check_random_state
 from .. import backend as T
@@ -81,21 +81,22 @@ class TuckerRegressor():
 
             # Optimise modes of W
             for i in range(len(W)):
+                kronecker_W = KroneckerOperator(W, skip_matrix=i)
                 phi = partial_tensor_to_vec(
                             T.dot(partial_unfold(X, i),
-                                  T.dot(kronecker(W, skip_matrix=i),
-                                          T.transpose(unfold(G, i)))))
+                                  kronecker_W.matmat(T.transpose(unfold(G, i)))))
                 # Regress phi on y: we could call a package here, e.g. scikit-learn
                 inv_term = T.dot(T.transpose(phi), phi) +\
                      self.reg_W * T.tensor(np.eye(phi.shape[1]), **T.context(X))
-                W_i = vec_to_tensor(T.solve(inv_term, T.dot(T.transpose(phi), y)),
+                W_i = vec_to_tensor(T.solve_spd(inv_term, T.dot(T.transpose(phi), y)),
                                     (X.shape[i + 1], G.shape[i]))
                 W[i] = W_i
 
-            phi = T.dot(partial_tensor_to_vec(X), kronecker(W))
-            G = vec_to_tensor(T.solve(T.dot(T.transpose(phi), phi) +\
-                                        self.reg_W * T.tensor(np.eye(phi.shape[1]), **T.context(X)),
-                                      T.dot(T.transpose(phi), y)), G.shape)
+            phi = KroneckerOperator(W).rmatmat(T.transpose(partial_tensor_to_vec(X)))
+            phi = T.transpose(phi)
+            inv_term = T.dot(T.transpose(phi), phi) + \
+                self.reg_W * T.tensor(np.eye(phi.shape[1]), **T.context(X))
+            G = vec_to_tensor(T.solve_spd(inv_term, T.dot(T.transpose(phi), y)), G.shape)
 
             weight_tensor_ = tucker_to_tensor(G, W)
             norm_W.append(T.norm(weight_tensor_, 2))
@@ -5,8 +5,10 @@ operations such as khatri-rao or kronecker product, n-mode product, etc.
 
 from .n_mode_product import (mode_dot, multi_mode_dot,
                              unfolding_dot_khatri_rao)
-from ._kronecker import kronecker
-from ._khatri_rao import khatri_rao
+from ._kronecker import kronecker, KroneckerOperator
+from ._khatri_rao import khatri_rao, khatri_rao_blocks, kr_dot
 from .generalised_inner_product import inner
-from .contraction import contract
+from .contraction import contract, einsum
+from .dimension_tree import DimensionTree
+from .gram_cache import FactorGramCache
 
@@ -1,3 +1,5 @@
+import numpy as np
+
 from .. import backend as T
 
 # Author: Jean Kossaifi
@@ -85,3 +87,101 @@ def khatri_rao(matrices, skip_matrix=None, reverse=False):
         # Note: we do NOT use .reverse() which would reverse matrices even outside this function
 
     return T.kr(matrices)
+
+
+# Default memory budget, in bytes, of a block of the Khatri-Rao product
+KR_BLOCK_BYTES = 2**24
+
+
+def _itemsize(matrix):
+    """Size in bytes of one element of `matrix`"""
+    if hasattr(matrix, 'itemsize'):
+        return matrix.itemsize
+    if hasattr(matrix, 'element_size'):  # PyTorch
+        return matrix.element_size()
+    try:
+        return np.dtype(matrix.dtype).itemsize
+    except TypeError:  # TensorFlow
+        return matrix.dtype.size
+
+
+def khatri_rao_blocks(matrices, skip_matrix=None, reverse=False,
+                      max_bytes=KR_BLOCK_BYTES):
+    """Khatri-Rao product of a list of matrices, by blocks of rows
+
+        Yields consecutive blocks of rows of ``khatri_rao(matrices)``, each of which
+        takes at most `max_bytes` bytes, so that the full product is never formed.
+
+    Parameters
+    ----------
+    matrices : ndarray list
+        list of matrices with the same number of columns
+    skip_matrix : None or int, optional, default is None
+        if not None, index of a matrix to skip
+    reverse : bool, optional
+        if True, the order of the matrices is reversed
+    max_bytes : int, default is KR_BLOCK_BYTES (16MB)
+        memory budget of each block. Blocks have at least one row.
+
+    Yields
+    ------
+    block : ndarray of shape ``(n_rows, m)``
+        rows of the Khatri-Rao product, in order: concatenating all the blocks
+        along the first axis gives ``khatri_rao(matrices, skip_matrix, reverse)``
+    """
+    if skip_matrix is not None:
+        matrices = [matrices[i] for i in range(len(matrices)) if i != skip_matrix]
+    if reverse:
+        matrices = matrices[::-1]
+
+    n_rows = int(np.prod([T.shape(matrix)[0] for matrix in matrices]))
+    n_columns = T.shape(matrices[0])[1]
+    block_size = max(1, max_bytes//(n_columns*_itemsize(matrices[0])))
+
+    if block_size >= n_rows:
+        yield khatri_rao(matrices)
+    elif len(matrices) == 1:
+        for start in range(0, n_rows, block_size):
+            yield matrices[0][start:start + block_size]
+    else:
+        for block in T.kr_blocks(matrices, block_size):
+            yield block
+
+
+def kr_dot(matrix, matrices, skip_matrix=None, reverse=False, max_bytes=KR_BLOCK_BYTES):
+    """Product of a matrix with the Khatri-Rao product of a list of matrices
+
+        Computes ``dot(matrix, khatri_rao(matrices, skip_matrix, reverse))``
+        by accumulating the products with blocks of rows of the Khatri-Rao product
+        (see :func:`khatri_rao_blocks`), which is never formed in full.
+
+    Parameters
+    ----------
+    matrix : ndarray of shape ``(n, prod(n_i))``
+    matrices : ndarray list
+        list of matrices with the same number of columns ``m``
+    skip_matrix : None or int, optional, default is None
+        if not None, index of a matrix to skip
+    reverse : bool, optional
+        if True, the order of the matrices is reversed
+    max_bytes : int, default is KR_BLOCK_BYTES (16MB)
+        memory budget of each block of the Khatri-Rao product
+
+    Returns
+    -------
+    ndarray of shape ``(n, m)``
+    """
+    res = None
+    start = 0
+    for block in khatri_rao_blocks(matrices, skip_matrix=skip_matrix,
+                                   reverse=reverse, max_bytes=max_bytes):
+        stop = start + T.shape(block)[0]
+        if start == 0 and stop == T.shape(matrix)[1]:
+            return T.dot(matrix, block)
+        partial = T.dot(matrix[:, start:stop], block)
+        start = stop
+        if res is None:
+            res = partial
+        else:
+            res = res + partial
+    return res
@@ -1,4 +1,7 @@
+import numpy as np
+
 from .. import backend as T
+from .n_mode_product import multi_mode_dot
 
 # Author: Jean Kossaifi
 
@@ -55,3 +58,92 @@ def kronecker(matrices, skip_matrix=None, reverse=False):
             res = T.kron(res, matrix)
     return res
 
+
+class KroneckerOperator():
+    """Kronecker product of a list of matrices, as an implicit linear operator
+
+        Represents ``kronecker(matrices, skip_matrix, reverse)`` without forming it:
+        products with a vector or a matrix are computed by reshaping it into
+        a tensor and multiplying that tensor by each matrix along its mode.
+        For matrices ``U_k`` of shape ``(I_k, J_k)``, this takes
+        ``prod(J_k)`` memory instead of ``prod(I_k)*prod(J_k)``.
+
+        On the NumPy backend, the operator can be used wherever SciPy expects
+        a linear operator, e.g. ``scipy.sparse.linalg.aslinearoperator(op)``.
+
+    Parameters
+    ----------
+    matrices : ndarray list
+    skip_matrix : None or int, optional, default is None
+        if not None, index of a matrix to skip
+    reverse : bool, optional
+        if True, the order of the matrices is reversed
+
+    Attributes
+    ----------
+    shape : (int, int)
+        ``(prod(I_k), prod(J_k))``, the shape of the Kronecker product
+    dtype
+        dtype of the matrices
+    """
+    def __init__(self, matrices, skip_matrix=None, reverse=False):
+        if skip_matrix is not None:
+            matrices = [matrices[i] for i in range(len(matrices)) if i != skip_matrix]
+        if reverse:
+            matrices = matrices[::-1]
+
+        for i, matrix in enumerate(matrices):
+            if T.ndim(matrix) != 2:
+                raise ValueError('All the matrices must have exactly 2 dimensions!'
+                                 'Matrix {} has dimension {} != 2.'.format(
+                                     i, T.ndim(matrix)))
+
+        self.matrices = list(matrices)
+        self.row_shape = tuple(T.shape(matrix)[0] for matrix in self.matrices)
+        self.column_shape = tuple(T.shape(matrix)[1] for matrix in self.matrices)
+        self.shape = (int(np.prod(self.row_shape)), int(np.prod(self.column_shape)))
+        self.dtype = self.matrices[0].dtype
+
+    def _apply(self, x, shape, out_size, transpose):
+        # x: vector or matrix whose rows are indexed by the raveled `shape`
+        if T.ndim(x) == 2:
+            n_columns = T.shape(x)[1]
+            tensor = T.reshape(x, shape + (n_columns, ))
+            res = multi_mode_dot(tensor, self.matrices, modes=range(len(shape)),
+                                 transpose=transpose)
+            return T.reshape(res, (out_size, n_columns))
+        tensor = T.reshape(x, shape)
+        res = multi_mode_dot(tensor, self.matrices, transpose=transpose)
+        return T.reshape(res, (out_size, ))
+
+    def matvec(self, x):
+        """Kronecker product times the vector `x`
+
+            `x` is of shape ``(shape[1], )`` or ``(shape[1], 1)``.
+        """
+        return self._apply(x, self.column_shape, self.shape[0], False)
+
+    def rmatvec(self, x):
+        """Transposed Kronecker product times the vector `x`
+
+            `x` is of shape ``(shape[0], )`` or ``(shape[0], 1)``.
+        """
+        return self._apply(x, self.row_shape, self.shape[1], True)
+
+    def matmat(self, x):
+        """Kronecker product times the matrix `x` of shape ``(shape[1], k)``"""
+        if T.ndim(x) != 2:
+            raise ValueError('Expected a matrix, got an array with {} dimensions.'.format(
+                T.ndim(x)))
+        return self._apply(x, self.column_shape, self.shape[0], False)
+
+    def rmatmat(self, x):
+        """Transposed Kronecker product times the matrix `x` of shape ``(shape[0], k)``"""
+        if T.ndim(x) != 2:
+            raise ValueError('Expected a matrix, got an array with {} dimensions.'.format(
+                T.ndim(x)))
+        return self._apply(x, self.row_shape, self.shape[1], True)
+
+    def to_tensor(self):
+        """Forms the Kronecker product explicitly"""
+        return kronecker(self.matrices)
@@ -1,9 +1,11 @@
+from functools import lru_cache
+
 import numpy as np
 import tensorly as tl
 
 def contract(tensor1, modes1, tensor2, modes2):
     """Tensor contraction between two tensors on specified modes
-    
+
     Parameters
     ----------
     tensor1 : tl.tensor
@@ -23,32 +25,197 @@ def contract(tensor1, modes1, tensor2, modes2):
         modes2 = [modes2]
     modes1 = list(modes1)
     modes2 = list(modes2)
-    
+
     if len(modes1) != len(modes2):
         raise ValueError('Can only contract two tensors along the same number of modes'
                          '(len(modes1) == len(modes2))'
                          'However, got {} modes for tensor 1 and {} mode for tensor 2'
                          '(modes1={}, and modes2={})'.format(
                            len(modes1), len(modes2), modes1, modes2))
-    
+
     contraction_dims = [tl.shape(tensor1)[i] for i in modes1]
     if contraction_dims != [tl.shape(tensor2)[i] for i in modes2]:
         raise ValueError('Trying to contract tensors over modes of different sizes'
                          '(contracting modes of sizes {} and {}'.format(
                              contraction_dims, [tl.shape(tensor2)[i] for i in modes2]))
-    shared_dim = int(np.prod(contraction_dims))
-
-    modes1_free = [i for i in range(tl.ndim(tensor1)) if i not in modes1]
-    free_shape1 = [tl.shape(tensor1)[i] for i in modes1_free]
-
-    tensor1 = tl.reshape(tl.transpose(tensor1, modes1_free + modes1),
-                         (int(np.prod(free_shape1)), shared_dim))
-    
-    modes2_free = [i for i in range(tl.ndim(tensor2)) if i not in modes2]
-    free_shape2 = [tl.shape(tensor2)[i] for i in modes2_free]
-
-    tensor2 = tl.reshape(tl.transpose(tensor2, modes2 + modes2_free),
-                         (shared_dim, int(np.prod(free_shape2))))
-    
-    res = tl.dot(tensor1, tensor2)
-    return tl.reshape(res, tuple(free_shape1 + free_shape2))
+
+    return tl.tensordot(tensor1, tensor2, axes=(modes1, modes2))
+
+
+def _parse_subscripts(subscripts, n_operands):
+    """Input and output indices of an einsum expression"""
+    subscripts = subscripts.replace(' ', '')
+    if '.' in subscripts:
+        raise ValueError('Ellipsis are not supported in einsum, got {}.'.format(
+            subscripts))
+
+    if '->' in subscripts:
+        inputs, output = subscripts.split('->')
+    else:
+        # Implicit mode: the indices appearing once, in alphabetical order
+        inputs = subscripts
+        output = ''.join(sorted(c for c in set(inputs)
+                                if c != ',' and inputs.count(c) == 1))
+    inputs = inputs.split(',')
+
+    if len(inputs) != n_operands:
+        raise ValueError('einsum expression {} has {} operands but {} tensors '
+                         'were given.'.format(subscripts, len(inputs), n_operands))
+    for indices in inputs + [output]:
+        if len(set(indices)) != len(indices):
+            raise ValueError('Repeated indices in one operand are not supported in '
+                             'einsum, got {} in {}.'.format(indices, subscripts))
+    for c in output:
+        if not any(c in indices for indices in inputs):
+            raise ValueError('Output index {} does not appear in the inputs '
+                             'of {}.'.format(c, subscripts))
+    return inputs, output
+
+
+@lru_cache(maxsize=256)
+def _einsum_path(subscripts, shapes, backend):
+    """Greedy pairwise contraction plan of an einsum expression
+
+        The plan only depends on the expression and the shapes of the operands
+        (`backend` is part of the cache key only) and is memoised.
+        At each step, the two operands whose contraction reduces the total size
+        of the operands the most are contracted.
+
+    Returns
+    -------
+    sums : tuple of (operand, axes)
+        axes of each input operand summed over before any contraction
+        (indices appearing in that operand only)
+    steps : tuple of (i, j, axes_i, axes_j, indices)
+        operands i and j (positions in the current list of operands) are removed,
+        and their contraction over axes_i and axes_j appended to the list.
+        If some indices shared by i and j are kept, the product is computed by
+        broadcasting instead of tensordot: `indices` is then a tuple
+        ``(indices_i, indices_j, result_indices)``, and None otherwise.
+    permutation : int tuple
+        permutation of the axes of the last operand giving the output
+    """
+    inputs, output = _parse_subscripts(subscripts, len(shapes))
+    sizes = {}
+    for indices, shape in zip(inputs, shapes):
+        if len(indices) != len(shape):
+            raise ValueError('Operand {} has {} dimensions but {} indices in {}.'.format(
+                indices, len(shape), len(indices), subscripts))
+        for c, size in zip(indices, shape):
+            if sizes.setdefault(c, size) != size:
+                raise ValueError('Index {} has sizes {} and {} in {}.'.format(
+                    c, sizes[c], size, subscripts))
+
+    def size(indices):
+        return int(np.prod([sizes[c] for c in indices]))
+
+    # Sum over the indices appearing in only one operand and not in the output
+    sums = []
+    operands = []
+    for i, indices in enumerate(inputs):
+        other_inputs = [other for j, other in enumerate(inputs) if j != i]
+        summed = [c for c in indices
+                  if c not in output and not any(c in other for other in other_inputs)]
+        if summed:
+            sums.append((i, tuple(indices.index(c) for c in summed)))
+        operands.append(''.join(c for c in indices if c not in summed))
+
+    steps = []
+    while len(operands) > 1:
+        best = None
+        for i in range(len(operands)):
+            for j in range(i + 1, len(operands)):
+                others = output + ''.join(operands[k] for k in range(len(operands))
+                                          if k not in (i, j))
+                indices = operands[i] + ''.join(c for c in operands[j]
+                                                if c not in operands[i])
+                kept = ''.join(c for c in indices if c in others)
+                # Size reduction, then number of operations
+                cost = (size(kept) - size(operands[i]) - size(operands[j]), size(indices))
+                if best is None or cost < best[0]:
+                    best = (cost, i, j, kept)
+        _, i, j, kept = best
+
+        a, b = operands[i], operands[j]
+        contracted = [c for c in a if c in b and c not in kept]
+        if any(c in b for c in a if c in kept):
+            result = kept
+            indices = (a, b, result)
+        else:
+            result = ''.join(c for c in a + b if c not in contracted)
+            indices = None
+        steps.append((i, j, tuple(a.index(c) for c in contracted),
+                      tuple(b.index(c) for c in contracted), indices))
+        operands = [operands[k] for k in range(len(operands))
+                    if k not in (i, j)] + [result]
+
+    permutation = tuple(operands[0].index(c) for c in output)
+    return tuple(sums), tuple(steps), permutation
+
+
+def _broadcast_contract(tensor1, indices1, tensor2, indices2, result):
+    """Contraction of two tensors keeping shared indices, by broadcasting"""
+    indices = indices1 + ''.join(c for c in indices2 if c not in indices1)
+    shape1 = list(tl.shape(tensor1)) + [1]*(len(indices) - len(indices1))
+    tensor1 = tl.reshape(tensor1, shape1)
+
+    order2 = [c for c in indices if c in indices2]
+    tensor2 = tl.transpose(tensor2, [indices2.index(c) for c in order2])
+    shape2 = [tl.shape(tensor2)[order2.index(c)] if c in indices2 else 1 for c in indices]
+    res = tensor1*tl.reshape(tensor2, shape2)
+
+    for axis in reversed(range(len(indices))):
+        if indices[axis] not in result:
+            res = tl.sum(res, axis=axis)
+    return res
+
+
+def einsum(subscripts, *tensors):
+    """Contraction of several tensors described by an einsum expression
+
+        The tensors are contracted two at a time, in an order found greedily to
+        keep the intermediate results small, with the backend's `tensordot`.
+        The contraction order is memoised for each expression, shapes and backend,
+        so repeatedly contracting tensors of the same shapes (e.g. in an iterative
+        algorithm) only computes it once.
+
+    Parameters
+    ----------
+    subscripts : str
+        einsum expression, e.g. ``'ij,jk,kl->il'``. If the output is not given,
+        it consists of the indices appearing only once, in alphabetical order.
+        Ellipsis and indices repeated within one operand are not supported.
+    tensors : tl.tensor
+        the operands
+
+    Returns
+    -------
+    tl.tensor
+
+    Examples
+    --------
+    Contracting a chain of Matrix-Product-State cores::
+
+        einsum('aib,bjc,ckd->aijkd', core1, core2, core3)
+    """
+    shapes = tuple(tuple(tl.shape(tensor)) for tensor in tensors)
+    sums, steps, permutation = _einsum_path(subscripts, shapes, tl.get_backend())
+
+    operands = list(tensors)
+    for i, axes in sums:
+        for axis in sorted(axes, reverse=True):
+            operands[i] = tl.sum(operands[i], axis=axis)
+
+    for i, j, axes_i, axes_j, indices in steps:
+        if indices is None:
+            res = tl.tensordot(operands[i], operands[j],
+                               axes=(list(axes_i), list(axes_j)))
+        else:
+            res = _broadcast_contract(operands[i], indices[0], operands[j], indices[1],
+                                      indices[2])
+        operands = [operands[k] for k in range(len(operands)) if k not in (i, j)] + [res]
+
+    res = operands[0]
+    if permutation != tuple(range(len(permutation))):
+        res = tl.transpose(res, permutation)
+    return res
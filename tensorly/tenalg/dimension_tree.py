@@ -0,0 +1,149 @@
+import numpy as np
+from .. import backend as T
+from ._khatri_rao import khatri_rao
+
+# License: BSD 3 clause
+
+
+class DimensionTree():
+    """MTTKRP engine reusing partial contractions in a binary dimension tree
+
+        Computes the matricised tensor times Khatri-Rao products
+        (MTTKRP) needed by CP-ALS, for every mode, while caching the
+        intermediate partial contractions [1]_.
+
+        The modes of the tensor are recursively split in two halves.
+        The node of the tree associated with a set of modes holds the tensor
+        contracted with the factors of all the *other* modes, keeping the rank
+        dimension, i.e. a tensor of shape ``(I_k for k in node) + (rank, )``.
+        The leaves are the MTTKRP themselves.
+
+        Each node remembers which version of the factors it was computed with
+        and is only recomputed when one of them is updated.
+        When updating the factors in order, as in ALS, a full sweep costs
+        about two passes over the full tensor instead of one per mode.
+
+    Parameters
+    ----------
+    tensor : tl.tensor
+    factors : tl.tensor list
+        list of matrices, one per mode of `tensor`, all with the same
+        number of columns
+
+    Notes
+    -----
+    Typical use in an ALS sweep::
+
+        tree = DimensionTree(tensor, factors)
+        for mode in range(tl.ndim(tensor)):
+            mttkrp = tree.mttkrp(mode)
+            factors[mode] = update(mttkrp)
+            tree.update_factor(mode, factors[mode])
+
+    References
+    ----------
+    .. [1] A.-H. Phan, P. Tichavsky and A. Cichocki,
+       "Fast Alternating LS Algorithms for High Order CANDECOMP/PARAFAC
+       Tensor Factorizations", IEEE Transactions on Signal Processing,
+       vol. 61, n. 19, pp. 4834-4846, 2013.
+    """
+    def __init__(self, tensor, factors):
+        self.tensor = tensor
+        self.factors = list(factors)
+        self.shape = tuple(T.shape(tensor))
+        self.n_modes = len(self.shape)
+        if self.n_modes < 2:
+            raise ValueError('A dimension tree requires a tensor of order at least 2, '
+                             'got a tensor of order {}.'.format(self.n_modes))
+        if len(self.factors) != self.n_modes:
+            raise ValueError('Got {} factors for a tensor of order {}.'.format(
+                len(self.factors), self.n_modes))
+
+        self._versions = [0]*self.n_modes
+        self._cache = {}
+
+        # Parent of each node, a node being a contiguous range of modes (start, stop)
+        self._parents = {}
+        self._build((0, self.n_modes))
+
+    def _build(self, node):
+        start, stop = node
+        if stop - start < 2:
+            return
+        middle = (start + stop + 1)//2
+        for child in [(start, middle), (middle, stop)]:
+            self._parents[child] = node
+            self._build(child)
+
+    def update_factor(self, mode, factor):
+        """Replaces the factor of the given mode
+
+            Only the nodes of the tree computed with the previous factor
+            will be recomputed.
+        """
+        self.factors[mode] = factor
+        self._versions[mode] += 1
+
+    def mttkrp(self, mode):
+        """Returns the MTTKRP for the given mode
+
+        Returns
+        -------
+        mttkrp : tl.tensor of shape (tensor.shape[mode], rank)
+            dot(unfold(tensor, mode), khatri_rao(factors, skip_matrix=mode))
+        """
+        return self._node_value((mode, mode + 1))
+
+    def _node_value(self, node):
+        """Value of the node, recomputed only if one of its factors changed"""
+        start, stop = node
+        versions = tuple(v for i, v in enumerate(self._versions) if not start <= i < stop)
+        try:
+            cached_versions, value = self._cache[node]
+            if cached_versions == versions:
+                return value
+        except KeyError:
+            pass
+
+        parent = self._parents[node]
+        if parent == (0, self.n_modes):
+            value = self._contract_root(node)
+        else:
+            value = self._contract_node(parent, node)
+        self._cache[node] = (versions, value)
+        return value
+
+    def _contract_root(self, node):
+        """Contracts the full tensor with the factors of the sibling of `node`"""
+        start, stop = node
+        rank = T.shape(self.factors[0])[1]
+        split = stop if start == 0 else start
+        left_size = int(np.prod(self.shape[:split]))
+
+        matrix = T.reshape(self.tensor, (left_size, -1))
+        if start == 0:
+            # node is the left child: contract the right modes
+            res = T.dot(matrix, khatri_rao(self.factors[split:]))
+        else:
+            res = T.dot(T.transpose(matrix), khatri_rao(self.factors[:split]))
+        return T.reshape(res, self.shape[start:stop] + (rank, ))
+
+    def _contract_node(self, parent, node):
+        """Contracts the value of `parent` with the factors of the sibling of `node`"""
+        parent_value = self._node_value(parent)
+        p_start, p_stop = parent
+        start, stop = node
+        rank = T.shape(self.factors[0])[1]
+
+        if start == p_start:
+            # node is the left child
+            n_rows = int(np.prod(self.shape[start:stop]))
+            kr = khatri_rao(self.factors[stop:p_stop])
+            value = T.reshape(parent_value, (n_rows, -1, rank))
+            res = T.sum(value*T.reshape(kr, (1, -1, rank)), axis=1)
+        else:
+            n_rows = int(np.prod(self.shape[p_start:start]))
+            kr = khatri_rao(self.factors[p_start:start])
+            value = T.reshape(parent_value, (n_rows, -1, rank))
+            res = T.sum(value*T.reshape(kr, (-1, 1, rank)), axis=0)
+        return T.reshape(res, self.shape[start:stop] + (rank, ))
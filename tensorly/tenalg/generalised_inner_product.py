@@ -1,5 +1,4 @@
 from .. import backend as T
-import numpy as np
 
 # Author: Jean Kossaifi
 # License: BSD 3 clause
@@ -37,13 +36,9 @@ def inner(tensor1, tensor2, n_modes=None):
     shape_t1 = list(T.shape(tensor1))
     shape_t2 = list(T.shape(tensor2))
     common_modes = shape_t1[len(shape_t1) - n_modes:]
-    common_size = int(np.prod(common_modes))
-    output_shape = shape_t1[:-n_modes] + shape_t2[n_modes:]
 
     if common_modes != shape_t2[:n_modes]:
         raise ValueError('Incorrect shapes for inner product along {} common modes.'
                          'tensor_1.shape={}, tensor_2.shape={}'.format(n_modes, shape_t1, shape_t2))
-    inner_product = T.dot(T.reshape(tensor1, (-1, common_size)),
-                          T.reshape(tensor2, (common_size, -1)))
-    return T.reshape(inner_product, output_shape)
+    return T.tensordot(tensor1, tensor2, axes=n_modes)
 
@@ -0,0 +1,75 @@
+from .. import backend as T
+
+# License: BSD 3 clause
+
+
+class FactorGramCache():
+    """Gram matrices of a list of factors, refreshed only when a factor changes
+
+        ALS-type algorithms (CP-ALS, HALS, regression) repeatedly need the
+        Hadamard product of the Gram matrices ``dot(transpose(U_k), U_k)``
+        of all the factors but one. Since only one factor changes per update,
+        the Gram matrix of each factor is computed once and only recomputed
+        when that factor is updated.
+
+    Parameters
+    ----------
+    factors : tl.tensor list
+        list of matrices, all with the same number of columns
+
+    Notes
+    -----
+    Typical use in an ALS sweep::
+
+        grams = FactorGramCache(factors)
+        for mode in range(len(factors)):
+            factors[mode] = update(grams.hadamard(skip=mode))
+            grams.update(mode, factors[mode])
+
+    The squared norm of the Kruskal tensor ``[| factors |]`` is then
+    ``tl.sum(grams.hadamard())``.
+    """
+    def __init__(self, factors):
+        self.factors = list(factors)
+        self.grams = [self._gram(factor) for factor in self.factors]
+
+    @staticmethod
+    def _gram(factor):
+        return T.dot(T.transpose(factor), factor)
+
+    def __len__(self):
+        return len(self.grams)
+
+    def __getitem__(self, mode):
+        """Gram matrix of the factor of the given mode"""
+        return self.grams[mode]
+
+    def update(self, mode, factor):
+        """Replaces the factor of the given mode and recomputes its Gram matrix"""
+        self.factors[mode] = factor
+        self.grams[mode] = self._gram(factor)
+
+    def hadamard(self, skip=None):
+        """Element-wise product of the Gram matrices
+
+        Parameters
+        ----------
+        skip : int, optional
+            if not None, index of a Gram matrix to skip
+
+        Returns
+        -------
+        tl.tensor of shape (rank, rank)
+            the Gram matrix of the Khatri-Rao product of the factors
+            (except the skipped one). A new tensor, which can safely be
+            modified in place.
+        """
+        res = None
+        for mode, gram in enumerate(self.grams):
+            if mode == skip:
+                continue
+            if res is None:
+                res = T.copy(gram)
+            else:
+                res = res*gram
+        return res
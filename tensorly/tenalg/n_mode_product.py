@@ -1,7 +1,7 @@
+from functools import lru_cache
+
 from .. import backend as T
-from ..base import unfold, fold
 
-from tensorly import unfold, fold, vec_to_tensor
 
 def mode_dot(tensor, matrix_or_vector, mode):
         """n-mode product of a tensor and a matrix or vector at the specified mode
@@ -29,8 +29,6 @@ def mode_dot(tensor, matrix_or_vector, mode):
         --------
         multi_mode_dot : chaining several mode_dot in one call
         """
-        # the mode along which to fold might decrease if we take product with a vector
-        fold_mode = mode
         new_shape = list(tensor.shape)
 
         if T.ndim(matrix_or_vector) == 2:  # Tensor times matrix
@@ -59,15 +57,93 @@ def mode_dot(tensor, matrix_or_vector, mode):
             raise ValueError('Can only take n_mode_product with a vector or a matrix.'
                              'Provided array of dimension {} not in [1, 2].'.format(T.ndim(matrix_or_vector)))
 
-        res = T.dot(matrix_or_vector, unfold(tensor, mode))
+        # Contract directly with tensordot rather than unfolding and refolding,
+        # which would copy the tensor twice for any mode but the first
+        if vec:
+            res = T.tensordot(tensor, matrix_or_vector, axes=([mode], [0]))
+            return T.reshape(res, new_shape)
+        if mode == 0:
+            return T.tensordot(matrix_or_vector, tensor, axes=([1], [0]))
+        res = T.tensordot(tensor, matrix_or_vector, axes=([mode], [1]))
+        return T.moveaxis(res, -1, mode)
+
 
-        if vec: # We contracted with a vector, leading to a vector
-            return vec_to_tensor(res, shape=new_shape)
-        else: # tensor times vec: refold the unfolding
-            return fold(res, fold_mode, new_shape)
+@lru_cache(maxsize=128)
+def _multi_mode_dot_plan(n_modes, factors, optimize):
+    """Order in which multi_mode_dot applies the factors
 
+    Parameters
+    ----------
+    n_modes : int
+        number of modes of the tensor
+    factors : tuple of (mode, in_size, out_size)
+        for each factor, the mode it multiplies, the size of the mode
+        it contracts and the size of the mode it creates (None for vectors)
+    optimize : bool
+        if True, the factors are applied in the order that minimises the
+        number of operations, otherwise by increasing mode
 
-def multi_mode_dot(tensor, matrix_or_vec_list, modes=None, skip=None, transpose=False):
+    Returns
+    -------
+    steps : tuple of (index, axis, position)
+        for each product, the index of the factor, the axis it contracts
+        in the current tensor and whether the new axis is 'first', 'last'
+        or None (for vectors)
+    permutation : tuple or None
+        permutation of the axes of the result, if any
+    """
+    axes_modes = list(range(n_modes))
+    pending = list(range(len(factors)))
+    steps = []
+
+    while pending:
+        # Products along the same mode are applied in the order given
+        candidates = [i for i in pending if not any(
+            factors[j][0] == factors[i][0] for j in pending if j < i)]
+
+        if optimize:
+            # A product of a tensor of size S along a mode of size I with a
+            # J x I matrix costs S*J and multiplies the size of the tensor by J/I:
+            # the total cost is minimal when applying them by increasing 1/I - 1/J
+            # (a vector removes the mode: J = 1)
+            def key(i):
+                _, in_size, out_size = factors[i]
+                return 1/in_size - 1/(out_size or 1)
+            best = min(key(i) for i in candidates)
+            candidates = [i for i in candidates if key(i) == best]
+
+        # Contracting the first or last axis does not require copying the tensor:
+        # take the largest mode whose axis is such, so that contracting all the modes
+        # rotates the axes back to their original order
+        index = candidates[0]
+        for i in sorted(candidates, key=lambda i: -factors[i][0]):
+            if axes_modes.index(factors[i][0]) in (0, len(axes_modes) - 1):
+                index = i
+                break
+        pending.remove(index)
+
+        mode, _, out_size = factors[index]
+        axis = axes_modes.index(mode)
+        n_axes = len(axes_modes)
+        axes_modes.pop(axis)
+        if out_size is None:
+            position = None
+        elif axis in (0, n_axes - 1):
+            position = 'first'
+            axes_modes.insert(0, mode)
+        else:
+            position = 'last'
+            axes_modes.append(mode)
+        steps.append((index, axis, position))
+
+    permutation = tuple(sorted(range(len(axes_modes)), key=lambda i: axes_modes[i]))
+    if permutation == tuple(range(len(axes_modes))):
+        permutation = None
+    return tuple(steps), permutation
+
+
+def multi_mode_dot(tensor, matrix_or_vec_list, modes=None, skip=None, transpose=False,
+                   optimize=True):
     """n-mode product of a tensor and several matrices or vectors over several modes
 
     Parameters
@@ -85,6 +161,12 @@ def multi_mode_dot(tensor, matrix_or_vec_list, modes=None, skip=None, transpose=
     transpose : bool, optional, default is False
         if True, the matrices or vectors in in the list are transposed
 
+    optimize : bool, optional, default is True
+        if True, the products are applied in the order requiring the fewest
+        operations (e.g. projections that reduce the size of the tensor first),
+        otherwise by increasing mode. The order only depends on the shapes
+        and is cached for each shape signature.
+
     Returns
     -------
     ndarray
@@ -96,6 +178,9 @@ def multi_mode_dot(tensor, matrix_or_vec_list, modes=None, skip=None, transpose=
 
     :math:`\\text{tensor  }\\times_0 \\text{ matrix or vec list[0] }\\times_1 \\cdots \\times_n \\text{ matrix or vec list[n] }`
 
+    Each product is computed with a single `tensordot`, without unfolding the
+    tensor, and the axes of the result are only permuted once at the end.
+
     See also
     --------
     mode_dot
@@ -103,30 +188,58 @@ def multi_mode_dot(tensor, matrix_or_vec_list, modes=None, skip=None, transpose=
     if modes is None:
         modes = range(len(matrix_or_vec_list))
 
-    decrement = 0  # If we multiply by a vector, we diminish the dimension of the tensor
-
-    res = tensor
-
     # Order of mode dots doesn't matter for different modes
     # Sorting by mode shouldn't change order for equal modes
     factors_modes = sorted(zip(matrix_or_vec_list, modes), key=lambda x: x[1])
-    for i, (matrix_or_vec, mode) in enumerate(factors_modes):
-        if (skip is not None) and (i == skip):
-            continue
-
-        if transpose:
-            res = mode_dot(res, T.transpose(matrix_or_vec), mode - decrement)
+    factors_modes = [(matrix_or_vec, mode)
+                     for i, (matrix_or_vec, mode) in enumerate(factors_modes)
+                     if (skip is None) or (i != skip)]
+
+    signature = []
+    for matrix_or_vec, mode in factors_modes:
+        shape = T.shape(matrix_or_vec)
+        if len(shape) == 1:
+            signature.append((mode, shape[0], None))
+        elif len(shape) == 2:
+            if transpose:
+                signature.append((mode, shape[0], shape[1]))
+            else:
+                signature.append((mode, shape[1], shape[0]))
         else:
-            res = mode_dot(res, matrix_or_vec, mode - decrement)
+            raise ValueError('Can only take n_mode_product with a vector or a matrix.'
+                             'Provided array of dimension {} not in [1, 2].'.format(
+                                 len(shape)))
+    steps, permutation = _multi_mode_dot_plan(T.ndim(tensor), tuple(signature), optimize)
 
-        if T.ndim(matrix_or_vec) == 1:
-            decrement += 1
+    res = tensor
+    for index, axis, position in steps:
+        matrix_or_vec, mode = factors_modes[index]
+        if T.ndim(matrix_or_vec) == 2 and not transpose:
+            contracted = 1
+        else:
+            contracted = 0
+        if T.shape(matrix_or_vec)[contracted] != T.shape(res)[axis]:
+            raise ValueError(
+                'shapes {0} and {1} not aligned in mode-{2} multiplication: '
+                '{3} (mode {2}) != {4}'.format(
+                    T.shape(res), T.shape(matrix_or_vec), mode, T.shape(res)[axis],
+                    T.shape(matrix_or_vec)[contracted]))
+
+        if position == 'first':
+            res = T.tensordot(matrix_or_vec, res, axes=([contracted], [axis]))
+        else:
+            res = T.tensordot(res, matrix_or_vec, axes=([axis], [contracted]))
 
+    if T.ndim(res) == 0:
+        # Contracted with vectors along all the modes
+        return T.reshape(res, (1, ))
+    if permutation is not None:
+        res = T.transpose(res, permutation)
     return res
 
 def unfolding_dot_khatri_rao(tensor, factors, mode):
     """mode-n unfolding times khatri-rao product of factors
-    
+
     Parameters
     ----------
     tensor : tl.tensor
@@ -135,7 +248,7 @@ def unfolding_dot_khatri_rao(tensor, factors, mode):
         list of matrices of which to the khatri-rao product
     mode : int
         mode on which to unfold `tensor`
-    
+
     Returns
     -------
     mttkrp
@@ -144,41 +257,18 @@ def unfolding_dot_khatri_rao(tensor, factors, mode):
     Notes
     -----
     This is a variant of::
-    
+
         unfolded = unfold(tensor, mode)
         kr_factors = khatri_rao(factors, skip_matrix=mode)
         mttkrp2 = tl.dot(unfolded, kr_factors)
 
-    Multiplying with the Khatri-Rao product is equivalent to multiplying,
-    for each rank, with the kronecker product of each factor. 
-    In code::
-
-        mttkrp_parts = []
-        for r in range(rank):
-            component = tl.tenalg.multi_mode_dot(tensor, [f[:, r] for f in factors], skip=mode)
-            mttkrp_parts.append(component)
-        mttkrp = tl.stack(mttkrp_parts, axis=1)
-        return mttkrp 
-    
-    The same idea could be expressed using einsum::
-    
-        ndims = tl.ndim(tensor)
-        tensor_idx = ''.join(chr(ord('a') + i) for i in range(ndims))
-        rank = chr(ord('a') + ndims + 1)
-        op = tensor_idx
-        for i in range(ndims):
-            if i != mode:
-                op += ',' + ''.join([tensor_idx[i], rank])
-            else:
-                result = ''.join([tensor_idx[i], rank])
-        op += '->' + result
-        factors = [f for (i, f) in enumerate(factors) if i != mode]
-        return tl_einsum(op, tensor, *factors)
+    The actual computation is done by the backend's `mttkrp`, which never
+    forms the rank-by-rank projected tensor (e.g. NumPy uses einsum with a
+    cached contraction path, while the sparse backend only iterates over
+    the non-zero elements).
+
+    See also
+    --------
+    tensorly.mttkrp
     """
-    projected = multi_mode_dot(tensor, factors, skip=mode, transpose=True)
-    ndims = T.ndim(tensor)
-    res = []
-    for i in range(factors[0].shape[1]):
-        index = tuple([slice(None) if k == mode  else i for k in range(ndims)])
-        res.append(projected[index])
-    return T.stack(res, axis=-1)
+    return T.mttkrp(tensor, factors, mode)
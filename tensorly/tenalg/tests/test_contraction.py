@@ -1,25 +1,25 @@
 import numpy as np
 
 import tensorly as tl
-from ..contraction import contract
+from ..contraction import contract, einsum, _einsum_path
 from ...testing import assert_array_almost_equal, assert_raises
 
 def test_contract():
     shape = [3, 4, 2]
     vecs = [tl.tensor(np.random.random_sample((s))) for s in shape]
     tensor = tl.tensor(np.random.random_sample(shape))
-    
+
     # Equivalence with inner product when contracting with self along all modes
     res = contract(tensor, [0, 1, 2], tensor, modes2=[0, 1, 2])
     true_res = tl.tenalg.inner(tensor, tensor, n_modes=3)
     assert_array_almost_equal(true_res, res)
-        
+
     # Equivalence with n-mode-dot
     for mode, vec in enumerate(vecs):
         res = contract(tensor, mode, vec, 0)
         true_res = tl.tenalg.mode_dot(tensor, vec, mode)
         assert_array_almost_equal(true_res, res)
-        
+
     # Multi-mode-dot
     res = contract(contract(tensor, 0, vecs[0], 0), 0, vecs[1], 0)
     true_res = tl.tenalg.multi_mode_dot(tensor, vecs[:2], [0, 1])
@@ -27,8 +27,48 @@ def test_contract():
     # Wrong number of modes
     with assert_raises(ValueError):
         contract(tensor, [0, 2], tensor, modes2=[0, 1, 2])
-    
+
     # size mismatch
     with assert_raises(ValueError):
         contract(tensor, 0, vecs[1], modes2=0)
 
+
+def test_einsum():
+    """Test for einsum against numpy.einsum"""
+    expressions = [('ij,jk->ik', [(3, 4), (4, 5)]),
+                   ('ij,jk,kl->il', [(3, 4), (4, 5), (5, 2)]),
+                   # Chain of MPS cores
+                   ('aib,bjc,ckd->aijkd', [(1, 3, 2), (2, 4, 3), (3, 5, 1)]),
+                   # Tucker core and factors
+                   ('abc,ia,jb,kc->ijk', [(2, 3, 2), (4, 2), (5, 3), (6, 2)]),
+                   # Shared indices which are kept
+                   ('ir,jr,kr->ijk', [(3, 2), (4, 2), (5, 2)]),
+                   # Implicit output, sums and transpositions
+                   ('ij,jk', [(3, 4), (4, 5)]),
+                   ('ijk->j', [(3, 4, 5)]),
+                   ('ij->ji', [(3, 4)]),
+                   ('ij,ij->', [(3, 4), (3, 4)])]
+    for subscripts, shapes in expressions:
+        tensors = [np.random.random_sample(shape) for shape in shapes]
+        true_res = np.einsum(subscripts, *tensors)
+        res = einsum(subscripts, *[tl.tensor(t) for t in tensors])
+        assert_array_almost_equal(res, true_res)
+
+    # The contraction path is memoised
+    _einsum_path.cache_clear()
+    tensors = [tl.tensor(np.random.random_sample(shape))
+               for shape in [(3, 4), (4, 5), (5, 2)]]
+    einsum('ij,jk,kl->il', *tensors)
+    einsum('ij,jk,kl->il', *tensors)
+    assert _einsum_path.cache_info().hits == 1
+
+    # Contract the small operands first
+    _, steps, _ = _einsum_path('ij,jk,kl->il', ((100, 2), (2, 100), (100, 3)), 'numpy')
+    assert steps[0][:2] == (1, 2)
+
+    with assert_raises(ValueError):
+        einsum('ij,jk->ik', tensors[0])
+    with assert_raises(ValueError):
+        einsum('ii->i', tl.tensor(np.ones((3, 3))))
+    with assert_raises(ValueError):
+        einsum('ij,jk->ik', tensors[0], tensors[2])
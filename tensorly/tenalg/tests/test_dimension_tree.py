@@ -0,0 +1,49 @@
+from ... import backend as T
+from ...base import unfold
+from .._khatri_rao import khatri_rao
+from ..dimension_tree import DimensionTree
+from ...random import random_kruskal, check_random_state
+from ...testing import assert_array_almost_equal, assert_raises
+
+
+def test_dimension_tree():
+    """Test for DimensionTree
+
+    Checks the MTTKRP against the explicit version, for several orders,
+    while updating the factors as in an ALS sweep.
+    """
+    rng = check_random_state(1234)
+    rank = 3
+    for shape in [(4, 5, 6), (3, 4, 5, 2), (3, 4, 2, 3, 2)]:
+        tensor = T.tensor(rng.random_sample(shape))
+        factors = random_kruskal(shape=shape, rank=rank, random_state=rng)
+        tree = DimensionTree(tensor, factors)
+
+        for _ in range(2):
+            for mode in range(T.ndim(tensor)):
+                true_res = T.dot(unfold(tensor, mode),
+                                 khatri_rao(factors, skip_matrix=mode))
+                assert_array_almost_equal(tree.mttkrp(mode), true_res, decimal=4)
+
+                factors[mode] = T.tensor(rng.random_sample((shape[mode], rank)))
+                tree.update_factor(mode, factors[mode])
+
+        # Update in arbitrary order
+        for mode in [2, 0, 1, 2]:
+            factors[mode] = T.tensor(rng.random_sample((shape[mode], rank)))
+            tree.update_factor(mode, factors[mode])
+            for other in range(T.ndim(tensor)):
+                true_res = T.dot(unfold(tensor, other),
+                                 khatri_rao(factors, skip_matrix=other))
+                assert_array_almost_equal(tree.mttkrp(other), true_res, decimal=4)
+
+    # Order 2: the root's children are the leaves
+    tensor = T.tensor(rng.random_sample((4, 5)))
+    factors = random_kruskal(shape=(4, 5), rank=rank, random_state=rng)
+    tree = DimensionTree(tensor, factors)
+    for mode in range(2):
+        true_res = T.dot(unfold(tensor, mode), khatri_rao(factors, skip_matrix=mode))
+        assert_array_almost_equal(tree.mttkrp(mode), true_res, decimal=4)
+
+    with assert_raises(ValueError):
+        DimensionTree(T.tensor(rng.random_sample((3, 4, 5))), factors[:2])
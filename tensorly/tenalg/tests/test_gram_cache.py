@@ -0,0 +1,33 @@
+from ... import backend as T
+from .._khatri_rao import khatri_rao
+from ..gram_cache import FactorGramCache
+from ...kruskal_tensor import kruskal_to_tensor
+from ...random import check_random_state
+from ...testing import assert_array_almost_equal, assert_equal
+
+
+def test_factor_gram_cache():
+    """Test for FactorGramCache"""
+    rng = check_random_state(1234)
+    rank = 3
+    shape = (4, 5, 6)
+    factors = [T.tensor(rng.random_sample((s, rank))) for s in shape]
+    grams = FactorGramCache(factors)
+    assert_equal(len(grams), len(shape))
+
+    for mode in [0, 1, 2, 0]:
+        kr = khatri_rao(factors, skip_matrix=mode)
+        hadamard = grams.hadamard(skip=mode)
+        assert_array_almost_equal(hadamard, T.dot(T.transpose(kr), kr))
+
+        # The result can be modified without affecting the cache
+        hadamard *= 0
+        assert_array_almost_equal(grams[mode],
+                                  T.dot(T.transpose(factors[mode]), factors[mode]))
+
+        factors[mode] = T.tensor(rng.random_sample((shape[mode], rank)))
+        grams.update(mode, factors[mode])
+
+    # Squared norm of the Kruskal tensor
+    assert_array_almost_equal(T.sum(grams.hadamard()),
+                              T.norm(kruskal_to_tensor(factors), 2)**2)
@@ -1,8 +1,8 @@
 import numpy as np
 
 from ... import backend as T
-from .._khatri_rao import khatri_rao
-from ...testing import assert_array_equal, assert_raises
+from .._khatri_rao import khatri_rao, khatri_rao_blocks, kr_dot
+from ...testing import assert_array_equal, assert_array_almost_equal, assert_raises
 
 
 # Author: Jean Kossaifi
@@ -146,3 +146,30 @@ def test_khatri_rao():
 
     # Test with one matrix only: khatri-rao of one matrix = that matrix
     assert_array_equal(khatri_rao([U[0]]), U[0])
+
+
+def test_khatri_rao_blocks():
+    """Test for khatri_rao_blocks and kr_dot"""
+    rank = 3
+    shapes = [(3, rank), (4, rank), (2, rank)]
+    matrices = [T.tensor(np.random.random(shape)) for shape in shapes]
+    matrix = T.tensor(np.random.random((5, 4*2)))
+    itemsize = T.to_numpy(matrices[0]).itemsize
+
+    for skip_matrix, reverse in [(None, False), (0, False), (1, True)]:
+        true_res = khatri_rao(matrices, skip_matrix=skip_matrix, reverse=reverse)
+        n_rows = T.shape(true_res)[0]
+        # 1 row per block, 5 rows per block, the whole product in one block
+        for n_block_rows in [1, 5, n_rows]:
+            blocks = list(khatri_rao_blocks(matrices, skip_matrix=skip_matrix,
+                                            reverse=reverse,
+                                            max_bytes=n_block_rows*rank*itemsize))
+            assert len(blocks) == -(-n_rows//n_block_rows)
+            assert_array_almost_equal(T.concatenate(blocks, axis=0), true_res)
+
+        if skip_matrix == 0:
+            true_res = T.dot(matrix, true_res)
+            for max_bytes in [1, 5*rank*itemsize, 2**20]:
+                res = kr_dot(matrix, matrices, skip_matrix=skip_matrix,
+                             max_bytes=max_bytes)
+                assert_array_almost_equal(res, true_res)
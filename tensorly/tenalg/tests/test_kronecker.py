@@ -1,7 +1,9 @@
 import numpy as np
+import pytest
 
 from ... import backend as T
-from .._kronecker import kronecker
+import tensorly as tl
+from .._kronecker import kronecker, KroneckerOperator
 from .._khatri_rao import khatri_rao
 from ...testing import assert_array_equal, assert_array_almost_equal
 
@@ -91,3 +93,47 @@ def test_kronecker():
     res_1 = kronecker(U, skip_matrix=0)
     res_2 = kronecker(U[1:])
     assert_array_equal(res_1, res_2)
+
+
+def test_kronecker_operator():
+    """Test for KroneckerOperator"""
+    shapes = [[2, 3], [4, 5], [6, 7]]
+    U = [T.tensor(np.random.randn(*shape)) for shape in shapes]
+
+    for skip_matrix, reverse in [(None, False), (1, False), (None, True)]:
+        operator = KroneckerOperator(U, skip_matrix=skip_matrix, reverse=reverse)
+        true_res = kronecker(U, skip_matrix=skip_matrix, reverse=reverse)
+        n_rows, n_columns = T.shape(true_res)
+        assert operator.shape == (n_rows, n_columns)
+        assert_array_almost_equal(operator.to_tensor(), true_res)
+
+        vec = T.tensor(np.random.randn(n_columns))
+        assert_array_almost_equal(operator.matvec(vec), T.dot(true_res, vec))
+        matrix = T.tensor(np.random.randn(n_columns, 2))
+        assert_array_almost_equal(operator.matmat(matrix), T.dot(true_res, matrix))
+        assert_array_almost_equal(operator.matvec(matrix[:, :1]),
+                                  T.dot(true_res, matrix[:, :1]))
+
+        vec = T.tensor(np.random.randn(n_rows))
+        assert_array_almost_equal(operator.rmatvec(vec),
+                                  T.dot(T.transpose(true_res), vec))
+        matrix = T.tensor(np.random.randn(n_rows, 2))
+        assert_array_almost_equal(operator.rmatmat(matrix),
+                                  T.dot(T.transpose(true_res), matrix))
+
+
+@pytest.mark.skipif(tl.get_backend() != 'numpy',
+                    reason='SciPy operators need NumPy arrays')
+def test_kronecker_operator_scipy():
+    """KroneckerOperator can be used as a SciPy LinearOperator"""
+    from scipy.sparse.linalg import aslinearoperator
+
+    U = [np.random.randn(3, 2), np.random.randn(4, 3)]
+    operator = aslinearoperator(KroneckerOperator(U))
+    true_res = kronecker(U)
+    matrix = np.random.randn(6, 2)
+    assert_array_almost_equal(operator.matmat(matrix), np.dot(true_res, matrix))
+    assert_array_almost_equal(operator.rmatvec(np.ones(12)),
+                              np.dot(true_res.T, np.ones(12)))
+    assert_array_almost_equal((operator.H*operator).matvec(matrix[:, 0]),
+                              np.dot(true_res.T, np.dot(true_res, matrix[:, 0])))
@@ -7,7 +7,8 @@ from ...base import fold, unfold
 from .._kronecker import kronecker
 from .._khatri_rao import khatri_rao
 from ...random import random_kruskal
-from ..n_mode_product import mode_dot, multi_mode_dot, unfolding_dot_khatri_rao
+from ..n_mode_product import (mode_dot, multi_mode_dot, unfolding_dot_khatri_rao,
+                              _multi_mode_dot_plan)
 from ...testing import (assert_array_equal, assert_equal,
                         assert_array_almost_equal, assert_raises)
 
@@ -155,16 +156,49 @@ def test_multi_mode_dot():
         assert_equal(res.shape, (1,))
         assert_equal(res[0], 1)
 
+    # Mixing vectors and transposed matrices, against successive mode_dot
+    X = T.tensor(np.random.random((3, 5, 4, 2)))
+    factors = [T.tensor(np.random.random((3, 6))), T.tensor(np.random.random(5)),
+               T.tensor(np.random.random((2, 3)))]
+    res = multi_mode_dot(X, factors, modes=[0, 1, 3], transpose=True)
+    true_res = mode_dot(mode_dot(mode_dot(X, T.transpose(factors[0]), 0), factors[1], 1),
+                        T.transpose(factors[2]), 2)
+    assert_equal(res.shape, (6, 4, 3))
+    assert_array_almost_equal(res, true_res)
+
+
+def test_multi_mode_dot_plan():
+    """Test for the order in which multi_mode_dot applies the products"""
+    # Projections reducing the size of the tensor first, then expansions
+    factors = ((0, 10, 30), (1, 50, 5), (2, 20, 10))
+    steps, _ = _multi_mode_dot_plan(3, factors, True)
+    assert_equal([index for (index, _, _) in steps], [1, 2, 0])
+    steps, _ = _multi_mode_dot_plan(3, factors, False)
+    assert_equal(sorted(index for (index, _, _) in steps), [0, 1, 2])
+
+    # The result does not depend on the order
+    X = T.tensor(np.random.random((10, 50, 20)))
+    U = [T.tensor(np.random.random((30, 10))), T.tensor(np.random.random((5, 50))),
+         T.tensor(np.random.random((10, 20)))]
+    true_res = multi_mode_dot(X, U, optimize=False)
+    assert_array_almost_equal(multi_mode_dot(X, U), true_res)
+    assert_array_almost_equal(multi_mode_dot(X, U[1:] + U[:1], modes=[1, 2, 0]), true_res)
+
+    # Successive products along the same mode are applied in the given order
+    U = [T.tensor(np.random.random((20, 10))), T.tensor(np.random.random((3, 20)))]
+    res = multi_mode_dot(X, U, modes=[0, 0])
+    assert_array_almost_equal(res, mode_dot(mode_dot(X, U[0], 0), U[1], 0))
+
 def test_unfolding_dot_khatri_rao():
     """Test for unfolding_dot_khatri_rao
-    
+
     Check against other version check sparse safe
     """
     shape = (10, 10, 10, 4)
     rank = 5
     tensor = T.tensor(np.random.random(shape))
     factors = random_kruskal(shape=shape, rank=rank, full=False)
-    
+
     for mode in range(T.ndim(tensor)):
         # Version forming explicitely the khatri-rao product
         unfolded = unfold(tensor, mode)
@@ -1,3 +1,6 @@
+import json
+import subprocess
+import sys
 from concurrent.futures import ThreadPoolExecutor
 
 import pytest
@@ -94,6 +97,120 @@ def test_set_backend_local_threadsafe():
         assert executor.submit(tl.get_backend).result() == global_default
 
 
+def test_dispatch_method_cache():
+    class DummyBackend(numpy_backend.NumpyBackend):
+        @staticmethod
+        def ndim(tensor):
+            return -1
+
+    tensor = tl.tensor(np.ones((2, 3)))
+    # Populate the cache of the current backend
+    assert tl.ndim(tensor) == 2
+
+    with tl.backend_context(DummyBackend()):
+        # Cached methods of the previous backend are not used anymore
+        assert tl.ndim(tensor) == -1
+        assert T.ndim(tensor) == -1
+        assert tl.shape(tensor) == (2, 3)
+        # Threads that did not set a backend use the new default one
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(tl.ndim, tensor).result() == -1
+
+    assert tl.ndim(tensor) == 2
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(tl.ndim, tensor).result() == 2
+
+
+def test_thread_limits(monkeypatch):
+    backend = tl.backend._LOADED_BACKENDS[tl.get_backend()]
+    limits = []
+    monkeypatch.setattr(backend, 'limit_threads', limits.append, raising=False)
+
+    assert tl.get_num_threads() is None
+    with tl.thread_limits(4):
+        assert tl.get_num_threads() == 4
+        # Nested (or concurrent) limits: the smallest one is used
+        with tl.thread_limits(8):
+            assert tl.get_num_threads() == 4
+        with tl.thread_limits(2):
+            assert tl.get_num_threads() == 2
+        assert tl.get_num_threads() == 4
+    assert tl.get_num_threads() is None
+    assert limits == [4, 4, 4, 2, 4, None]
+
+    with tl.thread_limits(None):
+        assert tl.get_num_threads() is None
+    assert len(limits) == 6
+
+    tl.set_num_threads(3)
+    try:
+        assert tl.get_num_threads() == 3
+        with tl.thread_limits(6):
+            assert tl.get_num_threads() == 3
+    finally:
+        tl.set_num_threads(None)
+    assert limits[-1] is None
+
+    # Decompositions limit the threads to their n_jobs
+    def parafac(tensor, rank, n_jobs=None):
+        return tl.get_num_threads()
+    parafac = tl.backend.thread_limited(parafac)
+    assert parafac(None, 2, n_jobs=1) == 1
+    assert parafac(None, 2, 5) == 5
+    assert parafac(None, 2) is None
+
+    for n_threads in [0, -1, 2.5]:
+        with assert_raises(ValueError):
+            tl.set_num_threads(n_threads)
+
+
+def test_parafac_n_jobs(monkeypatch):
+    """Test that parafac runs within the thread limit of its n_jobs"""
+    from ..decomposition import parafac
+    backend = tl.backend._LOADED_BACKENDS[tl.get_backend()]
+    limits = []
+    monkeypatch.setattr(backend, 'limit_threads', limits.append, raising=False)
+
+    tensor = tl.tensor(np.random.RandomState(1234).random_sample((3, 4, 2)))
+    factors = parafac(tensor, rank=2, n_iter_max=10, init='random', random_state=1234)
+    assert limits == []
+    limited_factors = parafac(tensor, rank=2, n_iter_max=10, init='random',
+                              random_state=1234, n_jobs=1)
+    assert limits == [1, None]
+    for factor, limited_factor in zip(factors, limited_factors):
+        assert_array_almost_equal(factor, limited_factor)
+
+
+def test_trace_backend(tmp_path):
+    a = tl.tensor(np.random.random_sample((10, 5)))
+    b = tl.tensor(np.random.random_sample((5, 3)))
+
+    with tl.trace_backend() as tracer:
+        tl.dot(a, b)
+        T.dot(a, b)
+        with tl.trace_backend() as inner_tracer:
+            tl.solve(tl.dot(tl.transpose(a), a), b)
+    # Once done, the backend is called directly
+    assert type(tl.backend._get_methods()) is tl.backend._MethodCache
+
+    summary = tracer.summary()
+    assert summary['dot']['calls'] == 3
+    assert summary['dot']['flops'] == 2*2*10*5*3 + 2*5*10*5
+    assert (10, 5) in summary['dot']['shapes'][0]
+    assert summary['solve']['calls'] == 1
+    assert summary['solve']['time'] > 0
+    assert set(inner_tracer.summary()) == {'dot', 'transpose', 'solve'}
+    assert 'solve' in tracer.table()
+
+    path = str(tmp_path/'trace.json')
+    trace = tracer.to_chrome_trace(path)
+    assert len(trace['traceEvents']) == len(tracer.events)
+    with open(path) as f:
+        events = json.load(f)['traceEvents']
+    assert [event['name'] for event in events] == [name for name, *_ in tracer.events]
+    assert events[0]['args']['shapes'] == [[10, 5], [5, 3]]
+
+
 def test_backend_and_tensorly_module_attributes():
     for dtype in ['int32', 'int64', 'float32', 'float64']:
         assert dtype in dir(tl)
@@ -405,6 +522,56 @@ def test_svd():
             svd_fun(tensor)
 
 
+def test_partial_svd():
+    """Test for the partial SVD of the current backend"""
+    for shape, n_eigenvecs in [((20, 8), 3), ((8, 20), 3), ((20, 8), 8), ((8, 20), None)]:
+        matrix = np.random.random_sample(shape)
+        U, S, V = svd(matrix, full_matrices=False)
+        fU, fS, fV = T.partial_svd(T.tensor(matrix), n_eigenvecs=n_eigenvecs)
+        if n_eigenvecs is None:
+            # The full SVD is returned
+            assert_equal(T.shape(fU), (shape[0], shape[0]))
+            assert_equal(T.shape(fV), (shape[1], shape[1]))
+            n_eigenvecs = min(shape)
+            fU, fS, fV = fU[:, :n_eigenvecs], fS[:n_eigenvecs], fV[:n_eigenvecs, :]
+
+        assert_array_almost_equal(fS, S[:n_eigenvecs], decimal=4)
+        true_matrix = np.dot(U[:, :n_eigenvecs]*S[:n_eigenvecs], V[:n_eigenvecs])
+        assert_array_almost_equal(T.dot(fU*fS, fV), true_matrix, decimal=4)
+        assert_array_almost_equal(T.dot(fV, T.transpose(fV)), T.eye(n_eigenvecs),
+                                  decimal=4)
+
+    # The decompositions use the backend's own partial SVD by default
+    backend = T._LOADED_BACKENDS[T.get_backend()]
+    assert_equal(backend.SVD_FUNS['numpy_svd'], backend.partial_svd)
+
+
+def test_randomized_svd():
+    """Test for the randomized SVD on matrices larger than the projection"""
+    rng = np.random.RandomState(1234)
+    rank = 4
+    for shape in [(200, 30), (30, 500)]:
+        # Low rank matrix with well separated singular values
+        U, _ = np.linalg.qr(rng.random_sample((shape[0], rank)))
+        V, _ = np.linalg.qr(rng.random_sample((shape[1], rank)))
+        true_S = np.array([10., 5., 2., 1.])
+        matrix = T.tensor(np.dot(U*true_S, V.T))
+
+        for random_state in [None, 0]:
+            fU, fS, fV = T.randomized_svd(matrix, n_eigenvecs=rank,
+                                          random_state=random_state)
+            assert_equal(T.shape(fU), (shape[0], rank))
+            assert_equal(T.shape(fV), (rank, shape[1]))
+            assert_array_almost_equal(fS, true_S, decimal=4)
+            assert_array_almost_equal(matrix, T.dot(fU*fS, fV), decimal=4)
+            assert_array_almost_equal(T.dot(T.transpose(fU), fU), T.eye(rank), decimal=4)
+            assert_array_almost_equal(T.dot(fV, T.transpose(fV)), T.eye(rank), decimal=4)
+
+        # Only the leading singular vectors are requested
+        fU, fS, fV = T.randomized_svd(matrix, n_eigenvecs=2, n_oversamples=3)
+        assert_array_almost_equal(fS, true_S[:2], decimal=4)
+
+
 def test_shape():
     A = T.arange(3*4*5)
 
@@ -536,3 +703,184 @@ def test_prod():
     v = T.tensor([3, 4, 5])
     x = T.to_numpy(T.prod(v))
     assert_equal(x, 60)
+
+
+def test_out():
+    """Test for the `out` parameter of the backend functions"""
+    a = T.tensor(np.random.random_sample((4, 5)))
+    b = T.tensor(np.random.random_sample((5, 3)))
+    c = T.tensor(np.random.random_sample((4, 5)) + 0.5)
+    square = T.tensor(np.random.random_sample((4, 4)) + 4*np.eye(4))
+
+    expected = [T.dot(a, b), T.multiply(a, c), T.divide(a, c),
+                T.clip(a, a_min=0.2, a_max=0.8), T.solve(square, c)]
+    assert_array_almost_equal(expected[1], a*c)
+    assert_array_almost_equal(expected[2], a/c)
+    buffers = [T.zeros(shape, **T.context(a)) for shape in [(4, 3)] + [(4, 5)]*4]
+    results = [T.dot(a, b, out=buffers[0]), T.multiply(a, c, out=buffers[1]),
+               T.divide(a, c, out=buffers[2]),
+               T.clip(a, a_min=0.2, a_max=0.8, out=buffers[3]),
+               T.solve(square, c, out=buffers[4])]
+    for res, true_res in zip(results, expected):
+        assert_array_almost_equal(res, true_res)
+
+    # The output can be one of the inputs for element-wise operations
+    a_copy = T.copy(a)
+    res = T.multiply(a_copy, c, out=a_copy)
+    assert_array_almost_equal(res, expected[1])
+
+
+def test_tensordot():
+    """Test for tensordot, native and generic implementations"""
+    a = np.random.random((3, 4, 5))
+    b = np.random.random((5, 4, 2))
+    backend = tl.backend._LOADED_BACKENDS[tl.get_backend()]
+    for axes in [1, ([1, 2], [1, 0]), ([0], [2]), ([-1], [0])]:
+        if axes == ([0], [2]):
+            b_ = np.random.random((5, 4, 3))
+        else:
+            b_ = b
+        true_res = np.tensordot(a, b_, axes=axes)
+        res = T.tensordot(T.tensor(a), T.tensor(b_), axes=axes)
+        assert_array_almost_equal(res, true_res)
+        res = tl.backend.Backend.tensordot(backend, T.tensor(a), T.tensor(b_), axes=axes)
+        assert_array_almost_equal(res, true_res)
+
+
+def test_solve_spd():
+    rng = tl.random.check_random_state(1234)
+    factor = tl.tensor(rng.random_sample((20, 5)))
+    a = tl.dot(tl.transpose(factor), factor)
+    b = tl.tensor(rng.random_sample((5, 3)))
+
+    assert_array_almost_equal(tl.solve_spd(a, b), tl.solve(a, b))
+    assert_array_almost_equal(tl.solve_spd(a, b[:, 0]), tl.solve(a, b[:, 0]))
+    out = tl.zeros((5, 3))
+    x = tl.solve_spd(a, b, out=out)
+    assert_array_almost_equal(tl.dot(a, x), b)
+
+    # Semi-definite: Gram matrix of a rank deficient matrix, e.g. with a column of zeros
+    factor = tl.concatenate([factor, tl.zeros((20, 1))], axis=1)
+    a = tl.dot(tl.transpose(factor), factor)
+    b = tl.dot(tl.transpose(factor), tl.tensor(rng.random_sample((20, 2))))
+    x = tl.solve_spd(a, b)
+    assert_(tl.max(tl.abs(tl.dot(a, x) - b)) < 1e-3*tl.max(tl.abs(b)))
+
+
+def test_solve_spd_illegal_argument(monkeypatch):
+    """An illegal argument reported by LAPACK is raised, not returned"""
+    from scipy.linalg import lapack
+
+    def get_lapack_funcs(names, arrays):
+        return [lambda a, b: (a, b, -2)]
+    monkeypatch.setattr(lapack, 'get_lapack_funcs', get_lapack_funcs)
+    a = np.eye(3)
+    with assert_raises(ValueError):
+        numpy_backend.NumpyBackend.solve_spd(a, np.ones(3))
+
+
+def test_solve_spd_pytorch():
+    """The fallbacks of the PyTorch solve_spd give the same solution as NumPy's"""
+    pytest.importorskip('torch')
+    rng = tl.random.check_random_state(1234)
+    # Rank deficient Gram matrix, regularised by the ridge
+    factor = np.concatenate([rng.random_sample((20, 4)), np.zeros((20, 1))], axis=1)
+    gram = np.dot(factor.T, factor)
+    rhs = np.dot(factor.T, rng.random_sample((20, 2)))
+    # Indefinite matrix, solved by the last fallback
+    indefinite = np.diag([2., -1., 3.])
+    for a, b in [(gram, rhs), (gram, rhs[:, 0]), (indefinite, np.ones((3, 2)))]:
+        with tl.backend_context('numpy'):
+            true_res = tl.solve_spd(tl.tensor(a), tl.tensor(b))
+        with tl.backend_context('pytorch'):
+            res = tl.solve_spd(tl.tensor(a, dtype=tl.float64),
+                               tl.tensor(b, dtype=tl.float64))
+            res = tl.to_numpy(res)
+        assert_array_almost_equal(res, true_res)
+
+
+def test_batched_linalg():
+    rng = tl.random.check_random_state(1234)
+    a = tl.tensor(rng.random_sample((4, 5, 5)) + 5*np.eye(5))
+    b = tl.tensor(rng.random_sample((4, 5, 3)))
+    matrices = tl.tensor(rng.random_sample((4, 6, 3)))
+
+    res = tl.batched_dot(a, b)
+    x = tl.batched_solve(a, b)
+    vectors = tl.batched_solve(a, b[:, :, 0])
+    Q, R = tl.batched_qr(matrices)
+    U, S, V = tl.batched_svd(matrices)
+    U_2, S_2, V_2 = tl.batched_svd(matrices, n_eigenvecs=2)
+    assert tl.shape(U_2) == (4, 6, 2) and tl.shape(S_2) == (4, 2)
+    assert tl.shape(V_2) == (4, 2, 3)
+
+    for i in range(4):
+        assert_array_almost_equal(res[i], tl.dot(a[i], b[i]))
+        assert_array_almost_equal(x[i], tl.solve(a[i], b[i]))
+        assert_array_almost_equal(vectors[i], tl.solve(a[i], b[i, :, 0]))
+        assert_array_almost_equal(tl.dot(Q[i], R[i]), matrices[i])
+        assert_array_almost_equal(tl.dot(tl.transpose(Q[i]), Q[i]), tl.eye(3))
+        assert_array_almost_equal(tl.dot(U[i]*S[i], V[i]), matrices[i])
+        assert_array_almost_equal(S_2[i], S[i, :2])
+
+    # Generic implementations, looping over the matrices
+    backend = tl.backend._LOADED_BACKENDS[tl.get_backend()]
+    assert_array_almost_equal(tl.backend.Backend.batched_dot(backend, a, b), res)
+    assert_array_almost_equal(tl.backend.Backend.batched_solve(backend, a, b), x)
+    Q_2, R_2 = tl.backend.Backend.batched_qr(backend, matrices)
+    assert_array_almost_equal(tl.abs(R_2), tl.abs(R))
+    _, S_2, _ = tl.backend.Backend.batched_svd(backend, matrices, n_eigenvecs=2)
+    assert_array_almost_equal(S_2, S[:, :2])
+
+
+def test_segment_sum():
+    rng = tl.random.check_random_state(1234)
+    data = rng.random_sample((10, 2, 3))
+    segment_ids = np.array([0, 3, 3, 1, 0, 3, 4, 1, 0, 3])
+    true_res = np.zeros((6, 2, 3))
+    for i, segment in enumerate(segment_ids):
+        true_res[segment] += data[i]
+
+    res = tl.segment_sum(tl.tensor(data), segment_ids, 6)
+    assert_array_almost_equal(res, tl.tensor(true_res))
+
+    # Generic implementation
+    backend = tl.backend._LOADED_BACKENDS[tl.get_backend()]
+    generic_res = tl.backend.Backend.segment_sum(backend, tl.tensor(data), segment_ids, 6)
+    assert_array_almost_equal(generic_res, res)
+
+
+def test_mttkrp():
+    """Test for mttkrp, with and without blocks"""
+    shape = (4, 5, 3, 2)
+    rank = 3
+    tensor = T.tensor(np.random.random(shape))
+    factors = [T.tensor(np.random.random((s, rank))) for s in shape]
+    for mode in range(len(shape)):
+        true_res = T.dot(unfold(tensor, mode),
+                         tl.tenalg.khatri_rao(factors, skip_matrix=mode))
+        assert_array_almost_equal(T.mttkrp(tensor, factors, mode), true_res, decimal=5)
+        for block_size in [1, 7, 100]:
+            res = T.mttkrp(tensor, factors, mode, block_size=block_size)
+            assert_array_almost_equal(res, true_res, decimal=5)
+            # Generic, blocked implementation
+            backend = tl.backend._LOADED_BACKENDS[tl.get_backend()]
+            res = tl.backend.Backend.mttkrp(backend, tensor, factors, mode,
+                                            block_size=block_size)
+            assert_array_almost_equal(res, true_res, decimal=5)
+
+
+def test_lazy_import():
+    # SciPy and the submodules are only imported when used
+    code = ('import sys, tensorly; '
+            'print(*sorted(m for m in sys.modules '
+            'if m.startswith(("scipy", "tensorly."))))')
+    out = subprocess.run([sys.executable, '-c', code], check=True, stdout=subprocess.PIPE,
+                         universal_newlines=True).stdout.split()
+    for module in ['tensorly.decomposition', 'tensorly.regression', 'tensorly.contrib']:
+        assert module not in out
+    if tl.get_backend() == 'numpy':
+        assert 'scipy' not in out
+
+    assert 'decomposition' in dir(tl)
+    assert tl.decomposition.parafac is not None
@@ -1,9 +1,14 @@
+import functools
+import tracemalloc
+
 import numpy as np
+import pytest
 
 import tensorly as tl
-from ..tenalg import khatri_rao
+from ..tenalg import khatri_rao, khatri_rao_blocks
 from ..kruskal_tensor import kruskal_to_tensor, kruskal_to_unfolded, kruskal_to_vec
 from ..base import unfold, tensor_to_vec
+from ..random import check_random_state
 from ..testing import assert_array_equal, assert_array_almost_equal
 
 
@@ -78,6 +83,31 @@ def test_kruskal_to_tensor_with_weights():
     assert_array_equal(out, expected)
 
 
+@pytest.mark.skipif(tl.get_backend() != 'numpy',
+                    reason='tracemalloc only traces NumPy arrays')
+def test_kruskal_to_tensor_blocks_memory(monkeypatch):
+    """The unfolding is formed only once when the Khatri-Rao product is blocked"""
+    from .. import kruskal_tensor
+    max_bytes = 2**16
+    monkeypatch.setattr(kruskal_tensor, 'khatri_rao_blocks',
+                        functools.partial(khatri_rao_blocks, max_bytes=max_bytes))
+    rng = check_random_state(1234)
+    factors = [tl.tensor(rng.random_sample((s, 4))) for s in [50, 100, 100]]
+    n_bytes = 50*100*100*8
+
+    tracemalloc.start()
+    try:
+        tensor = kruskal_to_tensor(factors)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < n_bytes*1.5, 'Peak memory {} for an output of {} bytes'.format(
+        peak, n_bytes)
+
+    unfolded = tl.dot(factors[0], tl.transpose(khatri_rao(factors[1:])))
+    assert_array_almost_equal(tensor, tl.reshape(unfolded, (50, 100, 100)))
+
+
 def test_kruskal_to_unfolded():
     """Test for kruskal_to_unfolded.
         !!Assumes that kruskal_to_tensor and unfold are properly tested and work!!
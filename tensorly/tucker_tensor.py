@@ -4,7 +4,7 @@ Core operations on Tucker tensors.
 
 from .base import unfold, tensor_to_vec
 from .tenalg import multi_mode_dot
-from .tenalg import kronecker
+from .tenalg import KroneckerOperator
 
 # Author: Jean Kossaifi <jean.kossaifi+tensors@gmail.com>
 
@@ -85,6 +85,15 @@ def tucker_to_vec(core, factors, skip_factor=None, transpose_factors=False):
 
     >>> def tucker_to_vec(core, factors):
     ...     return kronecker(factors).dot(tensor_to_vec(core))
+
+    Here the Kronecker product is applied implicitly with a
+    :class:`tensorly.tenalg.KroneckerOperator`.
     """
-    return tensor_to_vec(tucker_to_tensor(core, factors, skip_factor=skip_factor, transpose_factors=transpose_factors))
+    if skip_factor is not None:
+        return tensor_to_vec(tucker_to_tensor(core, factors, skip_factor=skip_factor,
+                                              transpose_factors=transpose_factors))
+    operator = KroneckerOperator(factors)
+    if transpose_factors:
+        return operator.rmatvec(tensor_to_vec(core))
+    return operator.matvec(tensor_to_vec(core))
 